@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.db.models import Model
 
+from Emails.models.models import ArchivedEmail
 from Emails.models.models import BlackList
 from Emails.models.models import Block
 from Emails.models.models import Email
@@ -19,10 +20,9 @@ class BlockAdmin(admin.ModelAdmin):
     fieldsets: tuple = (
         ("Content", {"fields": ("id", "title", "content")}),
         ("Link", {"fields": ("show_link", "link_text", "link")}),
+        ("Deduplication", {"fields": ("content_hash",)}),
     )
-    readonly_fields: list = [
-        "id",
-    ]
+    readonly_fields: list = ["id", "content_hash"]
     search_fields: tuple = ("title", "id", "link", "link_text", "content")
 
 
@@ -38,7 +38,7 @@ class EmailAdmin(admin.ModelAdmin):
     list_filter: tuple = ("to", "is_test", "was_sent")
     fieldsets: tuple = (
         ("Content", {"fields": ("id", "subject", "header", "to")}),
-        ("Blocks", {"fields": ("blocks",)}),
+        ("Blocks", {"fields": ("blocks", "parameters")}),
         (
             "Configuration",
             {"fields": ("is_test", "programed_send_date")},
@@ -64,7 +64,7 @@ class SuggestionAdmin(admin.ModelAdmin):
 
     fieldsets: tuple = (
         ("Content", {"fields": ("id", "user", "subject", "header")}),
-        ("Blocks", {"fields": ("blocks",)}),
+        ("Blocks", {"fields": ("blocks", "parameters")}),
         (
             "Configuration",
             {"fields": ("to", "was_read", "was_sent")},
@@ -97,7 +97,7 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter: tuple = ("is_test", "was_sent")
     fieldsets: tuple = (
         ("Content", {"fields": ("id", "subject", "header")}),
-        ("Blocks", {"fields": ("blocks",)}),
+        ("Blocks", {"fields": ("blocks", "parameters")}),
         (
             "Configuration",
             {"fields": ("is_test", "programed_send_date")},
@@ -110,8 +110,27 @@ class NotificationAdmin(admin.ModelAdmin):
     ordering: tuple = ("is_test", "was_sent", "sent_date")
 
 
+class ArchivedEmailAdmin(admin.ModelAdmin):
+    model: Model = ArchivedEmail
+    list_display: tuple = (
+        "id",
+        "type",
+        "original_id",
+        "subject",
+        "sent_date",
+    )
+    list_filter: tuple = ("type",)
+    list_display_links: tuple = ("id", "original_id")
+    readonly_fields: list = [
+        field.name for field in ArchivedEmail._meta.fields
+    ]
+    search_fields: tuple = ("original_id", "user_id", "subject")
+    ordering: tuple = ("-archived_at",)
+
+
 admin.site.register(Email, EmailAdmin)
 admin.site.register(Block, BlockAdmin)
 admin.site.register(Suggestion, SuggestionAdmin)
 admin.site.register(BlackList, BlackListAdmin)
 admin.site.register(Notification, NotificationAdmin)
+admin.site.register(ArchivedEmail, ArchivedEmailAdmin)
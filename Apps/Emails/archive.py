@@ -0,0 +1,167 @@
+import logging
+import time
+from datetime import datetime
+from datetime import timedelta
+from logging import Logger
+from typing import Iterator
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from Emails.choices import ArchivedEmailType
+from Emails.models.abstracts import AbstractEmailClass
+from Emails.models.models import ArchivedEmail
+from Emails.models.models import Block
+from Emails.models.models import Email
+from Emails.models.models import Suggestion
+from Users.models import User
+
+
+logger: Logger = logging.getLogger(__name__)
+
+BLOCK_FIELDS: tuple = ("title", "content", "show_link", "link_text", "link")
+
+
+def get_retention_cutoff() -> datetime:
+    return timezone.now() - timedelta(days=settings.EMAIL_RETENTION_DAYS)
+
+
+def get_archivable_emails(cutoff: datetime) -> QuerySet:
+    return Email.objects.filter(was_sent=True, sent_date__lt=cutoff)
+
+
+def get_archivable_suggestions(cutoff: datetime) -> QuerySet:
+    # Unread suggestions are kept until an admin reads them
+    return Suggestion.objects.filter(
+        was_sent=True, was_read=True, sent_date__lt=cutoff
+    )
+
+
+def archive_sent_emails() -> dict:
+    """
+    Moves the sent emails and suggestions older than the retention period to
+    the archive table and prunes the emails left without recipient and the
+    blocks left without email. Every chunk
+    is committed on its own and archiving is idempotent, so an interrupted
+    run is resumed by the next one.
+    """
+    cutoff: datetime = get_retention_cutoff()
+    result: dict = {
+        ArchivedEmailType.EMAIL.value: archive_queryset(
+            get_archivable_emails(cutoff), ArchivedEmailType.EMAIL
+        ),
+        ArchivedEmailType.SUGGESTION.value: archive_queryset(
+            get_archivable_suggestions(cutoff), ArchivedEmailType.SUGGESTION
+        ),
+        "orphan_emails": prune_orphan_emails(),
+        "blocks": prune_orphan_blocks(),
+    }
+    logger.info(f"Emails App | Retention task finished: {result}")
+    return result
+
+
+def archive_queryset(queryset: QuerySet, type: str) -> int:
+    archived: int = 0
+    for ids in iterate_chunks(queryset):
+        with transaction.atomic():
+            chunk: QuerySet = queryset.model.objects.filter(pk__in=ids)
+            chunk = chunk.prefetch_related("blocks")
+            archives: list = [to_archive(instance, type) for instance in chunk]
+            ArchivedEmail.objects.bulk_create(archives, ignore_conflicts=True)
+            block_ids: set = {
+                block.pk
+                for instance in chunk
+                for block in instance.blocks.all()
+            }
+            chunk.delete()
+            # The blocks of the archived emails are only kept if another
+            # email still uses them
+            delete_orphan_blocks(block_ids)
+        archived += len(ids)
+    return archived
+
+
+def to_archive(instance: AbstractEmailClass, type: str) -> ArchivedEmail:
+    blocks: list = []
+    for block in instance.blocks.all():
+        rendered_block: Block = block.render(instance.parameters)
+        blocks.append(
+            {field: getattr(rendered_block, field) for field in BLOCK_FIELDS}
+        )
+    return ArchivedEmail(
+        type=type,
+        original_id=instance.pk,
+        user_id=getattr(instance, "to_id", getattr(instance, "user_id", None)),
+        subject=instance.subject,
+        header=instance.header,
+        blocks=blocks,
+        sent_date=instance.sent_date,
+        open_count=getattr(instance, "open_count", 0),
+        click_count=getattr(instance, "click_count", 0),
+    )
+
+
+def prune_orphan_emails() -> int:
+    """
+    The partitioned emails table has no constraint on its recipient, the
+    emails of users deleted outside the ORM are deleted here with their
+    parent rows and blocks relations
+    """
+    orphans: QuerySet = Email.objects.exclude(
+        to_id__in=User.objects.values("pk")
+    )
+    pruned: int = 0
+    for ids in iterate_chunks(orphans):
+        Email.objects.filter(pk__in=ids).delete()
+        pruned += len(ids)
+    return pruned
+
+
+def prune_orphan_blocks() -> int:
+    # Catches the blocks left by deleted emails, the ones newer than the last
+    # linked block may be waiting to be added to the email being created
+    linked: QuerySet = Block.objects.exclude(abstractemailclass_blocks=None)
+    last_linked_id: int = linked.aggregate(last=Max("pk"))["last"] or 0
+    orphans: QuerySet = Block.objects.filter(
+        abstractemailclass_blocks=None, pk__lt=last_linked_id
+    )
+    pruned: int = 0
+    for ids in iterate_chunks(orphans):
+        pruned += delete_orphan_blocks(ids)
+    return pruned
+
+
+def delete_orphan_blocks(ids: list) -> int:
+    """
+    Deletes the blocks of the given ones that no email uses. The locking
+    read waits for the emails being created with one of them, and sees
+    their links once they commit.
+    """
+    with transaction.atomic():
+        orphan_ids: list = list(
+            Block.objects.select_for_update()
+            .filter(pk__in=ids, abstractemailclass_blocks=None)
+            .values_list("pk", flat=True)
+        )
+        Block.objects.filter(pk__in=orphan_ids).delete()
+    return len(orphan_ids)
+
+
+def iterate_chunks(queryset: QuerySet) -> Iterator[list]:
+    """
+    Yields the primary keys to process in chunks, pausing between them so
+    the task does not hold the tables against production writes. The number
+    of chunks per run is bounded, the rest waits for the next run.
+    """
+    chunk_size: int = settings.EMAIL_ARCHIVE_CHUNK_SIZE
+    for _ in range(settings.EMAIL_ARCHIVE_MAX_CHUNKS):
+        ids: list = list(
+            queryset.order_by("pk").values_list("pk", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return
+        yield ids
+        time.sleep(settings.EMAIL_ARCHIVE_PAUSE_SECONDS)
@@ -6,3 +6,8 @@ class CommentType(models.TextChoices):
     BUG: str = "BUG"
     ERROR: str = "ERROR"
     OTHER: str = "OTHER"
+
+
+class ArchivedEmailType(models.TextChoices):
+    EMAIL: str = "EMAIL"
+    SUGGESTION: str = "SUGGESTION"
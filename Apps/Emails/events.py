@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from logging import Logger
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model
+from redis.client import PubSub
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Project.utils.redis_client import get_redis_connection
+from Users.authentication import CachedJWTAuthentication
+
+
+logger: Logger = logging.getLogger(__name__)
+
+NOTIFICATION_EVENT: str = "notification"
+SUGGESTION_READ_EVENT: str = "suggestion_read"
+KEEPALIVE: bytes = b": keepalive\n\n"
+
+
+def get_user_channel(user_id: int) -> str:
+    return f"{settings.EVENTS_CHANNEL_PREFIX}{user_id}"
+
+
+def publish_event(user_id: int, event: str, data: dict) -> None:
+    """
+    Publishes an event on the user channel, a failure on redis must never
+    break the request that triggered the event
+    """
+    if not settings.EVENTS_ENABLED:
+        return
+    message: str = json.dumps(
+        {"event": event, "data": data}, cls=DjangoJSONEncoder
+    )
+    try:
+        get_redis_connection().publish(get_user_channel(user_id), message)
+    except RedisError:
+        logger.warning(f"Emails App | Event {event} not published")
+
+
+def format_event(message: bytes) -> bytes:
+    """
+    Formats a published message as a server-sent event
+    """
+    payload: dict = json.loads(message)
+    data: str = json.dumps(payload.get("data", {}))
+    return f"event: {payload['event']}\ndata: {data}\n\n".encode()
+
+
+class EventBroker:
+    """
+    Fans out the redis pub/sub messages to the open event streams. A single
+    pattern subscription and listener thread is shared by all the streams of
+    the process, so every connection only costs an asyncio queue.
+    """
+
+    def __init__(self) -> None:
+        self.subscribers: dict = {}
+        self.lock: threading.Lock = threading.Lock()
+        self.thread: threading.Thread = None
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(
+            maxsize=settings.EVENTS_QUEUE_SIZE
+        )
+        subscriber: tuple = (asyncio.get_running_loop(), queue)
+        with self.lock:
+            self.subscribers.setdefault(str(user_id), set()).add(subscriber)
+            self.start_listener()
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        with self.lock:
+            subscribers: set = self.subscribers.get(str(user_id), set())
+            for subscriber in list(subscribers):
+                if subscriber[1] is queue:
+                    subscribers.discard(subscriber)
+            if not subscribers:
+                self.subscribers.pop(str(user_id), None)
+
+    def start_listener(self) -> None:
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(
+            target=self.listen, name="events-listener", daemon=True
+        )
+        self.thread.start()
+
+    def listen(self) -> None:
+        pattern: str = f"{settings.EVENTS_CHANNEL_PREFIX}*"
+        while True:
+            try:
+                pubsub: PubSub = get_redis_connection().pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.psubscribe(pattern)
+                for message in pubsub.listen():
+                    self.dispatch(message)
+            except RedisError:
+                logger.warning("Emails App | Events listener disconnected")
+                time.sleep(settings.EVENTS_RECONNECT_SECONDS)
+
+    def dispatch(self, message: dict) -> None:
+        channel: str = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        user_id: str = channel[len(settings.EVENTS_CHANNEL_PREFIX) :]
+        with self.lock:
+            subscribers: list = list(self.subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self.enqueue, queue, message["data"])
+
+    @staticmethod
+    def enqueue(queue: asyncio.Queue, data: bytes) -> None:
+        # Slow clients lose their oldest events instead of growing the queue
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(data)
+
+
+broker: EventBroker = EventBroker()
+
+
+class EventStreamApplication:
+    """
+    ASGI application that streams the events of the authenticated user as
+    server-sent events. EventSource clients can not set headers, so the
+    access token is also accepted in the "token" query parameter.
+    """
+
+    def __init__(self, event_broker: EventBroker = broker) -> None:
+        self.broker: EventBroker = event_broker
+
+    async def __call__(self, scope: dict, receive: callable, send: callable):
+        # The user lookup may query the database, out of the event loop
+        user_id: int = await sync_to_async(self.authenticate)(scope)
+        if user_id is None:
+            await self.send_unauthorized(send)
+            return
+        queue: asyncio.Queue = self.broker.subscribe(user_id)
+        try:
+            await self.stream(queue, receive, send)
+        finally:
+            self.broker.unsubscribe(user_id, queue)
+
+    def authenticate(self, scope: dict) -> int or None:
+        token: str = self.get_token(scope)
+        if not token:
+            return None
+        try:
+            access_token: AccessToken = AccessToken(token)
+            # Deleted and inactive users are rejected like on the API, from
+            # the same cached user snapshot
+            user: Model = CachedJWTAuthentication().get_user(access_token)
+        except (TokenError, InvalidToken, AuthenticationFailed):
+            return None
+        return user.pk
+
+    def get_token(self, scope: dict) -> str or None:
+        headers: dict = dict(scope.get("headers", []))
+        authorization: str = headers.get(b"authorization", b"").decode()
+        parts: list = authorization.split()
+        if len(parts) == 2 and parts[0] in api_settings.AUTH_HEADER_TYPES:
+            return parts[1]
+        query: dict = parse_qs(scope.get("query_string", b"").decode())
+        return query.get("token", [None])[0]
+
+    async def send_unauthorized(self, send: callable) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 401,
+                "headers": [(b"content-type", b"text/plain")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"Unauthorized"})
+
+    async def stream(
+        self, queue: asyncio.Queue, receive: callable, send: callable
+    ) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        disconnect: asyncio.Task = asyncio.ensure_future(
+            self.wait_for_disconnect(receive)
+        )
+        message: asyncio.Task = None
+        try:
+            while True:
+                if message is None:
+                    message = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {message, disconnect},
+                    timeout=settings.EVENTS_KEEPALIVE_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnect in done:
+                    break
+                if message in done:
+                    body: bytes = format_event(message.result())
+                    message = None
+                else:
+                    body: bytes = KEEPALIVE
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": body,
+                        "more_body": True,
+                    }
+                )
+        finally:
+            disconnect.cancel()
+            if message:
+                message.cancel()
+
+    @staticmethod
+    async def wait_for_disconnect(receive: callable) -> None:
+        while True:
+            message: dict = await receive()
+            if message["type"] == "http.disconnect":
+                return
@@ -1,6 +1,7 @@
 import factory
 from django.conf import settings
 from django.db.models import Model
+from django_rest_passwordreset.models import ResetPasswordToken
 
 from Emails.models.models import Block
 from Users.models import User
@@ -18,40 +19,28 @@ class BlockFactory(factory.django.DjangoModelFactory):
     link: str = factory.Faker("url")
 
 
-class ResetPasswordBlockFactory(BlockFactory):
-    class Params:
-        instance: User = None
+class TemplatedBlockFactory(BlockFactory):
+    """
+    Templated blocks are stored once and shared by every email, the email
+    parameters fill their placeholders
+    """
 
-    title: str = factory.LazyAttribute(
-        lambda object: (
-            f"{settings.EMAIL_GREETING}" f" {object.instance.user.first_name}!"
-        )
-    )
+
+class ResetPasswordBlockFactory(TemplatedBlockFactory):
+    title: str = f"{settings.EMAIL_GREETING} ${{first_name}}!"
     content: str = settings.RESET_PASSWORD_EMAIL_CONTENT
     show_link: bool = True
     link_text: str = settings.RESET_PASSWORD_EMAIL_LINK_TEXT
-    link: str = factory.LazyAttribute(
-        lambda object: f"{settings.RESET_PASSWORD_URL}/{object.instance.key}"
-    )
+    link: str = f"{settings.RESET_PASSWORD_URL}/${{key}}"
 
 
-class VerifyEmailBlockFactory(BlockFactory):
-    class Params:
-        user: User = None
-
-    title: str = factory.LazyAttribute(
-        lambda object: (
-            f"{settings.EMAIL_GREETING}" f"{object.user.first_name}!"
-        )
-    )
+class VerifyEmailBlockFactory(TemplatedBlockFactory):
+    title: str = f"{settings.EMAIL_GREETING}${{first_name}}!"
     content: str = settings.VERIFY_EMAIL_CONTENT
     show_link: bool = True
     link_text: str = settings.VERIFY_EMAIL_LINK_TEXT
-    link: str = factory.LazyAttribute(
-        lambda object: (
-            f"{settings.VERIFY_EMAIL_URL}/{object.user.id}/verify/?token="
-            f"{generate_user_verification_token(object.user)}"
-        )
+    link: str = (
+        f"{settings.VERIFY_EMAIL_URL}/${{user_id}}/verify/?token=${{token}}"
     )
 
 
@@ -59,3 +48,15 @@ class SuggestionBlockFactory(BlockFactory):
     show_link: bool = False
     link_text: str = ""
     link: str = ""
+
+
+def get_reset_password_parameters(instance: ResetPasswordToken) -> dict:
+    return {"first_name": instance.user.first_name, "key": instance.key}
+
+
+def get_verify_email_parameters(user: User) -> dict:
+    return {
+        "first_name": user.first_name,
+        "user_id": user.id,
+        "token": generate_user_verification_token(user),
+    }
@@ -2,6 +2,7 @@ from datetime import datetime
 
 import factory
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Model
 from django.utils import timezone
 from django_rest_passwordreset.models import ResetPasswordToken
@@ -9,6 +10,8 @@ from django_rest_passwordreset.models import ResetPasswordToken
 from Emails.factories.block import BlockFactory
 from Emails.factories.block import ResetPasswordBlockFactory
 from Emails.factories.block import VerifyEmailBlockFactory
+from Emails.factories.block import get_reset_password_parameters
+from Emails.factories.block import get_verify_email_parameters
 from Emails.models.models import Block
 from Emails.models.models import Email
 from Users.factories.user import UserFactory
@@ -39,7 +42,9 @@ class EmailFactory(factory.django.DjangoModelFactory):
             for block in extracted:
                 self.blocks.add(block)
         else:
-            self.blocks.add(BlockFactory())
+            # The block stays locked until it is linked
+            with transaction.atomic():
+                self.blocks.add(BlockFactory())
 
 
 class ResetEmailFactory(EmailFactory):
@@ -50,14 +55,15 @@ class ResetEmailFactory(EmailFactory):
     header: str = settings.RESET_PASSWORD_EMAIL_HEADER
     to: User = factory.LazyAttribute(lambda object: object.instance.user)
     programed_send_date: datetime = None
+    parameters: dict = factory.LazyAttribute(
+        lambda object: get_reset_password_parameters(object.instance)
+    )
 
     @factory.post_generation
     def blocks(self, create: bool, extracted: Model, **kwargs: dict) -> None:
-        token: ResetPasswordToken = ResetPasswordToken.objects.filter(
-            user_id=self.to.id
-        ).last()
-        block: Block = ResetPasswordBlockFactory(instance=token)
-        self.blocks.add(block)
+        with transaction.atomic():
+            block: Block = ResetPasswordBlockFactory()
+            self.blocks.add(block)
 
 
 class VerifyEmailFactory(EmailFactory):
@@ -68,8 +74,16 @@ class VerifyEmailFactory(EmailFactory):
     header: str = settings.VERIFY_EMAIL_HEADER
     to: User = factory.LazyAttribute(lambda object: object.instance)
     programed_send_date: datetime = None
+    parameters: dict = factory.LazyAttribute(
+        lambda object: (
+            get_verify_email_parameters(object.instance)
+            if object.instance
+            else {}
+        )
+    )
 
     @factory.post_generation
     def blocks(self, create: bool, extracted: Model, **kwargs: dict) -> None:
-        block: Block = VerifyEmailBlockFactory(user=self.to)
-        self.blocks.add(block)
+        with transaction.atomic():
+            block: Block = VerifyEmailBlockFactory()
+            self.blocks.add(block)
@@ -1,6 +1,7 @@
 from datetime import datetime
 
 import factory
+from django.db import transaction
 from django.db.models import Model
 from django.utils import timezone
 
@@ -27,4 +28,6 @@ class NotificationFactory(factory.django.DjangoModelFactory):
             for block in extracted:
                 self.blocks.add(block)
         else:
-            self.blocks.add(BlockFactory())
+            # The block stays locked until it is linked
+            with transaction.atomic():
+                self.blocks.add(BlockFactory())
@@ -1,5 +1,6 @@
 import factory
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Model
 from rest_framework.exceptions import ParseError
 
@@ -36,14 +37,15 @@ class SuggestionEmailFactory(factory.django.DjangoModelFactory):
         content: str = subject_splitted[1][1:]
         self.subject: str = type
         self.save()
-        block: Block = SuggestionBlockFactory(
-            title=self.header,
-            content=content,
-            show_link=True,
-            link_text=settings.SUGGESTIONS_EMAIL_LINK_TEXT,
-            link=f"{settings.URL}/api/suggestions/{self.id}/read/",
-        )
-        self.blocks.add(block)
+        with transaction.atomic():
+            block: Block = SuggestionBlockFactory(
+                title=self.header,
+                content=content,
+                show_link=True,
+                link_text=settings.SUGGESTIONS_EMAIL_LINK_TEXT,
+                link=f"{settings.URL}/api/suggestions/{self.id}/read/",
+            )
+            self.blocks.add(block)
 
 
 def get_subject_for_suggestion(suggestion_type: str, content: str) -> str:
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.6 on 2026-10-18 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Emails', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='email',
+            name='click_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='email',
+            name='open_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
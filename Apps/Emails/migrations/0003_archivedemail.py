@@ -0,0 +1,33 @@
+# Generated by Django 4.0.6 on 2026-10-18 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Emails', '0002_email_tracking_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('EMAIL', 'Email'), ('SUGGESTION', 'Suggestion')], max_length=10)),
+                ('original_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField(null=True)),
+                ('subject', models.CharField(max_length=100)),
+                ('header', models.CharField(max_length=100, null=True)),
+                ('blocks', models.JSONField(default=list)),
+                ('sent_date', models.DateTimeField(null=True)),
+                ('open_count', models.PositiveIntegerField(default=0)),
+                ('click_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='archivedemail',
+            constraint=models.UniqueConstraint(fields=('type', 'original_id'), name='unique_archived_email'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.6 on 2026-10-18 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Emails', '0003_archivedemail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='email',
+            name='programed_send_date',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+    ]
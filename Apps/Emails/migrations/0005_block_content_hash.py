@@ -0,0 +1,55 @@
+# Generated by Django 4.0.6 on 2026-10-18 23:12
+
+import json
+from hashlib import sha256
+
+from django.db import migrations, models
+
+
+BLOCK_CONTENT_FIELDS = ("title", "content", "show_link", "link_text", "link")
+
+
+def deduplicate_blocks(apps, schema_editor):
+    """
+    Hashes the existing blocks, the duplicated ones are replaced on their
+    emails by the first block with the same content
+    """
+    Block = apps.get_model("Emails", "Block")
+    Through = apps.get_model("Emails", "AbstractEmailClass").blocks.through
+    kept_blocks = {}
+    for block in Block.objects.order_by("pk").iterator():
+        content = [getattr(block, field) for field in BLOCK_CONTENT_FIELDS]
+        content_hash = sha256(json.dumps(content).encode()).hexdigest()
+        if content_hash not in kept_blocks:
+            kept_blocks[content_hash] = block.pk
+            Block.objects.filter(pk=block.pk).update(content_hash=content_hash)
+            continue
+        kept_block_id = kept_blocks[content_hash]
+        relations = Through.objects.filter(block_id=block.pk)
+        already_related = Through.objects.filter(
+            block_id=kept_block_id
+        ).values_list("abstractemailclass_id", flat=True)
+        relations.filter(abstractemailclass_id__in=already_related).delete()
+        relations.update(block_id=kept_block_id)
+        block.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Emails', '0004_email_programed_send_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='abstractemailclass',
+            name='parameters',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='block',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(deduplicate_blocks, migrations.RunPython.noop),
+    ]
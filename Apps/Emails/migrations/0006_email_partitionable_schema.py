@@ -0,0 +1,55 @@
+# Generated by Django 4.0.6 on 2026-10-19 00:14
+
+import datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_programed_send_dates(apps, schema_editor):
+    """
+    The partition column can not be null, the emails without date take the
+    sent one or the first partition
+    """
+    Email = apps.get_model("Emails", "Email")
+    AbstractEmailClass = apps.get_model("Emails", "AbstractEmailClass")
+    sent_date = AbstractEmailClass.objects.filter(
+        pk=models.OuterRef("pk")
+    ).values("sent_date")[:1]
+    Email.objects.filter(programed_send_date=None).update(
+        programed_send_date=Coalesce(
+            models.Subquery(sent_date),
+            models.Value(
+                datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+            ),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('Emails', '0005_block_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='email',
+            name='abstractemailclass_ptr',
+            field=models.OneToOneField(auto_created=True, db_constraint=False, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='Emails.abstractemailclass'),
+        ),
+        migrations.AlterField(
+            model_name='email',
+            name='to',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='to_user', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(fill_programed_send_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='email',
+            name='programed_send_date',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
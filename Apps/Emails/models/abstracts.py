@@ -10,10 +10,11 @@ from django.db.models.fields import Field
 from django.template.loader import render_to_string
 from django.utils import timezone
 
+from Project.models import DirtyFieldsMixin
 from Project.utils.log import log_information
 
 
-class AbstractEmailFunctionClass(Model):
+class AbstractEmailFunctionClass(DirtyFieldsMixin):
     class Meta:
         abstract: bool = True
 
@@ -24,10 +25,16 @@ class AbstractEmailFunctionClass(Model):
     def get_emails(self) -> list:
         raise ValueError("Abstract method, must be implemented in child class")
 
+    def get_tracking_urls(self) -> dict or None:
+        return None
+
     def get_email_data(self) -> dict:
         return {
             "header": self.header,
-            "blocks": self.blocks.all() if self.blocks.all() else [],
+            "blocks": [
+                block.render(self.parameters) for block in self.blocks.all()
+            ],
+            "tracking": self.get_tracking_urls(),
         }
 
     def get_template(self) -> str:
@@ -72,3 +79,4 @@ class AbstractEmailClass(AbstractEmailFunctionClass):
     blocks: Field = models.ManyToManyField(
         "Emails.Block", related_name="%(class)s_blocks"
     )
+    parameters: Field = models.JSONField(default=dict, blank=True)
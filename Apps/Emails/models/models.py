@@ -1,22 +1,62 @@
+import json
+from copy import copy
 from datetime import datetime
+from hashlib import sha256
+from string import Template
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.signing import BadSignature
+from django.core.signing import Signer
 from django.db import models
+from django.db import transaction
 from django.db.models.fields import Field
 from django.db.models.fields.related import ForeignObject
 from django.utils import timezone
 
 from Emails import factories
+from Emails.choices import ArchivedEmailType
 from Emails.choices import CommentType
 from Emails.models.abstracts import AbstractEmailClass
 from Users.fakers.user import EmailTestUserFaker
 from Users.models import User
 
 
+BLOCK_CONTENT_FIELDS: tuple = (
+    "title",
+    "content",
+    "show_link",
+    "link_text",
+    "link",
+)
+TEMPLATED_BLOCK_FIELDS: tuple = ("title", "content", "link_text", "link")
+TRACKING_SALT: str = "Emails.tracking"
+
+
+class BlockManager(models.Manager):
+    def get_or_create_by_content(self, **fields: dict) -> "Block":
+        """
+        Returns the stored block with the same content, blocks are shared
+        between emails instead of storing a copy for each one. The block row
+        is locked until the transaction of the caller ends, so the pruning
+        of orphan blocks can not delete it before the caller links it.
+        """
+        block: Block = self.model(**fields)
+        with transaction.atomic():
+            block, _ = self.select_for_update().get_or_create(
+                content_hash=block.get_content_hash(), defaults=fields
+            )
+        return block
+
+    def create(self, **fields: dict) -> "Block":
+        # Blocks are content addressed, an equal block is never stored twice
+        return self.get_or_create_by_content(**fields)
+
+
 class Block(models.Model):
     """
-    Block model used on email as block content
+    Block model used on email as block content, its texts can have
+    ${parameter} placeholders filled with the email parameters
     """
 
     title: Field = models.CharField(max_length=100, null=True)
@@ -24,26 +64,105 @@ class Block(models.Model):
     show_link: Field = models.BooleanField(default=False)
     link_text: Field = models.CharField(max_length=100, null=True)
     link: Field = models.URLField(max_length=100, null=True)
+    content_hash: Field = models.CharField(
+        max_length=64, unique=True, null=True, editable=False
+    )
+
+    objects: BlockManager = BlockManager()
 
     def __str__(self) -> str:
         return f"{self.id} | {self.title}"
 
+    def get_content_hash(self) -> str:
+        content: list = [
+            getattr(self, field) for field in BLOCK_CONTENT_FIELDS
+        ]
+        return sha256(json.dumps(content).encode()).hexdigest()
+
+    def render(self, parameters: dict) -> "Block":
+        """
+        Returns an unsaved copy of the block with the placeholders replaced
+        """
+        block: Block = copy(self)
+        for field in TEMPLATED_BLOCK_FIELDS:
+            value: str = getattr(self, field)
+            if value and parameters:
+                setattr(
+                    block, field, Template(value).safe_substitute(parameters)
+                )
+        return block
+
+    def validate_unique(self, exclude: list = None) -> None:
+        super(Block, self).validate_unique(exclude)
+        duplicates: models.QuerySet = Block.objects.filter(
+            content_hash=self.get_content_hash()
+        ).exclude(pk=self.pk)
+        if duplicates.exists():
+            raise ValidationError(
+                "A block with the same content already exists."
+            )
+
+    def save(self, *args: tuple, **kwargs: dict) -> None:
+        self.content_hash = self.get_content_hash()
+        super(Block, self).save(*args, **kwargs)
+
 
 class Email(AbstractEmailClass):
     """
-    Email model
+    Email model, its table can be partitioned by programed_send_date. Only
+    the columns of this table are partitioned, the ones inherited from
+    AbstractEmailClass (was_sent, sent_date, header, parameters) live on
+    the unpartitioned parent table. MySQL does not partition tables with
+    foreign keys, so its relations do not create constraints. Django
+    emulates the cascades, the partition drop deletes the parent rows and
+    the retention task prunes the emails of missing recipients.
     """
 
+    abstractemailclass_ptr: ForeignObject = models.OneToOneField(
+        AbstractEmailClass,
+        on_delete=models.CASCADE,
+        parent_link=True,
+        auto_created=True,
+        primary_key=True,
+        serialize=False,
+        db_constraint=False,
+    )
     subject: Field = models.CharField(max_length=100)
     is_test: Field = models.BooleanField(default=False)
-    programed_send_date: Field = models.DateTimeField(null=True)
+    programed_send_date: Field = models.DateTimeField(db_index=True)
     to: ForeignObject = models.ForeignKey(
-        User, on_delete=models.CASCADE, null=False, related_name="to_user"
+        User,
+        on_delete=models.CASCADE,
+        null=False,
+        related_name="to_user",
+        db_constraint=False,
     )
+    open_count: Field = models.PositiveIntegerField(default=0, editable=False)
+    click_count: Field = models.PositiveIntegerField(default=0, editable=False)
 
     def get_emails(self) -> list:
         return [self.to.email]
 
+    def get_tracking_urls(self) -> dict:
+        # The id is signed so the public tracking urls can not be forged
+        tracking_id: str = Signer(salt=TRACKING_SALT).sign(str(self.id))
+        tracking_url: str = f"{settings.URL}/api/emails/{tracking_id}"
+        return {
+            "open": f"{tracking_url}/open/",
+            "click": f"{tracking_url}/click/",
+        }
+
+    @staticmethod
+    def get_tracked_id(tracking_id: str) -> int or None:
+        """
+        Returns the email id of a tracking url id, None when its signature
+        is wrong
+        """
+        try:
+            return int(Signer(salt=TRACKING_SALT).unsign(tracking_id))
+        except (BadSignature, ValueError):
+            return None
+
     def set_programed_send_date(self) -> None:
         programmed_date: datetime = self.programed_send_date
         if programmed_date and programmed_date <= timezone.now():
@@ -80,6 +199,15 @@ class Suggestion(AbstractEmailClass):
     def get_emails(self) -> list:
         return [settings.SUGGESTIONS_EMAIL]
 
+    def mark_as_read(self) -> None:
+        from Emails.events import SUGGESTION_READ_EVENT
+        from Emails.events import publish_event
+
+        self.was_read = True
+        self.save()
+        data: dict = {"id": self.id, "was_read": self.was_read}
+        publish_event(self.user_id, SUGGESTION_READ_EVENT, data)
+
 
 class Notification(AbstractEmailClass):
     """
@@ -101,15 +229,29 @@ class Notification(AbstractEmailClass):
         self.save()
 
     def create_email(self, to: User) -> None:
-        factories.email.EmailFactory(
+        from Emails.events import NOTIFICATION_EVENT
+        from Emails.events import publish_event
+
+        email: Email = factories.email.EmailFactory(
             to=to,
             subject=self.subject,
             header=self.header,
             is_test=self.is_test,
             programed_send_date=self.programed_send_date,
             sent_date=None,
+            parameters=self.parameters,
             blocks=self.blocks.all(),
         )
+        data: dict = {
+            "id": email.id,
+            "subject": email.subject,
+            "header": email.header,
+            "programed_send_date": email.programed_send_date,
+        }
+        # The clients fetch the email once notified, so it must be committed
+        transaction.on_commit(
+            lambda: publish_event(to.id, NOTIFICATION_EVENT, data)
+        )
 
 
 class BlackList(models.Model):
@@ -118,3 +260,33 @@ class BlackList(models.Model):
     """
 
     email: Field = models.EmailField(unique=True)
+
+
+class ArchivedEmail(models.Model):
+    """
+    ArchivedEmail model, compact copy of a sent email or suggestion removed
+    from the hot tables by the retention task
+    """
+
+    type: Field = models.CharField(
+        max_length=10, choices=ArchivedEmailType.choices
+    )
+    original_id: Field = models.BigIntegerField()
+    user_id: Field = models.BigIntegerField(null=True)
+    subject: Field = models.CharField(max_length=100)
+    header: Field = models.CharField(max_length=100, null=True)
+    blocks: Field = models.JSONField(default=list)
+    sent_date: Field = models.DateTimeField(null=True)
+    open_count: Field = models.PositiveIntegerField(default=0)
+    click_count: Field = models.PositiveIntegerField(default=0)
+    archived_at: Field = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints: list = [
+            models.UniqueConstraint(
+                fields=["type", "original_id"], name="unique_archived_email"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.type} {self.original_id} | {self.subject}"
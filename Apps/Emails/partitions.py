@@ -0,0 +1,303 @@
+import logging
+import time
+from datetime import date
+from logging import Logger
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from Emails.choices import ArchivedEmailType
+from Emails.models.abstracts import AbstractEmailClass
+from Emails.models.models import ArchivedEmail
+from Emails.models.models import Email
+
+
+logger: Logger = logging.getLogger(__name__)
+
+
+PARTITION_COLUMN: str = "programed_send_date"
+FUTURE_PARTITION: str = "pfuture"
+PARTITIONS_QUERY: str = (
+    "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+    "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+)
+FOREIGN_KEYS_QUERY: str = (
+    "SELECT CONSTRAINT_NAME FROM information_schema.TABLE_CONSTRAINTS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+    "AND CONSTRAINT_TYPE = 'FOREIGN KEY'"
+)
+PRIMARY_KEY_QUERY: str = (
+    "SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+    "AND CONSTRAINT_NAME = 'PRIMARY' ORDER BY ORDINAL_POSITION"
+)
+
+
+class PartitioningError(Exception):
+    pass
+
+
+def is_partitioning_supported() -> bool:
+    return connection.vendor == "mysql"
+
+
+def get_month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    year, month_index = divmod(month.month - 1 + months, 12)
+    return date(month.year + year, month_index + 1, 1)
+
+
+def get_partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def get_partition_month(name: str) -> date or None:
+    if name == FUTURE_PARTITION:
+        return None
+    return date(int(name[1:5]), int(name[5:7]), 1)
+
+
+def get_partition_definition(month: date) -> str:
+    next_month: date = add_months(month, 1)
+    return (
+        f"PARTITION {get_partition_name(month)} "
+        f"VALUES LESS THAN (TO_DAYS('{next_month.isoformat()}'))"
+    )
+
+
+def get_future_partition_definition() -> str:
+    return f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE"
+
+
+def get_partitions() -> list:
+    with connection.cursor() as cursor:
+        cursor.execute(PARTITIONS_QUERY, [Email._meta.db_table])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def get_foreign_keys() -> list:
+    with connection.cursor() as cursor:
+        cursor.execute(FOREIGN_KEYS_QUERY, [Email._meta.db_table])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def get_primary_key_columns() -> list:
+    with connection.cursor() as cursor:
+        cursor.execute(PRIMARY_KEY_QUERY, [Email._meta.db_table])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def get_setup_statements(
+    primary_key_columns: list, current_month: date, months_ahead: int
+) -> list:
+    """
+    MySQL needs the partition column in every unique key, so it joins the
+    primary key unless a previous setup already added it. The migrations
+    make the column not null and leave the table without foreign keys.
+    The first partition also holds every email older than the current
+    month.
+    """
+    table: str = Email._meta.db_table
+    primary_key: str = Email._meta.pk.column
+    statements: list = []
+    if PARTITION_COLUMN not in primary_key_columns:
+        statements.append(
+            f"ALTER TABLE {table} DROP PRIMARY KEY, "
+            f"ADD PRIMARY KEY ({primary_key}, {PARTITION_COLUMN})"
+        )
+    months: list = [
+        add_months(current_month, months) for months in range(months_ahead + 1)
+    ]
+    definitions: list = [get_partition_definition(month) for month in months]
+    definitions.append(get_future_partition_definition())
+    statements.append(
+        f"ALTER TABLE {table} PARTITION BY RANGE "
+        f"(TO_DAYS({PARTITION_COLUMN})) ({', '.join(definitions)})"
+    )
+    return statements
+
+
+def get_add_statements(
+    partitions: list, current_month: date, months_ahead: int
+) -> list:
+    """
+    Splits the catch-all future partition so every month until the given
+    one has its own partition
+    """
+    months: list = [get_partition_month(name) for name in partitions]
+    last_month: date = max(filter(None, months), default=None)
+    first_month: date = current_month
+    if last_month and last_month >= current_month:
+        first_month = add_months(last_month, 1)
+    last_needed_month: date = add_months(current_month, months_ahead)
+    definitions: list = []
+    month: date = first_month
+    while month <= last_needed_month:
+        definitions.append(get_partition_definition(month))
+        month = add_months(month, 1)
+    if not definitions:
+        return []
+    definitions.append(get_future_partition_definition())
+    return [
+        f"ALTER TABLE {Email._meta.db_table} REORGANIZE PARTITION "
+        f"{FUTURE_PARTITION} INTO ({', '.join(definitions)})"
+    ]
+
+
+def get_old_partitions(partitions: list, before_month: date) -> list:
+    # The future partition has no month and is never dropped
+    return [
+        name
+        for name in partitions
+        if get_partition_month(name)
+        and get_partition_month(name) < before_month
+    ]
+
+
+def get_drop_statement(name: str) -> str:
+    return f"ALTER TABLE {Email._meta.db_table} DROP PARTITION {name}"
+
+
+def count_unarchived_rows(name: str) -> int:
+    """
+    Counts the rows of the partition that still have their parent row and
+    were not copied to the archive, the unsent emails included
+    """
+    table: str = Email._meta.db_table
+    parent_table: str = AbstractEmailClass._meta.db_table
+    parent_key: str = AbstractEmailClass._meta.pk.column
+    archive_table: str = ArchivedEmail._meta.db_table
+    primary_key: str = Email._meta.pk.column
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {table} PARTITION ({name}) email "
+            f"JOIN {parent_table} parent "
+            f"ON parent.{parent_key} = email.{primary_key} "
+            f"LEFT JOIN {archive_table} archive "
+            f"ON archive.original_id = email.{primary_key} "
+            "AND archive.type = %s "
+            "WHERE archive.id IS NULL",
+            [ArchivedEmailType.EMAIL.value],
+        )
+        return cursor.fetchone()[0]
+
+
+def get_parent_ids(name: str, limit: int) -> list:
+    table: str = Email._meta.db_table
+    parent_table: str = AbstractEmailClass._meta.db_table
+    parent_key: str = AbstractEmailClass._meta.pk.column
+    primary_key: str = Email._meta.pk.column
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT email.{primary_key} "
+            f"FROM {table} PARTITION ({name}) email "
+            f"JOIN {parent_table} parent "
+            f"ON parent.{parent_key} = email.{primary_key} "
+            f"ORDER BY email.{primary_key} LIMIT %s",
+            [limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def delete_parent_rows(ids: list) -> None:
+    """
+    Deletes the parent email rows and their blocks relations, the partition
+    drop deletes the email rows themselves
+    """
+    parent_table: str = AbstractEmailClass._meta.db_table
+    parent_key: str = AbstractEmailClass._meta.pk.column
+    through_table: str = AbstractEmailClass.blocks.through._meta.db_table
+    through_key: str = AbstractEmailClass.blocks.field.m2m_column_name()
+    placeholders: str = ", ".join(["%s"] * len(ids))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {through_table} "
+            f"WHERE {through_key} IN ({placeholders})",
+            ids,
+        )
+        cursor.execute(
+            f"DELETE FROM {parent_table} "
+            f"WHERE {parent_key} IN ({placeholders})",
+            ids,
+        )
+
+
+def delete_partition_parents(name: str) -> bool:
+    """
+    Deletes the parent rows of the partition in chunks, pausing between
+    them as the archive does. Returns if every parent row is deleted, the
+    bounded chunks may leave the rest for the next run.
+    """
+    chunk_size: int = settings.EMAIL_ARCHIVE_CHUNK_SIZE
+    for _ in range(settings.EMAIL_ARCHIVE_MAX_CHUNKS):
+        ids: list = get_parent_ids(name, chunk_size)
+        if not ids:
+            return True
+        delete_parent_rows(ids)
+        time.sleep(settings.EMAIL_ARCHIVE_PAUSE_SECONDS)
+    return not get_parent_ids(name, 1)
+
+
+def execute_statements(statements: list) -> None:
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def setup_partitions(months_ahead: int) -> list:
+    """
+    Every step checks the current schema, so a setup that fails partway
+    can be run again
+    """
+    if get_partitions():
+        return []
+    foreign_keys: list = get_foreign_keys()
+    if foreign_keys:
+        raise PartitioningError(
+            f"The emails table has foreign keys ({', '.join(foreign_keys)}), "
+            "apply the Emails migrations first"
+        )
+    statements: list = get_setup_statements(
+        get_primary_key_columns(),
+        get_month(timezone.now().date()),
+        months_ahead,
+    )
+    execute_statements(statements)
+    return statements
+
+
+def add_partitions(months_ahead: int) -> list:
+    statements: list = get_add_statements(
+        get_partitions(), get_month(timezone.now().date()), months_ahead
+    )
+    execute_statements(statements)
+    return statements
+
+
+def drop_partitions(before_month: date) -> list:
+    """
+    Drops the partitions older than the given month once every email on
+    them is archived. The parent rows are deleted before the partition, so
+    a drop that stops partway is resumed by running it again.
+    """
+    statements: list = []
+    for name in get_old_partitions(get_partitions(), before_month):
+        unarchived: int = count_unarchived_rows(name)
+        if unarchived:
+            logger.info(
+                f"Emails App | Partition {name} kept, "
+                f"{unarchived} emails are not archived"
+            )
+            continue
+        if not delete_partition_parents(name):
+            continue
+        statement: str = get_drop_statement(name)
+        execute_statements([statement])
+        statements.append(statement)
+    return statements
@@ -20,7 +20,12 @@ class SuggestionEmailSerializer(serializers.Serializer):
     blocks: RelatedField = serializers.SlugRelatedField(
         many=True, read_only=True, slug_field="id"
     )
-    content: Field = serializers.CharField(source="blocks.first.content")
+    content: Field = serializers.SerializerMethodField()
 
     class Meta:
         model: Model = Suggestion
+        prefetch_related_fields: tuple = ("blocks",)
+
+    def get_content(self, object: Suggestion) -> str or None:
+        blocks: list = list(object.blocks.all())
+        return blocks[0].content if blocks else None
@@ -1,26 +1,63 @@
 from datetime import datetime
 
 from celery import shared_task
+from django.conf import settings
 from django.db.models import QuerySet
 from django.utils import timezone
 
+from Emails.archive import archive_sent_emails
 from Emails.models.models import Email
+from Emails.tracking import flush_tracking
 from Project.settings.celery_worker.worker import app
 
 
 SECONDS: float = 10.0
+OVERDUE_SECONDS: float = 60 * 60.0
+TRACKING_FLUSH_SECONDS: float = 60.0
+ARCHIVE_SECONDS: float = 24 * 60 * 60.0
+
+
+def get_dispatch_lookback() -> datetime:
+    return timezone.now() - timezone.timedelta(
+        days=settings.EMAIL_DISPATCH_LOOKBACK_DAYS
+    )
 
 
 @shared_task
 def send_emails() -> None:
-    now: datetime = timezone.now()
+    # The lower bound lets the database only read the recent partitions of
+    # the emails table, was_sent is filtered on the unpartitioned parent one
+    emails: QuerySet = Email.objects.filter(
+        was_sent=False,
+        programed_send_date__range=(get_dispatch_lookback(), timezone.now()),
+    )
+    for email in emails:
+        email.send()
+
+
+@shared_task
+def send_overdue_emails() -> None:
+    """
+    Sends the emails left unsent past the lookback, by a worker outage or a
+    failed send. It reads every older partition, so it runs less often.
+    """
     emails: QuerySet = Email.objects.filter(
-        was_sent=False, programed_send_date__lte=now
+        was_sent=False, programed_send_date__lt=get_dispatch_lookback()
     )
     for email in emails:
         email.send()
 
 
+@shared_task
+def flush_email_tracking() -> None:
+    flush_tracking()
+
+
+@shared_task
+def archive_emails() -> dict:
+    return archive_sent_emails()
+
+
 def each_seconds() -> float:
     return SECONDS
 
@@ -30,4 +67,16 @@ app.conf.beat_schedule = {
         "task": "Emails.tasks.send_emails",
         "schedule": each_seconds(),
     },
+    "send_overdue_emails": {
+        "task": "Emails.tasks.send_overdue_emails",
+        "schedule": OVERDUE_SECONDS,
+    },
+    "flush_email_tracking": {
+        "task": "Emails.tasks.flush_email_tracking",
+        "schedule": TRACKING_FLUSH_SECONDS,
+    },
+    "archive_emails": {
+        "task": "Emails.tasks.archive_emails",
+        "schedule": ARCHIVE_SECONDS,
+    },
 }
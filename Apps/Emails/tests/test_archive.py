@@ -0,0 +1,135 @@
+import pytest
+from django.conf import settings
+from django.utils import timezone
+from mock import patch
+
+from Emails.archive import archive_sent_emails
+from Emails.archive import delete_orphan_blocks
+from Emails.archive import prune_orphan_blocks
+from Emails.archive import prune_orphan_emails
+from Emails.choices import ArchivedEmailType
+from Emails.choices import CommentType
+from Emails.factories.block import BlockFactory
+from Emails.factories.email import EmailFactory
+from Emails.factories.suggestion import SuggestionEmailFactory
+from Emails.models.abstracts import AbstractEmailClass
+from Emails.models.models import ArchivedEmail
+from Emails.models.models import Block
+from Emails.models.models import Email
+from Emails.models.models import Suggestion
+from Users.fakers.user import UserFaker
+from Users.models import User
+
+
+def days_ago(days: int) -> timezone.datetime:
+    return timezone.now() - timezone.timedelta(days=days)
+
+
+OLD: int = settings.EMAIL_RETENTION_DAYS + 1
+
+
+@pytest.mark.django_db
+class TestArchiveSentEmails:
+    def test_old_sent_emails_are_archived(self) -> None:
+        block: Block = BlockFactory(title="Title")
+        email: Email = EmailFactory(
+            was_sent=True, sent_date=days_ago(OLD), blocks=[block]
+        )
+        result: dict = archive_sent_emails()
+        archived: ArchivedEmail = ArchivedEmail.objects.get()
+        assert result[ArchivedEmailType.EMAIL.value] == 1
+        assert Email.objects.filter(id=email.id).exists() is False
+        assert archived.type == ArchivedEmailType.EMAIL.value
+        assert archived.original_id == email.id
+        assert archived.user_id == email.to_id
+        assert archived.subject == email.subject
+        assert archived.blocks[0]["title"] == "Title"
+        assert Block.objects.filter(id=block.id).exists() is False
+
+    def test_recent_and_unsent_emails_are_kept(self) -> None:
+        recent: Email = EmailFactory(was_sent=True, sent_date=days_ago(1))
+        unsent: Email = EmailFactory(was_sent=False, sent_date=days_ago(OLD))
+        archive_sent_emails()
+        assert ArchivedEmail.objects.count() == 0
+        assert Email.objects.filter(id__in=[recent.id, unsent.id]).count() == 2
+        assert Block.objects.count() == 2
+
+    def test_only_read_suggestions_are_archived(self) -> None:
+        user: User = UserFaker()
+        read: Suggestion = SuggestionEmailFactory(
+            type=CommentType.ERROR.value, content="Error found", user=user
+        )
+        unread: Suggestion = SuggestionEmailFactory(
+            type=CommentType.ERROR.value, content="Error found", user=user
+        )
+        Suggestion.objects.update(was_sent=True, sent_date=days_ago(OLD))
+        Suggestion.objects.filter(id=read.id).update(was_read=True)
+        archive_sent_emails()
+        archived: ArchivedEmail = ArchivedEmail.objects.get()
+        assert archived.type == ArchivedEmailType.SUGGESTION.value
+        assert archived.original_id == read.id
+        assert archived.user_id == read.user_id
+        assert list(Suggestion.objects.values_list("id", flat=True)) == [
+            unread.id
+        ]
+
+    def test_archive_is_bounded_by_chunks(self) -> None:
+        for _ in range(3):
+            EmailFactory(was_sent=True, sent_date=days_ago(OLD))
+        with patch.object(settings, "EMAIL_ARCHIVE_CHUNK_SIZE", 1):
+            with patch.object(settings, "EMAIL_ARCHIVE_MAX_CHUNKS", 2):
+                first_result: dict = archive_sent_emails()
+            second_result: dict = archive_sent_emails()
+        assert first_result[ArchivedEmailType.EMAIL.value] == 2
+        assert second_result[ArchivedEmailType.EMAIL.value] == 1
+        assert Email.objects.count() == 0
+        assert ArchivedEmail.objects.count() == 3
+
+    def test_archive_is_idempotent(self) -> None:
+        email: Email = EmailFactory(was_sent=True, sent_date=days_ago(OLD))
+        ArchivedEmail.objects.create(
+            type=ArchivedEmailType.EMAIL.value,
+            original_id=email.id,
+            subject=email.subject,
+            header=email.header,
+            sent_date=email.sent_date,
+        )
+        archive_sent_emails()
+        assert ArchivedEmail.objects.count() == 1
+        assert Email.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestPruneOrphanEmails:
+    def test_emails_of_missing_recipients_are_pruned(self) -> None:
+        email: Email = EmailFactory()
+        kept_email: Email = EmailFactory()
+        Email.objects.filter(id=email.id).update(to_id=kept_email.to_id + 1000)
+        assert prune_orphan_emails() == 1
+        assert list(Email.objects.values_list("id", flat=True)) == [
+            kept_email.id
+        ]
+        assert AbstractEmailClass.objects.filter(id=email.id).exists() is False
+
+
+@pytest.mark.django_db
+class TestPruneOrphanBlocks:
+    def test_orphan_blocks_are_pruned(self) -> None:
+        orphan: Block = BlockFactory()
+        email: Email = EmailFactory()
+        assert prune_orphan_blocks() == 1
+        assert Block.objects.filter(id=orphan.id).exists() is False
+        assert email.blocks.count() == 1
+
+    def test_blocks_newer_than_the_last_linked_one_are_kept(self) -> None:
+        EmailFactory()
+        pending: Block = BlockFactory()
+        assert prune_orphan_blocks() == 0
+        assert Block.objects.filter(id=pending.id).exists() is True
+
+    def test_delete_orphan_blocks_keeps_the_linked_ones(self) -> None:
+        orphan: Block = BlockFactory()
+        email: Email = EmailFactory()
+        linked: Block = email.blocks.get()
+        assert delete_orphan_blocks([orphan.id, linked.id]) == 1
+        assert list(Block.objects.values_list("id", flat=True)) == [linked.id]
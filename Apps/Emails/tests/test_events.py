@@ -0,0 +1,238 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from django.test import override_settings
+from mock import MagicMock
+from mock import patch
+from redis.exceptions import ConnectionError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Emails.choices import CommentType
+from Emails.events import NOTIFICATION_EVENT
+from Emails.events import SUGGESTION_READ_EVENT
+from Emails.events import EventBroker
+from Emails.events import EventStreamApplication
+from Emails.events import format_event
+from Emails.events import get_user_channel
+from Emails.events import publish_event
+from Emails.factories.notification import NotificationFactory
+from Emails.factories.suggestion import SuggestionEmailFactory
+from Emails.models.models import Suggestion
+from Users.authentication import cache_snapshot
+from Users.fakers.user import UserFaker
+from Users.fakers.user import VerifiedUserFaker
+from Users.models import User
+
+
+CONNECTION: str = "Emails.events.get_redis_connection"
+PUBLISH: str = "Emails.events.publish_event"
+
+
+def run_application(scope: dict, messages: list) -> list:
+    """
+    Runs the event stream application until the client disconnects, returns
+    the ASGI messages sent to the client
+    """
+    application: EventStreamApplication = EventStreamApplication(EventBroker())
+    sent: list = []
+
+    async def receive() -> dict:
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    async def run() -> None:
+        subscribe = application.broker.subscribe
+
+        def subscribe_with_messages(user_id: int) -> asyncio.Queue:
+            queue: asyncio.Queue = subscribe(user_id)
+            for message in messages:
+                queue.put_nowait(message)
+            return queue
+
+        application.broker.subscribe = subscribe_with_messages
+        application.broker.start_listener = MagicMock()
+        await application(scope, receive, send)
+
+    # The user lookup runs on the test thread, inside its transaction
+    async_to_sync(run)()
+    return sent
+
+
+@pytest.mark.django_db
+class TestPublishEvent:
+    def test_publish_event_does_nothing_when_events_are_disabled(
+        self,
+    ) -> None:
+        with patch(CONNECTION) as connection:
+            publish_event(1, NOTIFICATION_EVENT, {"id": 1})
+        connection.assert_not_called()
+
+    @override_settings(EVENTS_ENABLED=True)
+    def test_publish_event_publishes_on_user_channel(self) -> None:
+        with patch(CONNECTION) as connection:
+            publish_event(1, NOTIFICATION_EVENT, {"id": 1})
+        channel, message = connection().publish.call_args[0]
+        assert channel == get_user_channel(1)
+        assert json.loads(message) == {
+            "event": NOTIFICATION_EVENT,
+            "data": {"id": 1},
+        }
+
+    @override_settings(EVENTS_ENABLED=True)
+    def test_publish_event_do_not_fail_when_redis_is_down(self) -> None:
+        with patch(CONNECTION) as connection:
+            connection().publish.side_effect = ConnectionError()
+            publish_event(1, NOTIFICATION_EVENT, {"id": 1})
+
+    def test_format_event(self) -> None:
+        message: bytes = json.dumps(
+            {"event": NOTIFICATION_EVENT, "data": {"id": 1}}
+        ).encode()
+        expected_event: bytes = b'event: notification\ndata: {"id": 1}\n\n'
+        assert format_event(message) == expected_event
+
+
+@pytest.mark.django_db
+class TestEventPublishers:
+    def test_notification_publishes_an_event_for_each_email(
+        self, django_capture_on_commit_callbacks: callable
+    ) -> None:
+        user: User = UserFaker()
+        notification = NotificationFactory(is_test=False)
+        with patch(PUBLISH) as publish:
+            with django_capture_on_commit_callbacks(execute=True):
+                notification.send()
+        user_id, event, data = publish.call_args[0]
+        assert publish.call_count == 1
+        assert user_id == user.id
+        assert event == NOTIFICATION_EVENT
+        assert data["subject"] == notification.subject
+
+    def test_notification_events_wait_for_the_commit(self) -> None:
+        UserFaker()
+        notification = NotificationFactory(is_test=False)
+        with patch(PUBLISH) as publish:
+            with pytest.raises(ValueError):
+                with transaction.atomic():
+                    notification.send()
+                    raise ValueError
+        publish.assert_not_called()
+
+    def test_mark_suggestion_as_read_publishes_an_event(self) -> None:
+        user: User = UserFaker()
+        suggestion: Suggestion = SuggestionEmailFactory(
+            type=CommentType.ERROR.value, content="Error found", user=user
+        )
+        with patch(PUBLISH) as publish:
+            suggestion.mark_as_read()
+        suggestion.refresh_from_db()
+        assert suggestion.was_read is True
+        publish.assert_called_once_with(
+            user.id,
+            SUGGESTION_READ_EVENT,
+            {"id": suggestion.id, "was_read": True},
+        )
+
+
+@pytest.mark.django_db
+class TestEventBroker:
+    def test_dispatch_only_reaches_the_user_streams(self) -> None:
+        event_broker: EventBroker = EventBroker()
+        event_broker.start_listener = MagicMock()
+
+        async def run() -> tuple:
+            queue: asyncio.Queue = event_broker.subscribe(1)
+            other_queue: asyncio.Queue = event_broker.subscribe(2)
+            message: dict = {"channel": get_user_channel(1), "data": b"{}"}
+            event_broker.dispatch(message)
+            await asyncio.sleep(0)
+            return queue.qsize(), other_queue.qsize()
+
+        assert asyncio.run(run()) == (1, 0)
+
+    def test_unsubscribe_removes_the_stream(self) -> None:
+        event_broker: EventBroker = EventBroker()
+        event_broker.start_listener = MagicMock()
+
+        async def run() -> None:
+            queue: asyncio.Queue = event_broker.subscribe(1)
+            event_broker.unsubscribe(1, queue)
+
+        asyncio.run(run())
+        assert event_broker.subscribers == {}
+
+
+@pytest.mark.django_db
+class TestEventStreamApplication:
+    def test_stream_fails_without_token(self) -> None:
+        scope: dict = {"type": "http", "headers": [], "query_string": b""}
+        sent: list = run_application(scope, [])
+        assert sent[0]["status"] == 401
+
+    def test_stream_fails_with_an_invalid_token(self) -> None:
+        scope: dict = {
+            "type": "http",
+            "headers": [],
+            "query_string": b"token=invalid",
+        }
+        sent: list = run_application(scope, [])
+        assert sent[0]["status"] == 401
+
+    def test_stream_fails_for_a_deleted_user(self) -> None:
+        user: User = VerifiedUserFaker()
+        token: str = str(AccessToken.for_user(user))
+        user.delete()
+        scope: dict = {
+            "type": "http",
+            "headers": [],
+            "query_string": f"token={token}".encode(),
+        }
+        sent: list = run_application(scope, [])
+        assert sent[0]["status"] == 401
+
+    def test_stream_reads_the_cached_user_snapshot(self) -> None:
+        user: User = VerifiedUserFaker()
+        token: str = str(AccessToken.for_user(user))
+        cache_snapshot(user)
+        scope: dict = {
+            "type": "http",
+            "headers": [],
+            "query_string": f"token={token}".encode(),
+        }
+        with patch.object(User.objects, "get") as get:
+            sent: list = run_application(scope, [])
+        get.assert_not_called()
+        assert sent[0]["status"] == 200
+
+    def test_stream_sends_user_events_with_query_token(self) -> None:
+        user: User = VerifiedUserFaker()
+        token: str = str(AccessToken.for_user(user))
+        scope: dict = {
+            "type": "http",
+            "headers": [],
+            "query_string": f"token={token}".encode(),
+        }
+        message: bytes = json.dumps(
+            {"event": NOTIFICATION_EVENT, "data": {"id": 1}}
+        ).encode()
+        sent: list = run_application(scope, [message])
+        assert sent[0]["status"] == 200
+        assert (b"content-type", b"text/event-stream") in sent[0]["headers"]
+        assert sent[1]["body"] == format_event(message)
+
+    def test_stream_accepts_authorization_header(self) -> None:
+        user: User = VerifiedUserFaker()
+        token: str = str(AccessToken.for_user(user))
+        scope: dict = {
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+            "query_string": b"",
+        }
+        sent: list = run_application(scope, [])
+        assert sent[0]["status"] == 200
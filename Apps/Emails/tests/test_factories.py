@@ -68,13 +68,14 @@ class TestEmailFactories:
         email: Email = ResetEmailFactory(instance=instance)
         assert Email.objects.count() == 1
         assert Block.objects.count() == 1
+        assert email.parameters["key"] == instance.key
         assert email.subject == settings.RESET_PASSWORD_EMAIL_SUBJECT
         assert email.header == settings.RESET_PASSWORD_EMAIL_HEADER
         assert email.is_test is False
         assert email.to == user
         assert email.programed_send_date is not None
         assert email.blocks is not None
-        block: Block = email.blocks.first()
+        block: Block = email.blocks.first().render(email.parameters)
         assert settings.EMAIL_GREETING in block.title
         assert user.first_name in block.title
         assert block.content == settings.RESET_PASSWORD_EMAIL_CONTENT
@@ -104,7 +105,7 @@ class TestEmailFactories:
         assert email.to == user
         assert email.programed_send_date is not None
         assert email.blocks is not None
-        block: Block = email.blocks.first()
+        block: Block = email.blocks.first().render(email.parameters)
         assert settings.EMAIL_GREETING in block.title
         assert user.first_name in block.title
         assert block.content == settings.VERIFY_EMAIL_CONTENT
@@ -127,44 +128,33 @@ class TestBlockFactories:
         assert block.link_text is not None
         assert block.link is not None
 
-    def test_reset_password_block_factory_raises_exception_without_params(
-        self,
-    ) -> None:
-        assert Email.objects.count() == 0
-        assert Block.objects.count() == 0
-        with pytest.raises(AttributeError):
-            ResetPasswordBlockFactory()
-        assert Email.objects.count() == 0
-        assert Block.objects.count() == 0
+    def test_reset_password_block_factory_is_shared(self) -> None:
+        first_block: Block = ResetPasswordBlockFactory()
+        second_block: Block = ResetPasswordBlockFactory()
+        assert Block.objects.count() == 1
+        assert first_block == second_block
 
     def test_reset_password_block_factory(self) -> None:
         assert Block.objects.count() == 0
-        user: User = UserFactory()
-        instance: ResetPasswordToken = ResetPasswordToken.objects.create(
-            user=user
-        )
-        block: Block = ResetPasswordBlockFactory(instance=instance)
+        block: Block = ResetPasswordBlockFactory()
         assert Block.objects.count() == 1
+        assert block.content_hash == block.get_content_hash()
         assert block.title is not None
         assert block.content is not None
         assert block.show_link is not None
         assert block.link_text is not None
         assert block.link is not None
 
-    def test_verify_email_block_factory_raises_exception_without_params(
-        self,
-    ) -> None:
-        assert Email.objects.count() == 0
-        assert Block.objects.count() == 0
-        with pytest.raises(AttributeError):
-            VerifyEmailBlockFactory()
-        assert Email.objects.count() == 0
-        assert Block.objects.count() == 0
+    def test_verify_email_block_factory_is_shared(self) -> None:
+        first_email: Email = VerifyEmailFactory(instance=UserFactory())
+        second_email: Email = VerifyEmailFactory(instance=UserFactory())
+        assert Block.objects.count() == 1
+        assert first_email.blocks.first() == second_email.blocks.first()
+        assert first_email.parameters != second_email.parameters
 
     def test_verify_email_block_factory(self) -> None:
         assert Block.objects.count() == 0
-        user: User = UserFactory()
-        block: Block = VerifyEmailBlockFactory(user=user)
+        block: Block = VerifyEmailBlockFactory()
         assert Block.objects.count() == 1
         assert block.title is not None
         assert block.content is not None
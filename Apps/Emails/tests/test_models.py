@@ -42,6 +42,53 @@ class TestBlockModel:
         expected_str: str = f"{block.id} | {block.title}"
         assert str(block) == expected_str
 
+    def test_block_content_hash_is_set_on_save(self) -> None:
+        block: Block = BlockFactory()
+        assert block.content_hash == block.get_content_hash()
+        block.title = "Other title"
+        block.save()
+        assert block.content_hash == block.get_content_hash()
+
+    def test_get_or_create_by_content_shares_equal_blocks(self) -> None:
+        fields: dict = {"title": "Hi ${name}", "content": "Content"}
+        block: Block = Block.objects.get_or_create_by_content(**fields)
+        same_block: Block = Block.objects.get_or_create_by_content(**fields)
+        other_block: Block = Block.objects.get_or_create_by_content(
+            title="Hi", content="Content"
+        )
+        assert block == same_block
+        assert block != other_block
+        assert Block.objects.count() == 2
+
+    def test_create_returns_the_block_with_the_same_content(self) -> None:
+        fields: dict = {"title": "Title", "content": "Content"}
+        block: Block = Block.objects.create(**fields)
+        assert Block.objects.create(**fields) == block
+        assert Block.objects.count() == 1
+
+    def test_validate_unique_rejects_duplicated_content(self) -> None:
+        block: Block = BlockFactory()
+        duplicate: Block = Block(
+            title=block.title,
+            content=block.content,
+            show_link=block.show_link,
+            link_text=block.link_text,
+            link=block.link,
+        )
+        with pytest.raises(ValidationError):
+            duplicate.validate_unique()
+        block.validate_unique()
+
+    def test_block_render_fills_the_placeholders(self) -> None:
+        block: Block = BlockFactory(
+            title="Hi ${name}", link="https://appname.me/${id}"
+        )
+        rendered_block: Block = block.render({"name": "Ana", "id": 3})
+        assert rendered_block.title == "Hi Ana"
+        assert rendered_block.link == "https://appname.me/3"
+        assert rendered_block.id == block.id
+        assert block.title == "Hi ${name}"
+
 
 @pytest.mark.django_db
 class TestEmailModel:
@@ -0,0 +1,161 @@
+from datetime import date
+
+import pytest
+from django.utils import timezone
+from mock import patch
+
+from Emails.factories.email import EmailFactory
+from Emails.models.models import Email
+from Emails.partitions import FUTURE_PARTITION
+from Emails.partitions import PARTITION_COLUMN
+from Emails.partitions import PartitioningError
+from Emails.partitions import add_months
+from Emails.partitions import drop_partitions
+from Emails.partitions import get_add_statements
+from Emails.partitions import get_drop_statement
+from Emails.partitions import get_old_partitions
+from Emails.partitions import get_partition_definition
+from Emails.partitions import get_partition_month
+from Emails.partitions import get_partition_name
+from Emails.partitions import get_setup_statements
+from Emails.partitions import setup_partitions
+from Emails.tasks import send_emails
+from Emails.tasks import send_overdue_emails
+
+
+MONTH: date = date(2022, 11, 1)
+PARTITIONS: str = "Emails.partitions"
+
+
+class TestPartitionNames:
+    def test_add_months_across_years(self) -> None:
+        assert add_months(MONTH, 2) == date(2023, 1, 1)
+        assert add_months(MONTH, -11) == date(2021, 12, 1)
+
+    def test_partition_name_and_month(self) -> None:
+        assert get_partition_name(MONTH) == "p202211"
+        assert get_partition_month("p202211") == MONTH
+        assert get_partition_month(FUTURE_PARTITION) is None
+
+    def test_partition_definition_bounds_the_month(self) -> None:
+        definition: str = get_partition_definition(MONTH)
+        assert definition == (
+            "PARTITION p202211 VALUES LESS THAN (TO_DAYS('2022-12-01'))"
+        )
+
+
+class TestPartitionStatements:
+    def test_setup_extends_the_primary_key_and_partitions_by_month(
+        self,
+    ) -> None:
+        statements: list = get_setup_statements(["id"], MONTH, 1)
+        assert len(statements) == 2
+        assert "ADD PRIMARY KEY" in statements[0]
+        assert "p202211" in statements[-1]
+        assert "p202212" in statements[-1]
+        assert "p202301" not in statements[-1]
+        assert FUTURE_PARTITION in statements[-1]
+
+    def test_setup_resumes_after_the_primary_key_change(self) -> None:
+        primary_key: list = ["id", PARTITION_COLUMN]
+        statements: list = get_setup_statements(primary_key, MONTH, 1)
+        assert len(statements) == 1
+        assert "PARTITION BY RANGE" in statements[0]
+
+    def test_setup_requires_the_migrated_schema(self) -> None:
+        with patch("Emails.partitions.get_partitions", return_value=[]):
+            with patch(
+                "Emails.partitions.get_foreign_keys", return_value=["fk"]
+            ):
+                with pytest.raises(PartitioningError):
+                    setup_partitions(1)
+
+    def test_email_table_has_no_foreign_key_constraints(self) -> None:
+        for field in Email._meta.concrete_fields:
+            if field.is_relation:
+                assert field.db_constraint is False
+        assert Email._meta.get_field(PARTITION_COLUMN).null is False
+
+    def test_add_only_creates_missing_months(self) -> None:
+        partitions: list = ["p202211", "p202212", FUTURE_PARTITION]
+        statements: list = get_add_statements(partitions, MONTH, 3)
+        assert len(statements) == 1
+        assert f"REORGANIZE PARTITION {FUTURE_PARTITION}" in statements[0]
+        assert "p202212" not in statements[0]
+        assert "p202301" in statements[0]
+        assert "p202302" in statements[0]
+
+    def test_add_does_nothing_when_months_exist(self) -> None:
+        partitions: list = ["p202211", "p202212", FUTURE_PARTITION]
+        assert get_add_statements(partitions, MONTH, 1) == []
+
+    def test_drop_only_old_partitions(self) -> None:
+        partitions: list = ["p202210", "p202211", FUTURE_PARTITION]
+        assert get_old_partitions(partitions, MONTH) == ["p202210"]
+        assert get_drop_statement("p202210").endswith("DROP PARTITION p202210")
+
+
+class TestDropPartitions:
+    @pytest.fixture(autouse=True)
+    def partitions(self, settings: object) -> None:
+        settings.EMAIL_ARCHIVE_PAUSE_SECONDS = 0
+        partitions: list = ["p202210", "p202211", FUTURE_PARTITION]
+        with patch(f"{PARTITIONS}.get_partitions", return_value=partitions):
+            yield
+
+    def test_partitions_with_unarchived_emails_are_kept(self) -> None:
+        with patch(f"{PARTITIONS}.count_unarchived_rows", return_value=2):
+            with patch(f"{PARTITIONS}.execute_statements") as execute:
+                assert drop_partitions(MONTH) == []
+        execute.assert_not_called()
+
+    def test_parent_rows_are_deleted_in_chunks_before_the_drop(
+        self,
+    ) -> None:
+        with patch(
+            f"{PARTITIONS}.count_unarchived_rows", return_value=0
+        ), patch(
+            f"{PARTITIONS}.get_parent_ids", side_effect=[[1, 2], [3], []]
+        ), patch(
+            f"{PARTITIONS}.delete_parent_rows"
+        ) as delete, patch(
+            f"{PARTITIONS}.execute_statements"
+        ) as execute:
+            statements: list = drop_partitions(MONTH)
+        assert [call[0][0] for call in delete.call_args_list] == [[1, 2], [3]]
+        assert statements == [get_drop_statement("p202210")]
+        execute.assert_called_once_with(statements)
+
+    def test_drop_waits_when_the_chunks_run_out(
+        self, settings: object
+    ) -> None:
+        settings.EMAIL_ARCHIVE_MAX_CHUNKS = 1
+        with patch(
+            f"{PARTITIONS}.count_unarchived_rows", return_value=0
+        ), patch(f"{PARTITIONS}.get_parent_ids", return_value=[1]), patch(
+            f"{PARTITIONS}.delete_parent_rows"
+        ) as delete, patch(
+            f"{PARTITIONS}.execute_statements"
+        ) as execute:
+            assert drop_partitions(MONTH) == []
+        delete.assert_called_once_with([1])
+        execute.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestSendEmailsLookback:
+    def test_send_emails_skips_emails_older_than_the_lookback(self) -> None:
+        recent: Email = EmailFactory()
+        old: Email = EmailFactory()
+        Email.objects.filter(id=recent.id).update(
+            programed_send_date=timezone.now() - timezone.timedelta(hours=1)
+        )
+        Email.objects.filter(id=old.id).update(
+            programed_send_date=timezone.now() - timezone.timedelta(days=30)
+        )
+        with patch.object(Email, "send", autospec=True) as send:
+            send_emails()
+        assert [call[0][0].id for call in send.call_args_list] == [recent.id]
+        with patch.object(Email, "send", autospec=True) as send:
+            send_overdue_emails()
+        assert [call[0][0].id for call in send.call_args_list] == [old.id]
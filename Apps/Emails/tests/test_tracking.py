@@ -0,0 +1,237 @@
+import pytest
+from django.conf import settings
+from django.core.signing import Signer
+from mock import MagicMock
+from mock import patch
+from redis.exceptions import ConnectionError
+from redis.exceptions import ResponseError
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from Emails.factories.block import BlockFactory
+from Emails.factories.email import EmailFactory
+from Emails.models.models import TRACKING_SALT
+from Emails.models.models import Block
+from Emails.models.models import Email
+from Emails.tracking import CLICKS_KEY
+from Emails.tracking import OPENS_KEY
+from Emails.tracking import flush_tracking
+from Emails.tracking import write_counts
+
+
+CONNECTION: str = "Emails.tracking.get_redis_connection"
+BASE_ENDPOINT: str = "/api/emails"
+
+
+def get_url(email: Email, action: str) -> str:
+    tracking_id: str = Signer(salt=TRACKING_SALT).sign(str(email.id))
+    return f"{BASE_ENDPOINT}/{tracking_id}/{action}/"
+
+
+@pytest.fixture(scope="function")
+def client() -> APIClient:
+    return APIClient()
+
+
+@pytest.mark.django_db
+class TestEmailTrackingViews:
+    def test_open_returns_a_pixel_and_buffers_the_hit(
+        self, client: APIClient
+    ) -> None:
+        email: Email = EmailFactory()
+        with patch(CONNECTION) as connection:
+            response: Response = client.get(get_url(email, "open"))
+        assert response.status_code == 200
+        assert response["Content-Type"] == "image/gif"
+        connection().hincrby.assert_called_once_with(OPENS_KEY, email.id, 1)
+
+    def test_open_does_not_query_the_database(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        email: Email = EmailFactory()
+        with patch(CONNECTION), django_assert_num_queries(0):
+            response: Response = client.get(get_url(email, "open"))
+        assert response.status_code == 200
+
+    def test_open_with_a_forged_signature_is_not_buffered(
+        self, client: APIClient
+    ) -> None:
+        email: Email = EmailFactory()
+        with patch(CONNECTION) as connection:
+            response: Response = client.get(
+                f"{BASE_ENDPOINT}/{email.id}:forged/open/"
+            )
+        assert response.status_code == 200
+        assert response["Content-Type"] == "image/gif"
+        connection().hincrby.assert_not_called()
+
+    @pytest.mark.parametrize("action", ["open", "click"])
+    def test_unsigned_ids_are_not_routed(
+        self, client: APIClient, action: str
+    ) -> None:
+        email: Email = EmailFactory()
+        with patch(CONNECTION) as connection:
+            response: Response = client.get(
+                f"{BASE_ENDPOINT}/{email.id}/{action}/"
+            )
+        assert response.status_code == 404
+        connection().hincrby.assert_not_called()
+
+    def test_open_works_when_redis_is_down(self, client: APIClient) -> None:
+        email: Email = EmailFactory()
+        with patch(CONNECTION) as connection:
+            connection().hincrby.side_effect = ConnectionError()
+            response: Response = client.get(get_url(email, "open"))
+        assert response.status_code == 200
+
+    def test_click_redirects_to_the_block_link(
+        self, client: APIClient
+    ) -> None:
+        block: Block = BlockFactory(link="https://appname.me/")
+        email: Email = EmailFactory(blocks=[block])
+        url: str = f"{get_url(email, 'click')}?block={block.id}"
+        with patch(CONNECTION) as connection:
+            response: Response = client.get(url)
+        assert response.status_code == 302
+        assert response["Location"] == block.link
+        connection().hincrby.assert_called_once_with(CLICKS_KEY, email.id, 1)
+
+    def test_click_redirects_to_the_rendered_link(
+        self, client: APIClient
+    ) -> None:
+        block: Block = BlockFactory(link="https://appname.me/${id}")
+        email: Email = EmailFactory(blocks=[block], parameters={"id": 7})
+        url: str = f"{get_url(email, 'click')}?block={block.id}"
+        with patch(CONNECTION):
+            response: Response = client.get(url)
+        assert response["Location"] == "https://appname.me/7"
+
+    def test_click_fails_with_a_forged_signature(
+        self, client: APIClient
+    ) -> None:
+        block: Block = BlockFactory(link="https://appname.me/")
+        email: Email = EmailFactory(blocks=[block])
+        url: str = f"{BASE_ENDPOINT}/{email.id}:forged/click/?block={block.id}"
+        with patch(CONNECTION) as connection:
+            response: Response = client.get(url)
+        assert response.status_code == 404
+        connection().hincrby.assert_not_called()
+
+    def test_click_fails_with_a_block_of_other_email(
+        self, client: APIClient
+    ) -> None:
+        email: Email = EmailFactory()
+        other_block: Block = BlockFactory(link="https://appname.me/")
+        url: str = f"{get_url(email, 'click')}?block={other_block.id}"
+        with patch(CONNECTION) as connection:
+            response: Response = client.get(url)
+        assert response.status_code == 404
+        connection().hincrby.assert_not_called()
+
+    @pytest.mark.parametrize("block", ["abc", "", "1.5"])
+    def test_click_fails_with_an_invalid_block(
+        self, client: APIClient, block: str
+    ) -> None:
+        email: Email = EmailFactory()
+        url: str = f"{get_url(email, 'click')}?block={block}"
+        with patch(CONNECTION) as connection:
+            response: Response = client.get(url)
+        assert response.status_code == 404
+        connection().hincrby.assert_not_called()
+
+    def test_click_fails_without_block(self, client: APIClient) -> None:
+        email: Email = EmailFactory()
+        with patch(CONNECTION):
+            response: Response = client.get(get_url(email, "click"))
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestFlushTracking:
+    def test_write_counts_increments_the_aggregate_columns(self) -> None:
+        first_email: Email = EmailFactory()
+        second_email: Email = EmailFactory()
+        write_counts("open_count", {first_email.id: 3, second_email.id: 1})
+        write_counts("open_count", {first_email.id: 2})
+        first_email.refresh_from_db()
+        second_email.refresh_from_db()
+        assert first_email.open_count == 5
+        assert second_email.open_count == 1
+
+    def test_write_counts_uses_one_update_per_chunk(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        emails: list = [EmailFactory() for _ in range(3)]
+        counts: dict = {email.id: 1 for email in emails}
+        with patch.object(settings, "EMAIL_TRACKING_FLUSH_CHUNK_SIZE", 2):
+            # Two updates plus the savepoint queries of the transaction
+            with django_assert_num_queries(4):
+                write_counts("click_count", counts)
+
+    def test_flush_tracking_drains_the_buffers(self) -> None:
+        email: Email = EmailFactory()
+        connection: MagicMock = MagicMock()
+        connection.hgetall.side_effect = [
+            {str(email.id).encode(): b"4"},
+            {str(email.id).encode(): b"2"},
+        ]
+        with patch(CONNECTION, return_value=connection):
+            flush_tracking()
+        email.refresh_from_db()
+        assert email.open_count == 4
+        assert email.click_count == 2
+        connection.renamenx.assert_any_call(OPENS_KEY, f"{OPENS_KEY}:flushing")
+        connection.delete.assert_any_call(f"{CLICKS_KEY}:flushing")
+        connection.lock().release.assert_called_once()
+
+    def test_flush_tracking_without_hits(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        connection: MagicMock = MagicMock()
+        connection.renamenx.side_effect = ResponseError("no such key")
+        connection.hgetall.return_value = {}
+        with patch(CONNECTION, return_value=connection):
+            with django_assert_num_queries(0):
+                flush_tracking()
+
+    def test_flush_tracking_resumes_a_failed_flush(self) -> None:
+        email: Email = EmailFactory()
+        connection: MagicMock = MagicMock()
+        # The buffer of the failed flush is not replaced by the new hits
+        connection.renamenx.return_value = False
+        connection.hgetall.return_value = {str(email.id).encode(): b"1"}
+        with patch(CONNECTION, return_value=connection):
+            flush_tracking()
+        email.refresh_from_db()
+        assert email.open_count == 1
+        connection.rename.assert_not_called()
+
+    def test_flush_tracking_skips_while_another_flush_runs(self) -> None:
+        email: Email = EmailFactory()
+        connection: MagicMock = MagicMock()
+        connection.lock.return_value.acquire.return_value = False
+        connection.hgetall.return_value = {str(email.id).encode(): b"1"}
+        with patch(CONNECTION, return_value=connection):
+            flush_tracking()
+        email.refresh_from_db()
+        assert email.open_count == 0
+        connection.renamenx.assert_not_called()
+        connection.hgetall.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestEmailTrackingTemplate:
+    def test_email_template_links_are_tracked(self) -> None:
+        block: Block = BlockFactory(show_link=True)
+        email: Email = EmailFactory(blocks=[block])
+        template: str = email.get_template()
+        tracking: dict = email.get_tracking_urls()
+        assert tracking["open"] in template
+        assert f"{tracking['click']}?block={block.id}" in template
+
+    def test_tracking_urls_carry_the_signed_id(self) -> None:
+        email: Email = EmailFactory()
+        tracking_id: str = email.get_tracking_urls()["open"].split("/")[-3]
+        assert Email.get_tracked_id(tracking_id) == email.id
+        signature: str = tracking_id.split(":")[1]
+        assert Email.get_tracked_id(f"{email.id + 1}:{signature}") is None
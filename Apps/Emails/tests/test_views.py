@@ -6,6 +6,7 @@ from rest_framework.test import APIClient
 from Emails.choices import CommentType
 from Emails.factories.suggestion import SuggestionEmailFactory
 from Emails.models.models import Suggestion
+from Project.utils.testing import assert_constant_query_count
 from Users.fakers.user import AdminFaker
 from Users.fakers.user import UserFaker
 from Users.fakers.user import VerifiedUserFaker
@@ -202,3 +203,21 @@ class TestUserSuggestionViews:
         assert response.status_code == 200
         assert len(response.data["results"]) == 1
         assert response.data["count"] == Suggestion.objects.count()
+
+    def test_list_user_suggestion_queries_do_not_grow_with_results(
+        self, client: APIClient
+    ) -> None:
+        user: User = UserFaker()
+        client.force_authenticate(user=user)
+        type: str = CommentType.ERROR.value
+
+        def create_suggestions(number: int) -> None:
+            for _ in range(number):
+                SuggestionEmailFactory(
+                    type=type, content="Error found", user=user
+                )
+
+        assert_constant_query_count(
+            lambda: client.get(f"{BASE_ENDPOINT}/{self.ACTION}/"),
+            create_suggestions,
+        )
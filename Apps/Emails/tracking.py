@@ -0,0 +1,102 @@
+import logging
+from logging import Logger
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import F
+from django.db.models import PositiveIntegerField
+from django.db.models import Value
+from django.db.models import When
+from redis import Redis
+from redis.exceptions import LockError
+from redis.exceptions import RedisError
+from redis.exceptions import ResponseError
+from redis.lock import Lock
+
+from Emails.models.models import Email
+from Project.utils.redis_client import get_redis_connection
+
+
+logger: Logger = logging.getLogger(__name__)
+
+OPENS_KEY: str = "tracking:emails:opens"
+CLICKS_KEY: str = "tracking:emails:clicks"
+FLUSH_LOCK_KEY: str = "tracking:emails:flush_lock"
+TRACKED_FIELDS: dict = {OPENS_KEY: "open_count", CLICKS_KEY: "click_count"}
+
+
+def track_open(email_id: int) -> None:
+    buffer_hit(OPENS_KEY, email_id)
+
+
+def track_click(email_id: int) -> None:
+    buffer_hit(CLICKS_KEY, email_id)
+
+
+def buffer_hit(key: str, email_id: int) -> None:
+    """
+    Counts the hit in a redis hash, the database is only written when the
+    buffer is flushed
+    """
+    try:
+        get_redis_connection().hincrby(key, email_id, 1)
+    except RedisError:
+        logger.warning(f"Emails App | Tracking hit on {email_id} lost")
+
+
+def flush_tracking() -> None:
+    """
+    Moves the buffered hits to the emails aggregate columns. The flushes
+    hold a lock, two of them would write the same buffer twice.
+    """
+    connection: Redis = get_redis_connection()
+    lock: Lock = connection.lock(
+        FLUSH_LOCK_KEY, timeout=settings.EMAIL_TRACKING_FLUSH_LOCK_TIMEOUT
+    )
+    if not lock.acquire(blocking=False):
+        logger.info("Emails App | Tracking flush already running")
+        return
+    try:
+        for key, field in TRACKED_FIELDS.items():
+            flushing_key: str = f"{key}:flushing"
+            counts: dict = drain_hits(connection, key, flushing_key)
+            if counts:
+                write_counts(field, counts)
+            connection.delete(flushing_key)
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            logger.warning("Emails App | Tracking flush lock expired")
+
+
+def drain_hits(connection: Redis, key: str, flushing_key: str) -> dict:
+    """
+    Renames the buffer so new hits go to a fresh hash while this one is
+    written. A buffer left by a failed flush is kept, RENAMENX does not
+    replace it, and written before taking a new one.
+    """
+    try:
+        connection.renamenx(key, flushing_key)
+    except ResponseError:
+        # There are no new hits
+        pass
+    hits: dict = connection.hgetall(flushing_key)
+    return {int(email_id): int(count) for email_id, count in hits.items()}
+
+
+def write_counts(field: str, counts: dict) -> None:
+    email_ids: list = sorted(counts)
+    chunk_size: int = settings.EMAIL_TRACKING_FLUSH_CHUNK_SIZE
+    with transaction.atomic():
+        for start in range(0, len(email_ids), chunk_size):
+            chunk: list = email_ids[start : start + chunk_size]
+            increment: Case = Case(
+                *[When(pk=id, then=Value(counts[id])) for id in chunk],
+                default=Value(0),
+                output_field=PositiveIntegerField(),
+            )
+            Email.objects.filter(pk__in=chunk).update(
+                **{field: F(field) + increment}
+            )
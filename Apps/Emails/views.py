@@ -1,17 +1,29 @@
+import base64
+
 from django.db.models import QuerySet
+from django.http import Http404
 from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination
+from rest_framework.permissions import AllowAny
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from Emails.factories.suggestion import SuggestionEmailFactory
+from Emails.models.models import Block
+from Emails.models.models import Email
 from Emails.models.models import Suggestion
 from Emails.serializers import SuggestionEmailSerializer
-from Project.pagination import ListTenResultsSetPagination
+from Emails.tracking import track_click
+from Emails.tracking import track_open
+from Project.mixins import SerializerRelationsMixin
+from Project.pagination import SelectableResultsSetPagination
+from Project.throttling import SLIDING_WINDOW_THROTTLES
 from Users.models import User
 from Users.permissions import IsAdmin
 from Users.permissions import IsSameUserId
@@ -19,9 +31,12 @@ from Users.permissions import IsVerified
 
 
 CREATED = status.HTTP_201_CREATED
+TRACKING_PIXEL: bytes = base64.b64decode(
+    "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+)
 
 
-class SuggestionViewSet(viewsets.GenericViewSet):
+class SuggestionViewSet(SerializerRelationsMixin, viewsets.GenericViewSet):
     """
     API endpoint that allows users to create and list suggestions email.
     Allows also to admins to mark a suggestions as read.
@@ -31,10 +46,17 @@ class SuggestionViewSet(viewsets.GenericViewSet):
     LIST_PERMISSIONS: list = [IsAuthenticated & (IsAdmin | IsSameUserId)]
     READ_PERMISSIONS: list = [IsAuthenticated & IsAdmin]
     queryset: QuerySet = Suggestion.objects.all().order_by("-id")
-    pagination_class: PageNumberPagination = ListTenResultsSetPagination
+    serializer_class: SuggestionEmailSerializer = SuggestionEmailSerializer
+    pagination_ordering: tuple = ("-id",)
+    pagination_class: BasePagination = SelectableResultsSetPagination
+    throttle_scope: str = None
 
     @action(
-        detail=False, methods=["post"], permission_classes=SUBMIT_PERMISSIONS
+        detail=False,
+        methods=["post"],
+        permission_classes=SUBMIT_PERMISSIONS,
+        throttle_classes=SLIDING_WINDOW_THROTTLES,
+        throttle_scope="suggestion",
     )
     def submit(self, request: HttpRequest) -> Response:
         type: str = request.data.get("type")
@@ -50,15 +72,62 @@ class SuggestionViewSet(viewsets.GenericViewSet):
     @action(detail=True, methods=["post"], permission_classes=READ_PERMISSIONS)
     def read(self, request: HttpRequest, pk: int = None) -> Response:
         suggestion: Suggestion = get_object_or_404(Suggestion, pk=pk)
-        suggestion.was_read = True
-        suggestion.save()
+        suggestion.mark_as_read()
         data: dict = SuggestionEmailSerializer(suggestion).data
         return Response(data=data, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=["get"], permission_classes=LIST_PERMISSIONS)
     def user(self, request: HttpRequest) -> Response:
         user_id: int = request.GET.get("user_id", request.user.id)
-        suggestions: QuerySet = self.queryset.filter(user_id=user_id)
+        suggestions: QuerySet = self.get_queryset().filter(user_id=user_id)
         page: QuerySet = self.paginate_queryset(suggestions)
-        data: dict = SuggestionEmailSerializer(page, many=True).data
+        data: dict = self.get_serializer(page, many=True).data
         return self.get_paginated_response(data)
+
+
+class EmailTrackingViewSet(viewsets.GenericViewSet):
+    """
+    Public endpoints linked from the sent emails to track opens and clicks.
+    The hits are buffered in redis and flushed periodically by a task, so
+    they never write to the database. The urls carry the email id signed,
+    only the hits with a valid signature are buffered, so they can not be
+    forged for other emails.
+    """
+
+    queryset: QuerySet = Email.objects.all()
+    authentication_classes: list = []
+    permission_classes: list = [AllowAny]
+    lookup_value_regex: str = "[0-9]+:[A-Za-z0-9_-]+"
+
+    @action(detail=True, methods=["get"])
+    def open(self, request: HttpRequest, pk: str = None) -> HttpResponse:
+        email_id: int or None = Email.get_tracked_id(pk)
+        if email_id is not None:
+            track_open(email_id)
+        response: HttpResponse = HttpResponse(
+            TRACKING_PIXEL, content_type="image/gif"
+        )
+        response["Cache-Control"] = "no-store"
+        return response
+
+    @action(detail=True, methods=["get"])
+    def click(self, request: HttpRequest, pk: str = None) -> HttpResponse:
+        email_id: int or None = Email.get_tracked_id(pk)
+        if email_id is None:
+            raise Http404("Email not found")
+        try:
+            block_id: int = int(request.query_params.get("block", ""))
+        except ValueError:
+            raise Http404("Block not found")
+        block: Block = get_object_or_404(
+            Block.objects.exclude(link=None).exclude(link=""),
+            pk=block_id,
+            abstractemailclass_blocks=email_id,
+        )
+        parameters: dict = (
+            Email.objects.filter(pk=email_id)
+            .values_list("parameters", flat=True)
+            .first()
+        )
+        track_click(email_id)
+        return HttpResponseRedirect(block.render(parameters).link)
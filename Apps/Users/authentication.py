@@ -0,0 +1,111 @@
+import hashlib
+import logging
+from functools import lru_cache
+from logging import Logger
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+
+logger: Logger = logging.getLogger(__name__)
+
+
+def get_user_cache_key(user_id: int) -> str:
+    return f"users:snapshot:{get_snapshot_version()}:{user_id}"
+
+
+@lru_cache(maxsize=None)
+def get_snapshot_fields() -> tuple:
+    # The password hash is never cached, it is loaded on demand
+    return tuple(
+        field.attname
+        for field in get_user_model()._meta.concrete_fields
+        if field.attname != "password"
+    )
+
+
+@lru_cache(maxsize=None)
+def get_snapshot_version() -> str:
+    """
+    Hash of the snapshot fields, the snapshots are positional so the ones
+    cached before the user columns change are never read after it
+    """
+    fields: bytes = ",".join(get_snapshot_fields()).encode()
+    return hashlib.sha256(fields).hexdigest()[:12]
+
+
+def get_snapshot(user: Model) -> tuple:
+    return tuple(getattr(user, field) for field in get_snapshot_fields())
+
+
+def get_user_from_snapshot(snapshot: tuple) -> Model:
+    return get_user_model().from_db(
+        DEFAULT_DB_ALIAS, get_snapshot_fields(), snapshot
+    )
+
+
+def get_cached_snapshot(user_id: int) -> tuple or None:
+    try:
+        return caches[settings.USER_CACHE_ALIAS].get(
+            get_user_cache_key(user_id)
+        )
+    except Exception:
+        logger.warning(f"Users App | User cache unavailable for {user_id}")
+        return None
+
+
+def cache_snapshot(user: Model) -> None:
+    key: str = get_user_cache_key(user.pk)
+    snapshot: tuple = get_snapshot(user)
+    try:
+        caches[settings.USER_CACHE_ALIAS].set(
+            key, snapshot, settings.USER_CACHE_TIMEOUT
+        )
+    except Exception:
+        logger.warning(f"Users App | User cache unavailable for {user.pk}")
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Removes the user snapshot from the cache, other processes keep their
+    local copy until it expires
+    """
+    try:
+        caches[settings.USER_CACHE_ALIAS].delete(get_user_cache_key(user_id))
+    except Exception:
+        logger.warning(f"Users App | User cache unavailable for {user_id}")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the token user from the two tier
+    cache before querying the database
+    """
+
+    def get_user(self, validated_token: Token) -> Model:
+        try:
+            user_id: int = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+        snapshot: tuple = get_cached_snapshot(user_id)
+        if snapshot is None:
+            user: Model = super().get_user(validated_token)
+            cache_snapshot(user)
+            return user
+        user: Model = get_user_from_snapshot(snapshot)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
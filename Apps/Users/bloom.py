@@ -0,0 +1,119 @@
+import hashlib
+import logging
+from logging import Logger
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from Project.utils.redis_client import get_redis_connection
+from Users.models import User
+
+
+logger: Logger = logging.getLogger(__name__)
+
+
+def normalize_email(email: str) -> str:
+    # The unique email index compares case insensitively, so does the filter
+    return email.strip().lower()
+
+
+class BloomFilter:
+    """
+    Bloom filter stored as a redis bitmap, so every process reads and
+    writes the same one. It answers that a value is surely not added or
+    that it may be, values can not be removed. Until build marks it as
+    ready it does not answer, as it may be missing values.
+    """
+
+    def __init__(self, key: str, size: int, hashes: int) -> None:
+        self.key: str = key
+        self.ready_key: str = f"{key}:ready"
+        self.size: int = size
+        self.hashes: int = hashes
+
+    def get_positions(self, value: str) -> list:
+        # Double hashing, every position derives from two 64 bit hashes
+        digest: bytes = hashlib.blake2b(
+            value.encode(), digest_size=16
+        ).digest()
+        first: int = int.from_bytes(digest[:8], "big")
+        second: int = int.from_bytes(digest[8:], "big") | 1
+        return [
+            (first + index * second) % self.size
+            for index in range(self.hashes)
+        ]
+
+    def add_many(self, values: list) -> None:
+        pipeline: object = get_redis_connection().pipeline(transaction=False)
+        for value in values:
+            for position in self.get_positions(value):
+                pipeline.setbit(self.key, position, 1)
+        pipeline.execute()
+
+    def might_contain(self, value: str) -> bool or None:
+        """
+        Returns None when the filter can not answer, because it is not
+        built or redis is down
+        """
+        pipeline: object = get_redis_connection().pipeline(transaction=False)
+        pipeline.exists(self.ready_key)
+        for position in self.get_positions(value):
+            pipeline.getbit(self.key, position)
+        try:
+            is_ready, *bits = pipeline.execute()
+        except RedisError:
+            logger.warning(f"Users App | Bloom filter {self.key} unavailable")
+            return None
+        if not is_ready:
+            return None
+        return all(bits)
+
+    def start_build(self, reset: bool = False) -> None:
+        connection: object = get_redis_connection()
+        connection.delete(self.ready_key)
+        if reset:
+            connection.delete(self.key)
+
+    def finish_build(self) -> None:
+        get_redis_connection().set(self.ready_key, 1)
+
+
+email_filter: BloomFilter = BloomFilter(
+    settings.EMAIL_FILTER_KEY,
+    settings.EMAIL_FILTER_SIZE,
+    settings.EMAIL_FILTER_HASHES,
+)
+
+
+def add_emails(emails: list) -> None:
+    if not settings.EMAIL_FILTER_ENABLED:
+        return
+    try:
+        email_filter.add_many([normalize_email(email) for email in emails])
+    except RedisError:
+        logger.warning("Users App | Emails not added to the bloom filter")
+        mark_filter_stale()
+
+
+def mark_filter_stale() -> None:
+    """
+    A filter missing emails would answer them as available, so it stops
+    answering until it is built again
+    """
+    try:
+        email_filter.start_build()
+    except RedisError:
+        # The signup insert still rejects the email
+        logger.error("Users App | Bloom filter may be missing emails")
+
+
+def is_email_taken(email: str) -> bool:
+    """
+    The database is only queried when the filter says the email may be
+    taken, or when it can not answer
+    """
+    email = normalize_email(email)
+    if settings.EMAIL_FILTER_ENABLED:
+        if email_filter.might_contain(email) is False:
+            return False
+    return User.objects.filter(email__iexact=email).exists()
@@ -0,0 +1,77 @@
+from datetime import date
+
+from django.db.models import QuerySet
+from django_filters import rest_framework as filters
+
+from Users.choices import GenderChoices
+from Users.choices import PreferredLanguageChoices
+from Users.models import Profile
+from Users.models import User
+from Users.models import get_birth_date_cutoff
+
+
+MAX_AGE: int = 150
+
+
+class UserFilter(filters.FilterSet):
+    """
+    User filters, backed by the verified and premium composite indexes
+    """
+
+    is_verified: filters.Filter = filters.BooleanFilter()
+    is_premium: filters.Filter = filters.BooleanFilter()
+    created_at: filters.Filter = filters.IsoDateTimeFromToRangeFilter()
+
+    class Meta:
+        model: User = User
+        fields: list = ["is_verified", "is_premium", "created_at"]
+
+
+class ProfileFilter(filters.FilterSet):
+    """
+    Profile filters, the ages are translated to birth date ranges so the
+    birth date indexes are used
+    """
+
+    gender: filters.Filter = filters.ChoiceFilter(
+        choices=GenderChoices.choices
+    )
+    preferred_language: filters.Filter = filters.ChoiceFilter(
+        choices=PreferredLanguageChoices.choices
+    )
+    birth_date: filters.Filter = filters.DateFromToRangeFilter()
+    min_age: filters.Filter = filters.NumberFilter(
+        method="filter_min_age",
+        label="Minimum age",
+        min_value=0,
+        max_value=MAX_AGE,
+    )
+    max_age: filters.Filter = filters.NumberFilter(
+        method="filter_max_age",
+        label="Maximum age",
+        min_value=0,
+        max_value=MAX_AGE,
+    )
+
+    class Meta:
+        model: Profile = Profile
+        fields: list = [
+            "gender",
+            "preferred_language",
+            "birth_date",
+            "min_age",
+            "max_age",
+        ]
+
+    def filter_min_age(
+        self, queryset: QuerySet, name: str, value: int
+    ) -> QuerySet:
+        cutoff: date = get_birth_date_cutoff(int(value))
+        return queryset.filter(birth_date__lte=cutoff)
+
+    def filter_max_age(
+        self, queryset: QuerySet, name: str, value: int
+    ) -> QuerySet:
+        # Someone is max_age years old until the day before turning one more
+        cutoff: date = get_birth_date_cutoff(int(value) + 1)
+        return queryset.filter(birth_date__gt=cutoff)
@@ -0,0 +1,109 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.hashers import identify_hasher
+from django.contrib.auth.hashers import make_password
+
+from Project.utils.metrics_common import Metrics
+
+
+class HashingBusy(Exception):
+    """
+    Raised when the hashing pool is full, the views answer it with a 429
+    """
+
+    def __init__(self, wait: int) -> None:
+        super().__init__("Too many password requests, try again later.")
+        self.wait: int = wait
+
+
+class HashingPool:
+    """
+    Bounded thread pool that runs the password hashing out of the request
+    thread. The hashers release the GIL while deriving the key, so the
+    workers hash in parallel. The request thread still waits for its hash,
+    the pool only caps how many hashes run at once. It is sized below the
+    server threads, so once the workers and the queue are full the other
+    requests are rejected, instead of piling up in front of every other
+    request.
+    """
+
+    def __init__(self) -> None:
+        self.executor: ThreadPoolExecutor = None
+        self.capacity: int = 0
+        self.pending: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    def start_executor(self) -> None:
+        # Called with the lock held, the settings are read on first use
+        if self.executor is None:
+            workers: int = settings.PASSWORD_HASHING_WORKERS
+            self.capacity = workers + settings.PASSWORD_HASHING_QUEUE_SIZE
+            self.executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="password-hashing"
+            )
+
+    def submit(self, function: Callable, *args: tuple) -> Future:
+        with self.lock:
+            self.start_executor()
+            if self.pending >= self.capacity:
+                Metrics.password_hashing_rejections.inc()
+                raise HashingBusy(wait=settings.PASSWORD_HASHING_RETRY_AFTER)
+            self.pending += 1
+        Metrics.password_hashing_queue_depth.inc()
+        try:
+            future: Future = self.executor.submit(function, *args)
+        except Exception:
+            self.release()
+            raise
+        future.add_done_callback(self.release)
+        return future
+
+    def release(self, future: Future = None) -> None:
+        with self.lock:
+            self.pending -= 1
+        Metrics.password_hashing_queue_depth.dec()
+
+    def run(self, function: Callable, *args: tuple) -> object:
+        return self.submit(function, *args).result()
+
+    def shutdown(self) -> None:
+        with self.lock:
+            executor: ThreadPoolExecutor = self.executor
+            self.executor = None
+        if executor:
+            executor.shutdown(wait=True)
+
+
+def hash_password(password: str or None) -> str:
+    if password is None:
+        # Unusable passwords are not hashed
+        return make_password(None)
+    return hashing_pool.run(make_password, password)
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    return hashing_pool.run(check_password, password, encoded)
+
+
+def must_update_password(encoded: str) -> bool:
+    """
+    Tells if the hash was made with other hasher or settings than the
+    default ones, as Django does when checking a password
+    """
+    try:
+        hasher: object = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred: object = get_hasher("default")
+    if hasher.algorithm != preferred.algorithm:
+        return True
+    return preferred.must_update(encoded)
+
+
+hashing_pool: HashingPool = HashingPool()
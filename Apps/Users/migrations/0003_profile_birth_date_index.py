@@ -0,0 +1,18 @@
+# Generated by Django 4.0.6 on 2026-10-18 23:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0002_profile'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='birth_date',
+            field=models.DateField(db_index=True, null=True, verbose_name='Birth date'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0.6 on 2026-10-18 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0003_profile_birth_date_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['gender', 'birth_date'], name='profile_gender_birth_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['preferred_language', 'birth_date'], name='profile_language_birth_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_verified', 'is_premium', 'created_at'], name='user_verified_premium_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_premium', 'created_at'], name='user_premium_created_idx'),
+        ),
+    ]
@@ -1,23 +1,62 @@
-from datetime import datetime
+from datetime import date
 
 from dateutil.relativedelta import relativedelta
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
 from django.db import models
+from django.db import transaction
+from django.db.models import BooleanField
+from django.db.models import Case
 from django.db.models import Field
 from django.db.models import Model
+from django.db.models import QuerySet
+from django.db.models import Value
+from django.db.models import When
 from django.db.models.fields.related import ForeignObject
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_prometheus.models import ExportModelOperationsMixin
 from django_rest_passwordreset.signals import reset_password_token_created
 from phonenumber_field.modelfields import PhoneNumberField
 from rest_framework.views import View
 
+from Project.models import DirtyFieldsMixin
 from Project.storage import image_file_upload
 from Users.choices import GenderChoices
 from Users.choices import PreferredLanguageChoices
+from Users.hashing import hash_password
+from Users.hashing import must_update_password
+from Users.hashing import verify_password
+
+
+ADULT_AGE: int = 18
+
+
+def get_birth_date_cutoff(years: int) -> date:
+    """
+    Returns the latest birth date of the people who are at least the given
+    years old today
+    """
+    return timezone.localdate() - relativedelta(years=years)
+
+
+def get_adult_cutoff() -> date:
+    return get_birth_date_cutoff(ADULT_AGE)
+
+
+def get_adult_date(birth_date: date) -> date:
+    """
+    Returns the first day the adult cutoff reaches the birth date, the
+    people born on February 29 turn adult on March 1
+    """
+    adult_date: date = birth_date + relativedelta(years=ADULT_AGE)
+    if adult_date - relativedelta(years=ADULT_AGE) < birth_date:
+        adult_date += relativedelta(days=1)
+    return adult_date
 
 
 class CustomUserManager(BaseUserManager):
@@ -76,7 +115,10 @@ class CustomUserManager(BaseUserManager):
 
 
 class User(
-    ExportModelOperationsMixin("dataset"), AbstractBaseUser, PermissionsMixin
+    ExportModelOperationsMixin("dataset"),
+    DirtyFieldsMixin,
+    AbstractBaseUser,
+    PermissionsMixin,
 ):
     username: None = None
     is_superuser: None = None
@@ -112,14 +154,47 @@ class User(
 
     objects: BaseUserManager = CustomUserManager()
 
+    class Meta:
+        indexes: list = [
+            models.Index(
+                fields=["is_verified", "is_premium", "created_at"],
+                name="user_verified_premium_idx",
+            ),
+            models.Index(
+                fields=["is_premium", "created_at"],
+                name="user_premium_created_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"], name="user_created_id_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.email
 
     def save(self, *args: tuple, **kwargs: dict) -> None:
+        # The profile is only created when the user gets verified
+        was_verified: bool = self.loaded_values.get("is_verified", False)
+        is_verification: bool = self.is_verified and not was_verified
         super().save(*args, **kwargs)
-        has_profile: bool = Profile.objects.filter(user=self).exists()
-        if not has_profile and self.is_verified:
-            self.create_profile()
+        if is_verification:
+            Profile.objects.get_or_create(user=self)
+
+    def set_password(self, raw_password: str or None) -> None:
+        self.password = hash_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password: str) -> bool:
+        """
+        The password is checked on the hashing pool, outdated hashes are
+        upgraded from the request thread
+        """
+        is_valid: bool = verify_password(raw_password, self.password)
+        if is_valid and must_update_password(self.password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+        return is_valid
 
     def create_profile(self) -> None:
         Profile.objects.create(user=self)
@@ -131,7 +206,7 @@ class User(
         if isinstance(object, User):
             return object.id == self.id
         else:
-            return object.user.id == self.id
+            return object.user_id == self.id
 
     def has_module_perms(self, app_label: str) -> bool:
         return self.is_admin
@@ -149,7 +224,24 @@ class User(
         return self.is_admin
 
 
-class Profile(models.Model):
+class ProfileQuerySet(QuerySet):
+    def with_is_of_age(self, cutoff: date = None) -> QuerySet:
+        """
+        Annotates is_of_age on the database from the adult cutoff date, it is
+        null for the profiles without birth date
+        """
+        cutoff = cutoff or get_adult_cutoff()
+        return self.annotate(
+            is_of_age=Case(
+                When(birth_date__isnull=True, then=Value(None)),
+                When(birth_date__lte=cutoff, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(null=True),
+            )
+        )
+
+
+class Profile(DirtyFieldsMixin):
     user: ForeignObject = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -183,24 +275,39 @@ class Profile(models.Model):
         null=True,
     )
     birth_date: Field = models.DateField(
-        "Birth date", null=True, auto_now_add=False
+        "Birth date", null=True, auto_now_add=False, db_index=True
     )
     created_at: Field = models.DateTimeField(
         "Creation date", auto_now_add=True
     )
     updated_at: Field = models.DateTimeField("Update date", auto_now=True)
 
+    objects: QuerySet = ProfileQuerySet.as_manager()
+
+    class Meta:
+        indexes: list = [
+            models.Index(
+                fields=["gender", "birth_date"],
+                name="profile_gender_birth_idx",
+            ),
+            models.Index(
+                fields=["preferred_language", "birth_date"],
+                name="profile_language_birth_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"], name="profile_created_id_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"User ({self.user_id}) profile ({self.pk})"
 
-    def is_adult(self) -> bool:
+    def is_adult(self, cutoff: date = None) -> bool or None:
         if not self.birth_date:
             return None
-        adultness: datetime = datetime.now() - relativedelta(years=18)
-        birthday: datetime = datetime.strptime(
-            str(self.birth_date), "%Y-%m-%d"
-        )
-        return birthday < adultness
+        field: Field = self._meta.get_field("birth_date")
+        birth_date: date = field.to_python(self.birth_date)
+        return birth_date <= (cutoff or get_adult_cutoff())
 
 
 @receiver(reset_password_token_created)
@@ -214,3 +321,62 @@ def password_reset_token_created(
     from Emails.utils import send_email
 
     send_email("reset_password", reset_password_token)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(
+    sender: Model, instance: User, *args: tuple, **kwargs: dict
+) -> None:
+    from Users.authentication import invalidate_user
+
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def add_email_to_filter(
+    sender: Model, instance: User, *args: tuple, **kwargs: dict
+) -> None:
+    # The deleted users are left in the filter, it can not remove them
+    update_fields: frozenset = kwargs.get("update_fields")
+    if update_fields is not None and "email" not in update_fields:
+        return
+    from Users.bloom import add_emails
+
+    add_emails([instance.email])
+
+
+# The representations are written once the save is committed, so the cache
+# never serves the data of a rolled back transaction
+
+
+@receiver(post_save, sender=User)
+def refresh_user_representation(
+    sender: Model, instance: User, *args: tuple, **kwargs: dict
+) -> None:
+    from Users.representations import refresh_user_representation
+
+    transaction.on_commit(lambda: refresh_user_representation(instance))
+
+
+@receiver(post_save, sender=Profile)
+def refresh_profile_representation(
+    sender: Model, instance: Profile, *args: tuple, **kwargs: dict
+) -> None:
+    from Users.representations import refresh_profile_representations
+
+    transaction.on_commit(lambda: refresh_profile_representations(instance))
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Profile)
+def delete_cached_representation(
+    sender: Model, instance: Model, *args: tuple, **kwargs: dict
+) -> None:
+    from Users.representations import delete_representation
+
+    transaction.on_commit(lambda: delete_representation(sender, instance.pk))
+    if sender is Profile:
+        transaction.on_commit(
+            lambda: delete_representation(User, instance.user_id)
+        )
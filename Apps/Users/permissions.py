@@ -1,11 +1,20 @@
+from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.views import View
-from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.permissions import BasePermission
 from rest_framework.permissions import DjangoObjectPermissions
 
+from Project.utils.request_cache import get_cached_object
 from Users.models import Profile
 from Users.models import User
+from Users.representations import get_cached_representation
+
+
+def get_view_queryset(view: View, default: QuerySet) -> QuerySet:
+    if hasattr(view, "get_queryset"):
+        return view.get_queryset()
+    return default
 
 
 class IsAdmin(BasePermission):
@@ -26,12 +35,9 @@ class IsUserOwner(BasePermission):
     message: str = "You don't have permission"
 
     def has_permission(self, request: HttpRequest, view: View) -> bool:
-        try:
-            pk: int = request.parser_context["kwargs"]["pk"]
-            user: User = get_object_or_404(User, id=pk)
-        except:
-            return False
-        return request.user.has_permission(user)
+        # The user owns only itself, the requested one is not loaded
+        pk: int = request.parser_context["kwargs"].get("pk")
+        return pk is not None and str(pk) == str(request.user.id)
 
 
 class IsSameUserId(BasePermission):
@@ -48,7 +54,13 @@ class IsProfileOwner(DjangoObjectPermissions):
     def has_permission(self, request: HttpRequest, view: View) -> bool:
         try:
             pk: int = request.parser_context["kwargs"]["pk"]
-            profile: Profile = get_object_or_404(Profile, id=pk)
+            if request.method in SAFE_METHODS:
+                representation: dict = get_cached_representation(Profile, pk)
+                if representation is not None:
+                    user_id: int = representation["data"]["user_id"]
+                    return user_id == request.user.id
+            queryset: QuerySet = get_view_queryset(view, Profile.objects.all())
+            profile: Profile = get_cached_object(request, queryset, pk)
         except:
             return False
         return request.user.has_permission(profile)
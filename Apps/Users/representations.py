@@ -0,0 +1,298 @@
+import logging
+from datetime import date
+from datetime import datetime
+from datetime import time
+from logging import Logger
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Model
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils import timezone
+from rest_framework.response import Response
+
+from Project.mixins import ConditionalRequestMixin
+from Users.models import Profile
+from Users.models import User
+from Users.models import get_adult_cutoff
+from Users.models import get_adult_date
+from Users.serializers import BatchRetrieveSerializer
+from Users.serializers import ProfileSerializer
+from Users.serializers import UserLoginSerializer
+
+
+logger: Logger = logging.getLogger(__name__)
+
+SERIALIZERS: dict = {
+    User: UserLoginSerializer,
+    Profile: ProfileSerializer,
+}
+
+
+def get_representation_key(model: type, pk: object) -> str:
+    return f"users:representation:{model._meta.model_name}:{pk}"
+
+
+def get_representation_version(instance: Model) -> datetime:
+    # The user representation embeds its profile, so it changes with both
+    if isinstance(instance, User) and hasattr(instance, "profile"):
+        return max(instance.updated_at, instance.profile.updated_at)
+    return instance.updated_at
+
+
+def build_representation(instance: Model) -> dict:
+    serializer_class: type = SERIALIZERS[type(instance)]
+    return {
+        "version": get_representation_version(instance),
+        "data": dict(serializer_class(instance).data),
+    }
+
+
+def get_cached_representation(model: type, pk: object) -> dict or None:
+    try:
+        return caches[settings.REPRESENTATION_CACHE_ALIAS].get(
+            get_representation_key(model, pk)
+        )
+    except Exception:
+        logger.warning(f"Users App | Representation cache unavailable ({pk})")
+        return None
+
+
+def cache_representation(instance: Model) -> dict:
+    """
+    Stores the serialized instance unless the cache already holds a newer
+    version of it, written by a concurrent save
+    """
+    representation: dict = build_representation(instance)
+    key: str = get_representation_key(type(instance), instance.pk)
+    try:
+        cache: object = caches[settings.REPRESENTATION_CACHE_ALIAS]
+        cached_representation: dict = cache.get(key)
+        if (
+            cached_representation is None
+            or cached_representation["version"] <= representation["version"]
+        ):
+            cache.set(
+                key, representation, settings.REPRESENTATION_CACHE_TIMEOUT
+            )
+    except Exception:
+        logger.warning(
+            f"Users App | Representation cache unavailable ({instance.pk})"
+        )
+    return representation
+
+
+def get_cached_representations(model: type, pks: list) -> dict:
+    """
+    Returns the cached representations of the given pks by pk, read in a
+    single round trip
+    """
+    keys: dict = {get_representation_key(model, pk): pk for pk in pks}
+    try:
+        cached_representations: dict = caches[
+            settings.REPRESENTATION_CACHE_ALIAS
+        ].get_many(list(keys))
+    except Exception:
+        logger.warning("Users App | Representation cache unavailable")
+        return {}
+    return {
+        keys[key]: representation
+        for key, representation in cached_representations.items()
+    }
+
+
+def cache_representations(instances: list) -> dict:
+    """
+    Stores the serialized instances like cache_representation does, with
+    one read and one write for all of them
+    """
+    representations: dict = {}
+    keys: dict = {}
+    for instance in instances:
+        representations[instance.pk] = build_representation(instance)
+        keys[get_representation_key(type(instance), instance.pk)] = instance.pk
+    try:
+        cache: object = caches[settings.REPRESENTATION_CACHE_ALIAS]
+        cached_representations: dict = cache.get_many(list(keys))
+        cache.set_many(
+            {
+                key: representations[pk]
+                for key, pk in keys.items()
+                if key not in cached_representations
+                or cached_representations[key]["version"]
+                <= representations[pk]["version"]
+            },
+            settings.REPRESENTATION_CACHE_TIMEOUT,
+        )
+    except Exception:
+        logger.warning("Users App | Representation cache unavailable")
+    return representations
+
+
+def delete_representation(model: type, pk: object) -> None:
+    try:
+        caches[settings.REPRESENTATION_CACHE_ALIAS].delete(
+            get_representation_key(model, pk)
+        )
+    except Exception:
+        logger.warning(f"Users App | Representation cache unavailable ({pk})")
+
+
+def refresh_user_representation(user: User) -> None:
+    # Loading the profile would add a query to every user save, without it
+    # the representation is refilled by the next retrieve
+    if User.profile.is_cached(user):
+        cache_representation(user)
+    else:
+        delete_representation(User, user.pk)
+
+
+def refresh_profile_representations(profile: Profile) -> None:
+    # The user representation embeds its profile, loading the user would
+    # add a query to every profile save
+    cache_representation(profile)
+    if Profile.user.is_cached(profile):
+        cache_representation(profile.user)
+    else:
+        delete_representation(User, profile.user_id)
+
+
+def get_served_profile_data(request: HttpRequest, data: dict) -> dict:
+    """
+    The adultness depends on the day it is served and the image URL on the
+    request host, so they are not taken from the cache as they are
+    """
+    birth_date: str = data.get("birth_date")
+    data["is_adult"] = (
+        date.fromisoformat(birth_date) <= get_adult_cutoff()
+        if birth_date
+        else None
+    )
+    image: str = data.get("image")
+    if image and image.startswith("/"):
+        data["image"] = request.build_absolute_uri(image)
+    return data
+
+
+def get_served_version(model: type, data: dict, version: datetime) -> datetime:
+    """
+    The adultness is served from the birth date, so from the day the
+    profile turns adult it is served as a newer version
+    """
+    profile: dict = data if model is Profile else data.get("profile") or {}
+    birth_date: str = profile.get("birth_date")
+    if not birth_date:
+        return version
+    adult_date: date = get_adult_date(date.fromisoformat(birth_date))
+    if adult_date > timezone.localdate():
+        return version
+    return max(
+        version, timezone.make_aware(datetime.combine(adult_date, time.min))
+    )
+
+
+def get_served_data(request: HttpRequest, model: type, data: dict) -> dict:
+    if model is Profile:
+        return get_served_profile_data(request, data)
+    if data.get("profile"):
+        data["profile"] = get_served_profile_data(request, data["profile"])
+    return data
+
+
+class CachedRepresentationMixin(ConditionalRequestMixin):
+    """
+    Viewset mixin that retrieves the serialized instance and its version
+    from the cache, the saves keep it up to date so warm retrieves skip the
+    database. The object permissions are not checked on this path, the read
+    ones are granted on the model level.
+    """
+
+    representation: dict = None
+
+    def get_representation(self) -> dict:
+        # Cache misses load the instance once and cache it for the next ones
+        if self.representation is None:
+            lookup_url_kwarg: str = self.lookup_url_kwarg or self.lookup_field
+            self.representation = get_cached_representation(
+                self.queryset.model, self.kwargs[lookup_url_kwarg]
+            ) or cache_representation(self.get_object())
+        return self.representation
+
+    def get_object_version(self) -> datetime:
+        return self.get_representation()["version"]
+
+    def get_updated_version(self) -> datetime:
+        # The representation read before the update is outdated
+        self.representation = None
+        return super().get_updated_version()
+
+    def get_validator_version(self, version: datetime) -> datetime:
+        data: dict = self.get_representation()["data"]
+        return get_served_version(self.queryset.model, data, version)
+
+    def claim_version(self, version: datetime) -> bool:
+        claimed: bool = super().claim_version(version)
+        if claimed:
+            # The claim moves the version without a save, and updates that
+            # change nothing skip the save that would refresh the cache
+            lookup_url_kwarg: str = self.lookup_url_kwarg or self.lookup_field
+            delete_representation(
+                self.queryset.model, self.kwargs[lookup_url_kwarg]
+            )
+        return claimed
+
+    def get_retrieve_response(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> Response:
+        data: dict = self.get_representation()["data"]
+        data = get_served_data(request, self.queryset.model, data)
+        return Response(self.get_sparse_data(data))
+
+
+class BatchRetrieveMixin:
+    """
+    Viewset mixin that serves the instances of the ids query parameter in
+    one response and in the requested order. The cached representations
+    are read in one round trip and the misses are loaded with one query.
+    Users that are not admins only read the instances they own, the ones
+    they can not read or that do not exist are left out.
+    """
+
+    batch_owner_field: str = "id"
+
+    def get_batch_queryset(self, request: HttpRequest) -> QuerySet:
+        queryset: QuerySet = self.get_queryset()
+        if request.user.is_admin:
+            return queryset
+        return queryset.filter(**{self.batch_owner_field: request.user.id})
+
+    def has_batch_permission(self, request: HttpRequest, data: dict) -> bool:
+        return (
+            request.user.is_admin
+            or data[self.batch_owner_field] == request.user.id
+        )
+
+    def get_batch_response(self, request: HttpRequest) -> Response:
+        serializer: BatchRetrieveSerializer = BatchRetrieveSerializer(
+            data=request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        pks: list = serializer.validated_data["ids"]
+        model: type = self.queryset.model
+        representations: dict = get_cached_representations(model, pks)
+        missing_pks: list = [pk for pk in pks if pk not in representations]
+        if missing_pks:
+            instances: QuerySet = self.get_batch_queryset(request).filter(
+                pk__in=missing_pks
+            )
+            representations.update(cache_representations(instances))
+        data: list = [
+            self.get_sparse_data(
+                get_served_data(request, model, representations[pk]["data"])
+            )
+            for pk in pks
+            if pk in representations
+            and self.has_batch_permission(request, representations[pk]["data"])
+        ]
+        return Response(data)
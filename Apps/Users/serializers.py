@@ -1,24 +1,31 @@
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth import password_validation
+from django.db import IntegrityError
+from django.db import transaction
 from django.db.models import Field
 from django.db.models import Model
+from django.db.models import Q
 from django.db.models import QuerySet
 from drf_extra_fields.fields import Base64ImageField
 from phonenumber_field.serializerfields import PhoneNumberField
 from rest_framework import serializers
 from rest_framework.relations import RelatedField
 from rest_framework.serializers import ValidationError
-from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from Emails.utils import send_email
+from Project.mixins import SparseFieldsSerializerMixin
 from Users.models import Profile
 from Users.models import User
 from Users.utils import check_e164_format
 
 
-class UserSerializer(serializers.ModelSerializer):
+UNIQUE_MESSAGE: str = "This field must be unique."
+
+
+class UserSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """
     User custom serializer
     """
@@ -30,10 +37,7 @@ class UserSerializer(serializers.ModelSerializer):
         on signup method and the main validation method is executed before
         "validate" one
         """
-        email: str = data.get("email", None)
-        self.check_email(email, user)
-        phone_number: str = data.get("phone_number", None)
-        self.check_phone_number(phone_number, user)
+        self.check_unique_fields(data, user)
         self.check_password(data, user)
         return data
 
@@ -52,21 +56,50 @@ class UserSerializer(serializers.ModelSerializer):
         password: str = data.get("password", None)
         if password:
             instance.set_password(password)
-        instance.save()
+        try:
+            with transaction.atomic():
+                instance.save()
+        except IntegrityError:
+            # Another user took the email or the phone number after the check
+            self.check_unique_fields(data, instance)
+            raise ValidationError("Email is taken")
         return instance
 
     def check_email(self, email: str, user: User) -> None:
-        user_with_email: User = User.objects.filter(email=email).first()
-        if user_with_email and not user.has_permission(user_with_email):
-            raise ValidationError("Email is taken")
+        self.check_unique_fields({"email": email}, user)
 
     def check_phone_number(self, phone_number: str, user: User) -> None:
+        self.check_unique_fields({"phone_number": phone_number}, user)
+
+    def check_unique_fields(self, data: dict, user: User) -> None:
+        """
+        Checks the email and the phone number with a single query, the
+        email error is raised first when both are taken
+        """
+        email: str = data.get("email", None)
+        phone_number: str = data.get("phone_number", None)
         check_e164_format(phone_number)
-        user_with_phone_number: User = User.objects.filter(
-            phone_number=phone_number
-        ).first()
-        if user_with_phone_number and not user.has_permission(
-            user_with_phone_number
+        lookup: Q = Q()
+        if email:
+            # The email index compares case insensitively
+            lookup |= Q(email__iexact=email)
+        if phone_number:
+            lookup |= Q(phone_number=phone_number)
+        if not lookup:
+            return
+        taken: list = list(
+            User.objects.filter(lookup)
+            .exclude(pk=user.pk)
+            .values_list("email", "phone_number")
+        )
+        if email and any(
+            taken_email.casefold() == email.casefold()
+            for taken_email, _ in taken
+        ):
+            raise ValidationError("Email is taken")
+        if phone_number and any(
+            str(taken_phone_number) == phone_number
+            for _, taken_phone_number in taken
         ):
             raise ValidationError("Phone number is taken")
 
@@ -96,7 +129,9 @@ class UserSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """
     Profile serializer
     """
@@ -120,10 +155,20 @@ class ProfileSerializer(serializers.ModelSerializer):
             "birth_date",
             "is_adult",
         ]
+        # The querysets not annotated with_is_of_age compute it from these
+        sparse_field_sources: dict = {"is_adult": ["birth_date"]}
 
-    def get_is_adult(self, object: Profile) -> bool:
+    def get_is_adult(self, object: Profile) -> bool or None:
+        # Querysets annotated with_is_of_age already computed it
+        if hasattr(object, "is_of_age"):
+            return object.is_of_age
         return object.is_adult()
 
+    def update(self, instance: Profile, validated_data: dict) -> Profile:
+        instance = super().update(instance, validated_data)
+        instance.__dict__.pop("is_of_age", None)
+        return instance
+
     def is_valid(self, raise_exception: bool = False) -> dict:
         is_valid: dict = super().is_valid(raise_exception)
         self.check_user_field_according_requester(self.validated_data)
@@ -169,7 +214,38 @@ class UserAuthSerializer(serializers.Serializer):
     )
 
 
-class UserLoginSerializer(UserAuthSerializer):
+class EmailAvailabilitySerializer(serializers.Serializer):
+    """
+    Email availability check serializer
+    """
+
+    email: Field = serializers.EmailField(required=True)
+
+
+class BatchRetrieveSerializer(serializers.Serializer):
+    """
+    Batch retrieve serializer, the ids are sent comma separated
+    """
+
+    ids: Field = serializers.CharField(required=True)
+
+    def validate_ids(self, value: str) -> list:
+        try:
+            ids: list = [int(pk) for pk in value.split(",") if pk.strip()]
+        except ValueError:
+            raise ValidationError("Ids must be comma separated integers")
+        # The requested order is kept, without the repeated ids
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise ValidationError("At least one id is required")
+        if len(ids) > settings.BATCH_RETRIEVE_MAX_IDS:
+            raise ValidationError(
+                f"At most {settings.BATCH_RETRIEVE_MAX_IDS} ids are allowed"
+            )
+        return ids
+
+
+class UserLoginSerializer(SparseFieldsSerializerMixin, UserAuthSerializer):
     """
     User login serializer
     """
@@ -207,6 +283,7 @@ class UserLoginSerializer(UserAuthSerializer):
 
     class Meta:
         model: Model = User
+        select_related_fields: tuple = ("profile",)
         fields: list = [
             "first_name",
             "last_name",
@@ -224,10 +301,7 @@ class UserSignUpSerializer(UserAuthSerializer):
 
     first_name = serializers.CharField(required=True, max_length=255)
     last_name = serializers.CharField(required=True, max_length=255)
-    email = serializers.EmailField(
-        required=True,
-        validators=[UniqueValidator(queryset=User.objects.all())],
-    )
+    email = serializers.EmailField(required=True)
     password_confirmation = serializers.CharField(
         write_only=True, min_length=8, max_length=64, required=False
     )
@@ -252,6 +326,11 @@ class UserSignUpSerializer(UserAuthSerializer):
         data.pop("password_confirmation")
         if "phone_number" in data:
             data.pop("phone_number")
-        user = User.objects.create_user(**data, is_verified=False)
+        # The unique constraint checks the email on the insert itself
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(**data, is_verified=False)
+        except IntegrityError:
+            raise ValidationError({"email": [UNIQUE_MESSAGE]})
         send_email("verify_email", user)
         return user
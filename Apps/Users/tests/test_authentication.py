@@ -0,0 +1,114 @@
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from mock import patch
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Users.authentication import CachedJWTAuthentication
+from Users.authentication import get_cached_snapshot
+from Users.authentication import get_snapshot_version
+from Users.authentication import get_user_cache_key
+from Users.fakers.user import VerifiedUserFaker
+from Users.models import User
+
+
+ENDPOINT: str = "/api/users"
+
+
+@pytest.fixture(scope="function")
+def client() -> APIClient:
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_user_caches() -> None:
+    caches[settings.USER_CACHE_ALIAS].clear()
+
+
+def get_token(user: User) -> AccessToken:
+    return AccessToken.for_user(user)
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def test_first_authentication_caches_the_user(self) -> None:
+        user: User = VerifiedUserFaker()
+        authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+        assert authentication.get_user(get_token(user)) == user
+        assert get_cached_snapshot(user.id) is not None
+
+    def test_cached_user_is_resolved_without_queries(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+        authentication.get_user(get_token(user))
+        with django_assert_num_queries(0):
+            cached_user: User = authentication.get_user(get_token(user))
+            assert cached_user.id == user.id
+            assert cached_user.email == user.email
+            assert cached_user.is_verified is True
+            assert cached_user.is_admin is False
+
+    def test_cached_user_does_not_hold_the_password(self) -> None:
+        user: User = VerifiedUserFaker()
+        authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+        authentication.get_user(get_token(user))
+        cached_user: User = authentication.get_user(get_token(user))
+        assert "password" in cached_user.get_deferred_fields()
+        assert cached_user.password == user.password
+
+    def test_saving_the_user_invalidates_the_cache(self) -> None:
+        user: User = VerifiedUserFaker()
+        authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+        authentication.get_user(get_token(user))
+        user.is_admin = True
+        user.save()
+        assert get_cached_snapshot(user.id) is None
+        assert authentication.get_user(get_token(user)).is_admin is True
+
+    def test_snapshots_of_other_user_columns_are_not_read(self) -> None:
+        user: User = VerifiedUserFaker()
+        authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+        authentication.get_user(get_token(user))
+        key: str = get_user_cache_key(user.id)
+        get_snapshot_version.cache_clear()
+        with patch(
+            "Users.authentication.get_snapshot_fields",
+            return_value=("id", "email"),
+        ):
+            assert get_user_cache_key(user.id) != key
+            assert get_cached_snapshot(user.id) is None
+        get_snapshot_version.cache_clear()
+        assert get_user_cache_key(user.id) == key
+
+    def test_deleting_the_user_invalidates_the_cache(self) -> None:
+        user: User = VerifiedUserFaker()
+        token: AccessToken = get_token(user)
+        authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+        authentication.get_user(token)
+        user.delete()
+        with pytest.raises(AuthenticationFailed):
+            authentication.get_user(token)
+
+    def test_authentication_works_when_the_cache_is_down(self) -> None:
+        user: User = VerifiedUserFaker()
+        authentication: CachedJWTAuthentication = CachedJWTAuthentication()
+        with patch("Users.authentication.caches") as mocked_caches:
+            mocked_caches.__getitem__.side_effect = ConnectionError()
+            assert authentication.get_user(get_token(user)) == user
+
+    def test_authenticated_request_does_not_query_the_requester(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(user)}")
+        response: Response = client.get(f"{ENDPOINT}/{user.id}/")
+        assert response.status_code == 200
+        with django_assert_num_queries(0):
+            # The requester and the requested user come from the cache
+            response = client.get(f"{ENDPOINT}/{user.id}/")
+        assert response.status_code == 200
@@ -0,0 +1,194 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from mock import MagicMock
+from mock import patch
+from redis.exceptions import ConnectionError
+from redis.exceptions import RedisError
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from Users.bloom import BloomFilter
+from Users.bloom import email_filter
+from Users.bloom import is_email_taken
+from Users.factories.user import UserFactory
+from Users.models import User
+
+
+CONNECTION: str = "Users.bloom.get_redis_connection"
+ENDPOINT: str = "/api/users/email_available/"
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis: FakeRedis = redis
+        self.commands: list = []
+
+    def __getattr__(self, name: str) -> callable:
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self) -> list:
+        return [
+            getattr(self.redis, name)(*args) for name, args in self.commands
+        ]
+
+
+class FakeRedis:
+    """
+    Keeps the keys and bitmaps the bloom filter uses in memory
+    """
+
+    def __init__(self) -> None:
+        self.values: dict = {}
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def setbit(self, key: str, position: int, value: int) -> None:
+        self.values.setdefault(key, set()).add(position)
+
+    def getbit(self, key: str, position: int) -> int:
+        return int(position in self.values.get(key, set()))
+
+    def exists(self, key: str) -> int:
+        return int(key in self.values)
+
+    def set(self, key: str, value: object) -> None:
+        self.values[key] = value
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+@pytest.fixture(scope="function")
+def client() -> APIClient:
+    return APIClient()
+
+
+@pytest.fixture(scope="function")
+def redis(settings: object) -> FakeRedis:
+    settings.EMAIL_FILTER_ENABLED = True
+    redis: FakeRedis = FakeRedis()
+    with patch(CONNECTION, return_value=redis):
+        yield redis
+
+
+class TestBloomFilter:
+    def test_added_values_may_be_contained(self, redis: FakeRedis) -> None:
+        bloom: BloomFilter = BloomFilter("bloom", 1024, 3)
+        bloom.add_many(["first", "second"])
+        bloom.finish_build()
+        assert bloom.might_contain("first") is True
+        assert bloom.might_contain("second") is True
+        assert bloom.might_contain("third") is False
+
+    def test_positions_are_spread_over_the_size(self) -> None:
+        bloom: BloomFilter = BloomFilter("bloom", 64, 5)
+        positions: list = bloom.get_positions("value")
+        assert len(positions) == 5
+        assert all(0 <= position < 64 for position in positions)
+        assert positions == bloom.get_positions("value")
+
+    def test_filter_does_not_answer_until_built(
+        self, redis: FakeRedis
+    ) -> None:
+        bloom: BloomFilter = BloomFilter("bloom", 1024, 3)
+        bloom.add_many(["first"])
+        assert bloom.might_contain("other") is None
+        bloom.finish_build()
+        bloom.start_build()
+        assert bloom.might_contain("other") is None
+
+    def test_filter_does_not_answer_when_redis_is_down(self) -> None:
+        bloom: BloomFilter = BloomFilter("bloom", 1024, 3)
+        with patch(CONNECTION) as connection:
+            pipeline: MagicMock = connection.return_value.pipeline.return_value
+            pipeline.execute.side_effect = ConnectionError
+            assert bloom.might_contain("first") is None
+
+
+@pytest.mark.django_db
+class TestEmailAvailability:
+    def test_saved_users_are_added_to_the_filter(
+        self, redis: FakeRedis
+    ) -> None:
+        email_filter.finish_build()
+        user: User = UserFactory(email="taken@AppName.me")
+        assert email_filter.might_contain("taken@appname.me") is True
+        user.email = "changed@appname.me"
+        user.save()
+        assert email_filter.might_contain("changed@appname.me") is True
+
+    def test_emails_are_compared_case_insensitively(
+        self, redis: FakeRedis
+    ) -> None:
+        email_filter.finish_build()
+        UserFactory(email="Taken.User@appname.me")
+        assert is_email_taken(" taken.user@APPNAME.me") is True
+
+    def test_failed_adds_mark_the_filter_stale(self, redis: FakeRedis) -> None:
+        email_filter.finish_build()
+        with patch.object(email_filter, "add_many", side_effect=RedisError):
+            UserFactory(email="taken@appname.me")
+        assert email_filter.might_contain("taken@appname.me") is None
+        assert is_email_taken("taken@appname.me") is True
+
+    def test_filter_misses_skip_the_database(
+        self, redis: FakeRedis, django_assert_num_queries: callable
+    ) -> None:
+        email_filter.finish_build()
+        with django_assert_num_queries(0):
+            assert is_email_taken("free@appname.me") is False
+
+    def test_filter_hits_are_checked_on_the_database(
+        self, redis: FakeRedis, django_assert_num_queries: callable
+    ) -> None:
+        email_filter.finish_build()
+        user: User = UserFactory(email="taken@appname.me")
+        user.delete()
+        with django_assert_num_queries(1):
+            assert is_email_taken("taken@appname.me") is False
+
+    def test_unbuilt_filter_falls_back_to_the_database(
+        self, redis: FakeRedis
+    ) -> None:
+        User.objects.bulk_create(
+            [User(email="bulk@appname.me", first_name="A", last_name="B")]
+        )
+        assert is_email_taken("bulk@appname.me") is True
+
+    def test_build_command_adds_the_existing_emails(
+        self, redis: FakeRedis
+    ) -> None:
+        User.objects.bulk_create(
+            [
+                User(email=f"bulk{index}@appname.me", first_name="A")
+                for index in range(3)
+            ]
+        )
+        output: StringIO = StringIO()
+        call_command("build_email_filter", "-b", "2", stdout=output)
+        assert "3 emails added" in output.getvalue()
+        for index in range(3):
+            email: str = f"bulk{index}@appname.me"
+            assert email_filter.might_contain(email) is True
+
+    def test_email_available_endpoint(self, client: APIClient) -> None:
+        UserFactory(email="taken@appname.me")
+        response: Response = client.get(
+            ENDPOINT, {"email": "taken@appname.me"}
+        )
+        assert response.status_code == 200
+        assert response.data == {
+            "email": "taken@appname.me",
+            "available": False,
+        }
+        response = client.get(ENDPOINT, {"email": "free@appname.me"})
+        assert response.data["available"] is True
+
+    def test_email_available_fails_with_an_invalid_email(
+        self, client: APIClient
+    ) -> None:
+        response: Response = client.get(ENDPOINT, {"email": "wrong"})
+        assert response.status_code == 400
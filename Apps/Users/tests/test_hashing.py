@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from mock import MagicMock
+from mock import patch
+from rest_framework.exceptions import APIException
+
+from Project.utils.metrics_common import Metrics
+from Users.factories.user import UserFactory
+from Users.hashing import HashingBusy
+from Users.hashing import HashingPool
+from Users.hashing import hash_password
+from Users.hashing import hashing_pool
+from Users.hashing import must_update_password
+from Users.hashing import verify_password
+from Users.models import User
+
+
+HASHERS: list = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+
+@pytest.fixture(scope="function")
+def pool() -> HashingPool:
+    pool: HashingPool = HashingPool()
+    yield pool
+    pool.shutdown()
+
+
+def get_queue_depth() -> float:
+    return Metrics.password_hashing_queue_depth._value.get()
+
+
+class TestHashingPool:
+    @override_settings(
+        PASSWORD_HASHING_WORKERS=1, PASSWORD_HASHING_QUEUE_SIZE=1
+    )
+    def test_full_pool_rejects_new_hashes(self, pool: HashingPool) -> None:
+        release: threading.Event = threading.Event()
+        running: list = [pool.submit(release.wait) for _ in range(2)]
+        with pytest.raises(HashingBusy) as error:
+            pool.submit(release.wait)
+        assert error.value.wait == 1
+        release.set()
+        assert [future.result() for future in running] == [True, True]
+        assert pool.run(sum, [1, 2]) == 3
+
+    @override_settings(
+        PASSWORD_HASHING_WORKERS=1, PASSWORD_HASHING_QUEUE_SIZE=1
+    )
+    def test_concurrent_requests_beyond_the_pool_are_rejected(
+        self, pool: HashingPool
+    ) -> None:
+        release: threading.Event = threading.Event()
+        results: list = []
+
+        def request() -> None:
+            try:
+                results.append(pool.run(release.wait))
+            except HashingBusy:
+                results.append(False)
+
+        threads: list = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while results.count(False) < 2:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert sorted(results) == [False, False, True, True]
+
+    def test_queue_depth_is_tracked(self, pool: HashingPool) -> None:
+        depth: float = get_queue_depth()
+        release: threading.Event = threading.Event()
+        future: object = pool.submit(release.wait)
+        assert get_queue_depth() == depth + 1
+        release.set()
+        future.result()
+        assert pool.pending == 0
+        assert get_queue_depth() == depth
+
+    def test_hash_password_skips_the_pool_for_unusable_ones(self) -> None:
+        with patch("Users.hashing.hashing_pool.submit") as submit:
+            encoded: str = hash_password(None)
+        assert encoded.startswith("!")
+        submit.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestUserPasswords:
+    @override_settings(PASSWORD_HASHERS=HASHERS)
+    def test_check_password_upgrades_outdated_hashes(self) -> None:
+        user: User = UserFactory(password="password")
+        user.password = make_password("password", hasher="md5")
+        assert must_update_password(user.password) is True
+        assert user.check_password("password") is True
+        user.refresh_from_db()
+        assert must_update_password(user.password) is False
+        assert user.check_password("password") is True
+
+    def test_check_password_fails_with_a_wrong_password(self) -> None:
+        user: User = UserFactory(password="password")
+        assert user.check_password("wrong password") is False
+
+    def test_set_password_raises_a_domain_error_when_the_pool_is_full(
+        self,
+    ) -> None:
+        user: User = UserFactory()
+        with patch.object(hashing_pool, "capacity", 0), patch.object(
+            hashing_pool, "executor", MagicMock()
+        ), pytest.raises(HashingBusy) as error:
+            user.set_password("password")
+        assert not isinstance(error.value, APIException)
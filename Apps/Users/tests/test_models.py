@@ -1,3 +1,6 @@
+from datetime import date
+from datetime import timedelta
+
 import pytest
 
 from Users.factories.profile import ProfileFactory
@@ -7,6 +10,7 @@ from Users.fakers.profile import KidProfileFaker
 from Users.fakers.user import AdminFaker
 from Users.models import Profile
 from Users.models import User
+from Users.models import get_adult_cutoff
 
 
 @pytest.mark.django_db
@@ -67,6 +71,27 @@ class TestUserModel:
         user: User = UserFactory()
         assert str(user) == f"{user.email}"
 
+    def test_verify_creates_the_profile(self) -> None:
+        user: User = UserFactory()
+        assert Profile.objects.filter(user=user).exists() == False
+        User.objects.get(pk=user.pk).verify()
+        assert Profile.objects.filter(user=user).exists() == True
+
+    def test_verify_again_does_not_duplicate_the_profile(self) -> None:
+        user: User = AdminFaker()
+        user.is_verified = False
+        user.save()
+        user.verify()
+        assert Profile.objects.filter(user=user).count() == 1
+
+    def test_save_without_verification_change_does_not_query_profile(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        user: User = User.objects.get(pk=AdminFaker().pk)
+        user.first_name = "Changed"
+        with django_assert_num_queries(1):
+            user.save()
+
 
 @pytest.mark.django_db
 class TestProfileModel:
@@ -103,3 +128,28 @@ class TestProfileModel:
         profile: Profile = ProfileFactory(birth_date=None)
         expected_result: None = None
         assert profile.is_adult() == expected_result
+
+    def test_is_adult_on_the_eighteenth_birthday(self) -> None:
+        profile: Profile = ProfileFactory(birth_date=get_adult_cutoff())
+        assert profile.is_adult() == True
+
+    def test_with_is_of_age_annotates_adultness(self) -> None:
+        adult_profile: Profile = AdultProfileFaker()
+        kid_profile: Profile = KidProfileFaker()
+        profile: Profile = ProfileFactory(birth_date=None)
+        profiles: dict = {
+            instance.pk: instance.is_of_age
+            for instance in Profile.objects.with_is_of_age()
+        }
+        assert profiles[adult_profile.pk] == True
+        assert profiles[kid_profile.pk] == False
+        assert profiles[profile.pk] == None
+
+    def test_with_is_of_age_uses_the_given_cutoff(self) -> None:
+        profile: Profile = ProfileFactory(birth_date=get_adult_cutoff())
+        cutoff: date = profile.birth_date - timedelta(days=1)
+        annotated_profile: Profile = Profile.objects.with_is_of_age(
+            cutoff
+        ).get(pk=profile.pk)
+        assert annotated_profile.is_of_age == False
+        assert annotated_profile.is_adult(cutoff) == False
@@ -1,17 +1,26 @@
 import base64
+from datetime import date
+from datetime import timedelta
 from io import BufferedReader
 
 import pytest
 from django.conf import settings
+from django.core.cache import cache
+from mock import patch
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from Project.utils.testing import assert_constant_query_count
+from Users.factories.profile import ProfileFactory
 from Users.factories.user import UserFactory
+from Users.fakers.profile import AdultProfileFaker
+from Users.fakers.profile import KidProfileFaker
 from Users.fakers.user import AdminFaker
 from Users.fakers.user import UserFaker
 from Users.fakers.user import VerifiedUserFaker
 from Users.models import Profile
 from Users.models import User
+from Users.models import get_birth_date_cutoff
 
 
 ENDPOINT: str = "/api/profiles"
@@ -62,6 +71,104 @@ class TestProfileListEndpoint:
         assert len(response.data["results"]) == Profile.objects.count()
         assert response.data["count"] == Profile.objects.count()
 
+    def test_list_profiles_queries_do_not_grow_with_results(
+        self, client: APIClient
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        assert_constant_query_count(
+            lambda: client.get(f"{ENDPOINT}/?page_size=100", format="json"),
+            lambda number: [VerifiedUserFaker() for _ in range(number)],
+        )
+
+    def test_list_profiles_annotates_is_adult(self, client: APIClient) -> None:
+        adult_profile: Profile = AdultProfileFaker()
+        kid_profile: Profile = KidProfileFaker()
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(f"{ENDPOINT}/", format="json")
+        assert response.status_code == 200
+        is_adult: dict = {
+            profile["id"]: profile["is_adult"]
+            for profile in response.data["results"]
+        }
+        assert is_adult[adult_profile.id] == True
+        assert is_adult[kid_profile.id] == False
+
+    def test_list_profiles_filtered_by_age_range(
+        self, client: APIClient
+    ) -> None:
+        ProfileFactory(birth_date=get_birth_date_cutoff(20))
+        profile: Profile = ProfileFactory(birth_date=get_birth_date_cutoff(30))
+        ProfileFactory(birth_date=get_birth_date_cutoff(41))
+        ProfileFactory(birth_date=None)
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(
+            f"{ENDPOINT}/?min_age=25&max_age=40", format="json"
+        )
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["id"] == profile.id
+
+    def test_list_profiles_filtered_by_gender_and_language(
+        self, client: APIClient
+    ) -> None:
+        ProfileFactory(gender="F", preferred_language="ES")
+        ProfileFactory(gender="M", preferred_language="EN")
+        profile: Profile = ProfileFactory(gender="F", preferred_language="EN")
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(
+            f"{ENDPOINT}/?gender=F&preferred_language=EN", format="json"
+        )
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["id"] == profile.id
+
+    def test_list_profiles_filtered_by_birth_date_range(
+        self, client: APIClient
+    ) -> None:
+        ProfileFactory(birth_date=date(1990, 1, 1))
+        profile: Profile = ProfileFactory(birth_date=date(2000, 6, 15))
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(
+            f"{ENDPOINT}/",
+            {
+                "birth_date_after": "2000-01-01",
+                "birth_date_before": "2000-12-31",
+            },
+            format="json",
+        )
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+        assert response.data["results"][0]["id"] == profile.id
+
+    def test_list_profiles_fails_with_invalid_gender(
+        self, client: APIClient
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(f"{ENDPOINT}/?gender=X", format="json")
+        assert response.status_code == 400
+
+    def test_list_profiles_max_age_includes_the_whole_year(
+        self, client: APIClient
+    ) -> None:
+        birth_date: date = get_birth_date_cutoff(41) + timedelta(days=1)
+        profile: Profile = ProfileFactory(birth_date=birth_date)
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(
+            f"{ENDPOINT}/?max_age=40", format="json"
+        )
+        assert response.status_code == 200
+        ids: list = [profile["id"] for profile in response.data["results"]]
+        assert profile.id in ids
+
+    def test_list_profiles_fails_with_invalid_age(
+        self, client: APIClient
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(
+            f"{ENDPOINT}/?min_age=-1", format="json"
+        )
+        assert response.status_code == 400
+
 
 @pytest.mark.django_db
 class TestProfileRetrieveEndpoint:
@@ -150,6 +257,140 @@ class TestProfileRetrieveEndpoint:
         assert response.data["birth_date"] == profile.birth_date
         assert response.data["is_adult"] == profile.is_adult()
 
+    def test_retrieve_loads_the_profile_once(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        profile_id: int = user.profile.id
+        cache.clear()
+        with django_assert_num_queries(1):
+            response: Response = client.get(
+                f"{ENDPOINT}/{profile_id}/", format="json"
+            )
+        assert response.status_code == 200
+
+    def test_retrieve_is_served_from_the_cached_representation(
+        self,
+        client: APIClient,
+        django_assert_num_queries: callable,
+        django_capture_on_commit_callbacks: callable,
+    ) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        profile_id: int = user.profile.id
+        with django_assert_num_queries(0):
+            response: Response = client.get(
+                f"{ENDPOINT}/{profile_id}/", format="json"
+            )
+        assert response.status_code == 200
+        assert response.data["user_id"] == user.id
+
+    def test_cached_retrieve_fails_to_other_user(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        other_user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        response: Response = client.get(
+            f"{ENDPOINT}/{other_user.profile.id}/", format="json"
+        )
+        assert response.status_code == 403
+
+    def test_cached_retrieve_recomputes_is_adult(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        profile: Profile = user.profile
+        profile.birth_date = get_birth_date_cutoff(18) + timedelta(days=1)
+        profile.save()
+        client.force_authenticate(user=user)
+        response: Response = client.get(
+            f"{ENDPOINT}/{profile.id}/", format="json"
+        )
+        assert response.data["is_adult"] == False
+        next_day: date = date.today() + timedelta(days=1)
+        with patch("Users.models.timezone.localdate", return_value=next_day):
+            response = client.get(f"{ENDPOINT}/{profile.id}/", format="json")
+        assert response.data["is_adult"] == True
+
+
+@pytest.mark.django_db
+class TestProfileBatchEndpoint:
+    def test_batch_fails_as_unverified_user(self, client: APIClient) -> None:
+        client.force_authenticate(user=UserFaker())
+        response: Response = client.get(f"{ENDPOINT}/batch/", {"ids": "1"})
+        assert response.status_code == 403
+
+    @pytest.mark.parametrize("ids", ["", ",", "1,a", "1.5"])
+    def test_batch_fails_with_invalid_ids(
+        self, client: APIClient, ids: str
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(f"{ENDPOINT}/batch/", {"ids": ids})
+        assert response.status_code == 400
+
+    def test_batch_fails_with_too_many_ids(
+        self, client: APIClient, settings: object
+    ) -> None:
+        settings.BATCH_RETRIEVE_MAX_IDS = 2
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(f"{ENDPOINT}/batch/", {"ids": "1,2,3"})
+        assert response.status_code == 400
+
+    def test_batch_returns_the_profiles_in_the_requested_order(
+        self, client: APIClient
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        profiles: list = [VerifiedUserFaker().profile for _ in range(3)]
+        ids: list = [profiles[2].id, 0, profiles[0].id, profiles[2].id]
+        response: Response = client.get(
+            f"{ENDPOINT}/batch/", {"ids": ",".join(map(str, ids))}
+        )
+        assert response.status_code == 200
+        assert [profile["id"] for profile in response.data] == [
+            profiles[2].id,
+            profiles[0].id,
+        ]
+        assert "is_adult" in response.data[0]
+
+    def test_batch_only_returns_the_owned_profiles_to_users(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        other_profile: Profile = VerifiedUserFaker().profile
+        client.force_authenticate(user=user)
+        ids: str = f"{other_profile.id},{user.profile.id}"
+        response: Response = client.get(f"{ENDPOINT}/batch/", {"ids": ids})
+        assert [profile["id"] for profile in response.data] == [
+            user.profile.id
+        ]
+        # Cached representations are checked as well
+        client.force_authenticate(user=AdminFaker())
+        client.get(f"{ENDPOINT}/batch/", {"ids": ids})
+        client.force_authenticate(user=user)
+        response = client.get(f"{ENDPOINT}/batch/", {"ids": ids})
+        assert [profile["id"] for profile in response.data] == [
+            user.profile.id
+        ]
+
+    def test_batch_loads_the_profiles_in_one_query(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        admin: User = AdminFaker()
+        client.force_authenticate(user=admin)
+        ids: str = ",".join(
+            str(VerifiedUserFaker().profile.id) for _ in range(5)
+        )
+        cache.clear()
+        with django_assert_num_queries(1):
+            response: Response = client.get(f"{ENDPOINT}/batch/", {"ids": ids})
+        assert len(response.data) == 5
+        with django_assert_num_queries(0):
+            response = client.get(f"{ENDPOINT}/batch/", {"ids": ids})
+        assert len(response.data) == 5
+
 
 @pytest.mark.django_db
 class TestProfileCreateEndpoint:
@@ -297,6 +538,20 @@ class TestProfileUpdateEndpoint:
         assert response.data["nickname"] == data["nickname"]
         assert response.data["bio"] == data["bio"]
 
+    def test_update_returns_is_adult_of_the_new_birth_date(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        birth_date: date = get_birth_date_cutoff(20)
+        response: Response = client.put(
+            f"{ENDPOINT}/{user.profile.id}/",
+            data={"birth_date": birth_date.isoformat()},
+            format="json",
+        )
+        assert response.status_code == 200
+        assert response.data["is_adult"] == True
+
     def test_update_success_as_authenticate_verified_user_to_its_profile_do_not_change_the_user_id(
         self, client: APIClient
     ) -> None:
@@ -93,6 +93,52 @@ class TestUserSerializer:
         email: str = "normaluser2@appname.me"
         serializer.check_email(email, user)
 
+    def test_check_unique_fields_uses_a_single_query(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        user: User = UserFactory()
+        serializer: UserSerializer = UserSerializer()
+        data: dict = {
+            "email": "unusedemail@appname.me",
+            "phone_number": "+123123125",
+        }
+        with django_assert_num_queries(1):
+            serializer.check_unique_fields(data, user)
+
+    def test_check_unique_fields_reports_the_email_first(self) -> None:
+        UserFactory(email="normaluser@appname.me")
+        UserFactory(phone_number="+1123123123")
+        serializer: UserSerializer = UserSerializer()
+        data: dict = {
+            "email": "normaluser@appname.me",
+            "phone_number": "+1123123123",
+        }
+        with pytest.raises(serializers.ValidationError) as error:
+            serializer.check_unique_fields(data, UserFactory())
+        assert "Email is taken" in str(error.value)
+
+    def test_check_unique_fields_compares_the_email_case(self) -> None:
+        UserFactory(email="normaluser@appname.me")
+        serializer: UserSerializer = UserSerializer()
+        data: dict = {"email": "NormalUser@appname.me"}
+        with pytest.raises(serializers.ValidationError) as error:
+            serializer.check_unique_fields(data, UserFactory())
+        assert "Email is taken" in str(error.value)
+
+    def test_update_reports_a_taken_email_on_the_insert(self) -> None:
+        taken_user: User = UserFactory()
+        user: User = UserFactory()
+        serializer: UserSerializer = UserSerializer()
+        with pytest.raises(serializers.ValidationError) as error:
+            serializer.update(user, {"email": taken_user.email})
+        assert "Email is taken" in str(error.value)
+
+    def test_check_unique_fields_ignores_the_own_values(self) -> None:
+        user: User = UserFactory(phone_number="+1123123123")
+        serializer: UserSerializer = UserSerializer()
+        data: dict = {"email": user.email, "phone_number": "+1123123123"}
+        serializer.check_unique_fields(data, user)
+
     def test_update(self) -> None:
         user: User = UserFactory()
         serializer: UserSerializer = UserSerializer()
@@ -342,3 +388,32 @@ class TestUserSignUpSerializer:
         assert user.first_name == data["first_name"]
         assert user.last_name == data["last_name"]
         assert user.is_verified == False
+
+    def test_create_fails_with_an_used_email(self) -> None:
+        UserFactory(email="email@appname.me")
+        serializer: UserSignUpSerializer = UserSignUpSerializer()
+        data: dict = {
+            "first_name": "Name",
+            "last_name": "Lastname",
+            "email": "email@appname.me",
+            "password": "strong password 123",
+            "password_confirmation": "strong password 123",
+        }
+        with pytest.raises(serializers.ValidationError) as error:
+            serializer.create(data)
+        assert error.value.detail == {"email": ["This field must be unique."]}
+        assert User.objects.filter(email=data["email"]).count() == 1
+
+    def test_valid_data_does_not_query_the_email(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        data: dict = {
+            "first_name": "Name",
+            "last_name": "Lastname",
+            "email": "email@appname.me",
+            "password": "strong password 123",
+            "password_confirmation": "strong password 123",
+        }
+        serializer: UserSignUpSerializer = UserSignUpSerializer(data=data)
+        with django_assert_num_queries(0):
+            assert serializer.is_valid() is True
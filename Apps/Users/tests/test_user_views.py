@@ -1,17 +1,28 @@
 import json
+from datetime import timedelta
 
 import pytest
+from django.conf import settings
 from django.core import mail
+from django.core.cache import cache
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
 from django_rest_passwordreset.models import ResetPasswordToken
+from mock import MagicMock
+from mock import patch
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+from Project.utils.testing import assert_constant_query_count
 from Users.factories.user import UserFactory
 from Users.fakers.user import AdminFaker
 from Users.fakers.user import UserFaker
 from Users.fakers.user import VerifiedUserFaker
+from Users.hashing import hashing_pool
 from Users.models import Profile
 from Users.models import User
+from Users.representations import get_representation_key
 from Users.utils import generate_user_verification_token
 
 
@@ -33,8 +44,8 @@ class TestUserSignUpEndpoint:
             "first_name": "Test",
             "last_name": "Tested",
             "email": "emailused@appname.me",
-            "password": "password",
-            "password_confirmation": "password",
+            "password": "strong password 123",
+            "password_confirmation": "strong password 123",
         }
         response: Response = client.post(
             f"{ENDPOINT}/signup/", data, format="json"
@@ -181,6 +192,42 @@ class TestUserLogInEndpoint:
         assert data["user"]["last_name"] == testing_user.last_name
         assert data["user"]["email"] == testing_user.email
 
+    def test_login_is_throttled_when_the_hashing_pool_is_full(
+        self, client: APIClient
+    ) -> None:
+        VerifiedUserFaker(
+            email="rightemail@appname.me", password="RightPassword"
+        )
+        data: dict = {
+            "email": "rightemail@appname.me",
+            "password": "RightPassword",
+        }
+        with patch.object(hashing_pool, "capacity", 0), patch.object(
+            hashing_pool, "executor", MagicMock()
+        ):
+            response: Response = client.post(
+                f"{ENDPOINT}/login/", data, format="json"
+            )
+        assert response.status_code == 429
+        assert response["Retry-After"] == "1"
+
+    def test_token_is_throttled_when_the_hashing_pool_is_full(
+        self, client: APIClient
+    ) -> None:
+        VerifiedUserFaker(
+            email="rightemail@appname.me", password="RightPassword"
+        )
+        data: dict = {
+            "email": "rightemail@appname.me",
+            "password": "RightPassword",
+        }
+        with patch.object(hashing_pool, "capacity", 0), patch.object(
+            hashing_pool, "executor", MagicMock()
+        ):
+            response: Response = client.post("/api/token/", data)
+        assert response.status_code == 429
+        assert response["Retry-After"] == "1"
+
 
 @pytest.mark.django_db
 class TestUserListEndpoint:
@@ -234,6 +281,48 @@ class TestUserListEndpoint:
         admin_name = user.first_name
         assert response.data["results"][0]["first_name"] == admin_name
 
+    def test_list_users_queries_do_not_grow_with_results(
+        self, client: APIClient
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        assert_constant_query_count(
+            lambda: client.get(f"{ENDPOINT}/?page_size=100", format="json"),
+            lambda number: [VerifiedUserFaker() for _ in range(number)],
+        )
+
+    def test_list_users_filtered_by_flags(self, client: APIClient) -> None:
+        UserFaker()
+        VerifiedUserFaker()
+        user: User = VerifiedUserFaker(is_premium=True)
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(
+            f"{ENDPOINT}/?is_verified=true&is_premium=true&is_admin=false",
+            format="json",
+        )
+        assert response.status_code == 200
+        emails: list = [user["email"] for user in response.data["results"]]
+        assert emails == [user.email]
+
+    def test_list_users_filtered_by_creation_range(
+        self, client: APIClient
+    ) -> None:
+        old_user: User = UserFaker()
+        User.objects.filter(pk=old_user.pk).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+        user: User = UserFaker()
+        admin: User = AdminFaker()
+        client.force_authenticate(user=admin)
+        created_after: str = (timezone.now() - timedelta(days=1)).isoformat()
+        response: Response = client.get(
+            f"{ENDPOINT}/",
+            {"created_at_after": created_after},
+            format="json",
+        )
+        assert response.status_code == 200
+        emails: list = [user["email"] for user in response.data["results"]]
+        assert sorted(emails) == sorted([user.email, admin.email])
+
 
 @pytest.mark.django_db
 class TestUserGetEndpoint:
@@ -290,6 +379,176 @@ class TestUserGetEndpoint:
         )
         assert response.status_code == 200
 
+    def test_get_user_loads_the_user_once(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        normal_user: User = VerifiedUserFaker()
+        client.force_authenticate(user=normal_user)
+        cache.clear()
+        # The user is joined to its profile
+        with django_assert_num_queries(1):
+            response: Response = client.get(
+                f"{ENDPOINT}/{normal_user.id}/", format="json"
+            )
+        assert response.status_code == 200
+
+    def test_get_user_is_served_from_the_cached_representation(
+        self,
+        client: APIClient,
+        django_assert_num_queries: callable,
+        django_capture_on_commit_callbacks: callable,
+    ) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            normal_user: User = VerifiedUserFaker()
+        client.force_authenticate(user=normal_user)
+        with django_assert_num_queries(0):
+            response: Response = client.get(
+                f"{ENDPOINT}/{normal_user.id}/", format="json"
+            )
+        assert response.status_code == 200
+        assert response.data["email"] == normal_user.email
+        assert response.data["profile"]["id"] == normal_user.profile.id
+
+    def test_get_user_serves_the_representations_of_other_processes(
+        self, client: APIClient, django_capture_on_commit_callbacks: callable
+    ) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            normal_user: User = VerifiedUserFaker()
+        client.force_authenticate(user=normal_user)
+        client.get(f"{ENDPOINT}/{normal_user.id}/", format="json")
+        # Another process, with its own connection to the cache, refreshes
+        # the representation after a save
+        key: str = get_representation_key(User, normal_user.id)
+        other_cache: object = caches.create_connection(
+            settings.REPRESENTATION_CACHE_ALIAS
+        )
+        representation: dict = other_cache.get(key)
+        representation["data"]["first_name"] = "Changed"
+        other_cache.set(key, representation)
+        response: Response = client.get(
+            f"{ENDPOINT}/{normal_user.id}/", format="json"
+        )
+        assert response.data["first_name"] == "Changed"
+
+    def test_get_user_reflects_the_saved_changes(
+        self, client: APIClient, django_capture_on_commit_callbacks: callable
+    ) -> None:
+        normal_user: User = VerifiedUserFaker()
+        client.force_authenticate(user=normal_user)
+        client.get(f"{ENDPOINT}/{normal_user.id}/", format="json")
+        with django_capture_on_commit_callbacks(execute=True):
+            normal_user.first_name = "Changed"
+            normal_user.save()
+            normal_user.profile.nickname = "changed nickname"
+            normal_user.profile.save()
+        response: Response = client.get(
+            f"{ENDPOINT}/{normal_user.id}/", format="json"
+        )
+        assert response.data["first_name"] == "Changed"
+        assert response.data["profile"]["nickname"] == "changed nickname"
+
+    def test_rolled_back_saves_are_not_cached(
+        self, client: APIClient, django_capture_on_commit_callbacks: callable
+    ) -> None:
+        normal_user: User = VerifiedUserFaker()
+        client.force_authenticate(user=normal_user)
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with pytest.raises(ValueError):
+                with transaction.atomic():
+                    normal_user.first_name = "Rolled back"
+                    normal_user.save()
+                    normal_user.profile.nickname = "rolled back"
+                    normal_user.profile.save()
+                    raise ValueError
+        assert callbacks == []
+        response: Response = client.get(
+            f"{ENDPOINT}/{normal_user.id}/", format="json"
+        )
+        assert response.data["first_name"] != "Rolled back"
+        assert response.data["profile"]["nickname"] != "rolled back"
+
+    def test_profile_saves_do_not_load_the_user(
+        self,
+        django_assert_num_queries: callable,
+        django_capture_on_commit_callbacks: callable,
+    ) -> None:
+        user_id: int = VerifiedUserFaker().id
+        profile: Profile = Profile.objects.get(user_id=user_id)
+        profile.nickname = "changed nickname"
+        with django_assert_num_queries(1):
+            with django_capture_on_commit_callbacks(execute=True):
+                profile.save()
+        assert not Profile.user.is_cached(profile)
+
+
+@pytest.mark.django_db
+class TestUserMeEndpoint:
+    def test_me_fails_as_an_unauthenticated_user(
+        self, client: APIClient
+    ) -> None:
+        response: Response = client.get(f"{ENDPOINT}/me/", format="json")
+        assert response.status_code == 401
+
+    def test_me_fails_as_an_unverified_user(self, client: APIClient) -> None:
+        client.force_authenticate(user=UserFaker())
+        response: Response = client.get(f"{ENDPOINT}/me/", format="json")
+        assert response.status_code == 403
+
+    def test_me_returns_the_authenticated_user_with_its_profile(
+        self, client: APIClient
+    ) -> None:
+        normal_user: User = VerifiedUserFaker()
+        VerifiedUserFaker()
+        client.force_authenticate(user=normal_user)
+        response: Response = client.get(f"{ENDPOINT}/me/", format="json")
+        assert response.status_code == 200
+        assert response.data["id"] == normal_user.id
+        assert response.data["profile"]["id"] == normal_user.profile.id
+        assert "ETag" in response
+
+    def test_me_loads_the_user_and_profile_in_one_query(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        normal_user: User = VerifiedUserFaker()
+        client.force_authenticate(user=normal_user)
+        cache.clear()
+        with django_assert_num_queries(1):
+            response: Response = client.get(f"{ENDPOINT}/me/", format="json")
+        assert response.data["profile"]["id"] == normal_user.profile.id
+        with django_assert_num_queries(0):
+            response = client.get(f"{ENDPOINT}/me/", format="json")
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestUserBatchEndpoint:
+    def test_batch_returns_the_users_with_their_profiles(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        users: list = [VerifiedUserFaker() for _ in range(3)]
+        ids: str = ",".join(str(user.id) for user in reversed(users))
+        cache.clear()
+        with django_assert_num_queries(1):
+            response: Response = client.get(f"{ENDPOINT}/batch/", {"ids": ids})
+        assert response.status_code == 200
+        assert [user["id"] for user in response.data] == [
+            user.id for user in reversed(users)
+        ]
+        assert response.data[0]["profile"]["id"] == users[2].profile.id
+
+    def test_batch_only_returns_the_user_itself_to_users(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        other_user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        response: Response = client.get(
+            f"{ENDPOINT}/batch/", {"ids": f"{other_user.id},{user.id}"}
+        )
+        assert response.status_code == 200
+        assert [user["id"] for user in response.data] == [user.id]
+
 
 @pytest.mark.django_db
 class TestUserUpdateEndpoint:
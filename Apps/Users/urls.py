@@ -3,6 +3,9 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 
 from Users.views import ProfileViewSet
+from Users.views import ThrottledResetPasswordConfirm
+from Users.views import ThrottledResetPasswordRequestToken
+from Users.views import ThrottledResetPasswordValidateToken
 from Users.views import UserViewSet
 
 
@@ -13,3 +16,22 @@ router.register("profiles", ProfileViewSet, basename="profiles")
 urlpatterns: list = [
     path("", include(router.urls)),
 ]
+
+# The django_rest_passwordreset URLs, served by the throttled views
+password_reset_urlpatterns: list = [
+    path(
+        "validate_token/",
+        ThrottledResetPasswordValidateToken.as_view(),
+        name="reset-password-validate",
+    ),
+    path(
+        "confirm/",
+        ThrottledResetPasswordConfirm.as_view(),
+        name="reset-password-confirm",
+    ),
+    path(
+        "",
+        ThrottledResetPasswordRequestToken.as_view(),
+        name="reset-password-request",
+    ),
+]
@@ -1,23 +1,46 @@
+from datetime import date
+
+from django.db.models import Expression
 from django.db.models import QuerySet
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Greatest
 from django.http import HttpRequest
 from django.http.response import JsonResponse
+from django_rest_passwordreset.views import ResetPasswordConfirm
+from django_rest_passwordreset.views import ResetPasswordRequestToken
+from django_rest_passwordreset.views import ResetPasswordValidateToken
 from rest_framework import status
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import Throttled
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import AllowAny
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView
 
-from Project.pagination import ListTenResultsSetPagination
+from Project.mixins import SparseFieldsMixin
+from Project.mixins import StreamingListMixin
+from Project.pagination import SelectableResultsSetPagination
+from Project.throttling import SLIDING_WINDOW_THROTTLES
 from Project.utils.log import log_information
+from Project.utils.request_cache import RequestCachedObjectMixin
+from Project.utils.request_cache import get_request_cache
+from Users.bloom import is_email_taken
+from Users.filters import ProfileFilter
+from Users.filters import UserFilter
+from Users.hashing import HashingBusy
 from Users.models import Profile
 from Users.models import User
+from Users.models import get_adult_cutoff
 from Users.permissions import IsActionAllowed
 from Users.permissions import IsAdmin
 from Users.permissions import IsProfileOwner
 from Users.permissions import IsUserOwner
 from Users.permissions import IsVerified
+from Users.representations import BatchRetrieveMixin
+from Users.representations import CachedRepresentationMixin
+from Users.serializers import EmailAvailabilitySerializer
 from Users.serializers import ProfileSerializer
 from Users.serializers import UserLoginSerializer
 from Users.serializers import UserSerializer
@@ -31,39 +54,97 @@ DELETED: int = status.HTTP_204_NO_CONTENT
 NOT_FOUND: int = status.HTTP_404_NOT_FOUND
 
 
-class UserViewSet(viewsets.GenericViewSet):
+class HashingBusyMixin:
+    """
+    Answers with a 429 when the password hashing pool is full
+    """
+
+    def handle_exception(self, exc: Exception) -> Response:
+        if isinstance(exc, HashingBusy):
+            exc = Throttled(wait=exc.wait, detail=str(exc))
+        return super().handle_exception(exc)
+
+
+class UserViewSet(
+    HashingBusyMixin,
+    BatchRetrieveMixin,
+    CachedRepresentationMixin,
+    RequestCachedObjectMixin,
+    SparseFieldsMixin,
+    StreamingListMixin,
+    viewsets.GenericViewSet,
+):
     """
     API endpoint that allows to interact with User model
     """
 
-    queryset: QuerySet = User.objects.all().order_by("-created_at")
+    queryset: QuerySet = User.objects.all().order_by("-created_at", "-id")
     serializer_class: UserSerializer = UserSerializer
     user_permissions: bool = IsAuthenticated & IsVerified & IsUserOwner
     admin_user_permissions: bool = IsAuthenticated & IsAdmin
     permission_classes: list = [user_permissions | admin_user_permissions]
-    pagination_class: PageNumberPagination = ListTenResultsSetPagination
+    pagination_class: BasePagination = SelectableResultsSetPagination
+    filterset_class: UserFilter = UserFilter
+    throttle_scope: str = None
+
+    def get_serializer_class(self) -> type:
+        if self.action in ["retrieve", "me", "batch"]:
+            return UserLoginSerializer
+        return super().get_serializer_class()
+
+    def get_version_expression(self) -> Expression:
+        # The user representation embeds its profile, so it is versioned
+        # by the latest save of both
+        return Greatest(
+            "updated_at", Coalesce("profile__updated_at", "updated_at")
+        )
 
     def list(self, request: HttpRequest) -> Response:
         """
         API endpoint that allows to list all users
         """
-        page: list = self.paginate_queryset(self.queryset)
-        serializer: UserSerializer = UserSerializer(page, many=True)
-        return self.get_paginated_response(serializer.data)
+        return super().list(request)
 
     def retrieve(self, request: HttpRequest, pk: int = None) -> Response:
         """
         API endpoint that allow to get information of one user
         """
-        instance: User = self.queryset.get(pk=pk)
-        data: UserLoginSerializer = UserLoginSerializer(instance).data
-        return Response(data, status=SUCCESS)
+        return super().retrieve(request, pk=pk)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated & (IsVerified | IsAdmin)],
+    )
+    def me(self, request: HttpRequest) -> Response:
+        """
+        API endpoint that allows to get the authenticated user with its
+        profile
+        """
+        self.kwargs["pk"] = request.user.pk
+        return super().retrieve(request, pk=request.user.pk)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated & (IsVerified | IsAdmin)],
+    )
+    def batch(self, request: HttpRequest) -> Response:
+        """
+        API endpoint that allows to get the users of the ids query parameter
+        """
+        return self.get_batch_response(request)
 
     def update(self, request: HttpRequest, pk: int = None) -> Response:
         """
         API endpoint that allow to edit an user
         """
-        instance: User = self.queryset.get(pk=pk)
+        return super().update(request, pk=pk)
+
+    def get_update_response(
+        self, request: HttpRequest, pk: int = None
+    ) -> Response:
+        instance: User = self.get_object()
         serializer: UserSerializer = UserSerializer(data=request.data)
         serializer.is_valid(request.data, request.user)
         user: User = serializer.update(instance, request.data)
@@ -75,12 +156,18 @@ class UserViewSet(viewsets.GenericViewSet):
         """
         API endpoint that allow to delete an user
         """
-        instance: User = self.queryset.get(pk=pk)
+        instance: User = self.get_object()
         log_information("deleted", instance)
         instance.delete()
         return Response(status=DELETED)
 
-    @action(detail=False, methods=["post"], permission_classes=[AllowAny])
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[AllowAny],
+        throttle_classes=SLIDING_WINDOW_THROTTLES,
+        throttle_scope="signup",
+    )
     def signup(self, request: HttpRequest) -> Response:
         """
         API endpoint that allows to signup
@@ -94,7 +181,13 @@ class UserViewSet(viewsets.GenericViewSet):
         log_information("registered", user)
         return Response(data, status=CREATED)
 
-    @action(detail=False, methods=["post"], permission_classes=[AllowAny])
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[AllowAny],
+        throttle_classes=SLIDING_WINDOW_THROTTLES,
+        throttle_scope="login",
+    )
     def login(self, request: HttpRequest) -> JsonResponse:
         """
         API endpoint that allows to login
@@ -109,6 +202,25 @@ class UserViewSet(viewsets.GenericViewSet):
         log_information("logged in", user)
         return JsonResponse(data, status=SUCCESS)
 
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[AllowAny],
+        throttle_classes=SLIDING_WINDOW_THROTTLES,
+        throttle_scope="email_available",
+    )
+    def email_available(self, request: HttpRequest) -> Response:
+        """
+        API endpoint that tells if an email can be used to signup
+        """
+        serializer: EmailAvailabilitySerializer = EmailAvailabilitySerializer(
+            data=request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        email: str = serializer.validated_data["email"]
+        data: dict = {"email": email, "available": not is_email_taken(email)}
+        return Response(data, status=SUCCESS)
+
     @action(detail=True, methods=["get"], permission_classes=[AllowAny])
     def verify(self, request: HttpRequest, pk: int = None) -> JsonResponse:
         """
@@ -123,18 +235,70 @@ class UserViewSet(viewsets.GenericViewSet):
         return JsonResponse(data, status=SUCCESS)
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(
+    BatchRetrieveMixin,
+    CachedRepresentationMixin,
+    RequestCachedObjectMixin,
+    SparseFieldsMixin,
+    StreamingListMixin,
+    viewsets.ModelViewSet,
+):
     """
     API endpoint that allows to interact with Profile model;
     List, create and destroy are only available only for admin users because the
     create and destroy will be triggered when verify/delete the user instance
     """
 
-    queryset: QuerySet = Profile.objects.all().order_by("-created_at")
+    queryset: QuerySet = Profile.objects.all().order_by("-created_at", "-id")
     lookup_url_kwarg: str = "pk"
     serializer_class: ProfileSerializer = ProfileSerializer
     user_permissions: bool = IsVerified & IsProfileOwner & IsActionAllowed
     admin_user_permissions: bool = IsAdmin
     permissions: bool = user_permissions | admin_user_permissions
     permission_classes: list = [IsAuthenticated & permissions]
-    pagination_class: PageNumberPagination = ListTenResultsSetPagination
+    pagination_class: BasePagination = SelectableResultsSetPagination
+    filterset_class: ProfileFilter = ProfileFilter
+    batch_owner_field: str = "user_id"
+
+    def get_queryset(self) -> QuerySet:
+        queryset: QuerySet = super().get_queryset()
+        return queryset.with_is_of_age(self.get_adult_cutoff())
+
+    def get_adult_cutoff(self) -> date:
+        # Every profile of the request is compared against the same date
+        cache: dict = get_request_cache(self.request)
+        if "adult_cutoff" not in cache:
+            cache["adult_cutoff"] = get_adult_cutoff()
+        return cache["adult_cutoff"]
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated & (IsVerified | IsAdmin)],
+    )
+    def batch(self, request: HttpRequest) -> Response:
+        """
+        API endpoint that allows to get the profiles of the ids query
+        parameter
+        """
+        return self.get_batch_response(request)
+
+
+class ThrottledTokenObtainPairView(HashingBusyMixin, TokenObtainPairView):
+    throttle_classes: list = SLIDING_WINDOW_THROTTLES
+    throttle_scope: str = "token"
+
+
+class ThrottledResetPasswordRequestToken(ResetPasswordRequestToken):
+    throttle_classes: list = SLIDING_WINDOW_THROTTLES
+    throttle_scope: str = "password_reset"
+
+
+class ThrottledResetPasswordConfirm(HashingBusyMixin, ResetPasswordConfirm):
+    throttle_classes: list = SLIDING_WINDOW_THROTTLES
+    throttle_scope: str = "password_reset"
+
+
+class ThrottledResetPasswordValidateToken(ResetPasswordValidateToken):
+    throttle_classes: list = SLIDING_WINDOW_THROTTLES
+    throttle_scope: str = "password_reset"
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ProjectConfig(AppConfig):
+    name: str = "Project"
+
+    def ready(self) -> None:
+        import Project.checks  # noqa: F401
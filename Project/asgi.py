@@ -1,9 +1,26 @@
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 from django.core.handlers.asgi import ASGIHandler
 
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Project.settings")
 
-application: ASGIHandler = get_asgi_application()
+django_application: ASGIHandler = get_asgi_application()
+
+# The apps must be loaded before importing the event stream application
+from Emails.events import EventStreamApplication  # noqa: E402
+
+
+events_application: EventStreamApplication = EventStreamApplication()
+
+
+async def application(scope: dict, receive: callable, send: callable):
+    """
+    Serves the server-sent events from the event loop, any other request is
+    handled by django
+    """
+    if scope["type"] == "http" and scope["path"] == settings.EVENTS_PATH:
+        return await events_application(scope, receive, send)
+    return await django_application(scope, receive, send)
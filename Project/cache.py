@@ -0,0 +1,285 @@
+import math
+import pickle
+import random
+import time
+from typing import NamedTuple
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.base import BaseCache
+from django.utils.module_loading import import_string
+
+from Project.utils.lru import TimedLRUCache
+from Project.utils.metrics_common import Metrics
+
+
+MISSING: object = object()
+LOCAL_TIER: str = "local"
+REMOTE_TIER: str = "remote"
+
+
+class CachedValue(NamedTuple):
+    """
+    Value stored by get_or_set, it keeps how long it took to compute and
+    when it expires so it can be refreshed before expiring
+    """
+
+    value: object
+    delta: float
+    expires_at: float or None
+
+
+class TwoTierCache(BaseCache):
+    """
+    Cache backend that keeps the hot keys in an in-process LRU in front of
+    the remote backend set on OPTIONS REMOTE_BACKEND. The local copies live
+    at most LOCAL_TIMEOUT seconds, other processes may serve a value up to
+    that long after it changed.
+
+    get_or_set protects the remote backend from stampedes: values close to
+    expire are refreshed early by a single caller while the rest keep
+    serving them, and on misses only one caller computes the value while the
+    rest wait for it.
+    """
+
+    def __init__(self, location: str, params: dict) -> None:
+        super().__init__(params)
+        options: dict = params.get("OPTIONS", {})
+        remote_params: dict = {
+            "TIMEOUT": self.default_timeout,
+            "KEY_PREFIX": self.key_prefix,
+            "VERSION": self.version,
+            "KEY_FUNCTION": params.get("KEY_FUNCTION"),
+            "OPTIONS": options.get("REMOTE_OPTIONS", {}),
+        }
+        remote_class: type = import_string(options["REMOTE_BACKEND"])
+        self.remote: BaseCache = remote_class(location, remote_params)
+        self.local_timeout: float = float(options.get("LOCAL_TIMEOUT", 5.0))
+        self.local: TimedLRUCache = TimedLRUCache(
+            int(options.get("LOCAL_MAX_SIZE", 10000)), self.local_timeout
+        )
+        self.early_refresh_beta: float = float(
+            options.get("EARLY_REFRESH_BETA", 1.0)
+        )
+        self.lock_timeout: float = float(options.get("LOCK_TIMEOUT", 10.0))
+        self.lock_poll: float = float(options.get("LOCK_POLL", 0.05))
+
+    def get_timeout(self, timeout: object = DEFAULT_TIMEOUT) -> int or None:
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def get_local_timeout(self, timeout: int or None) -> float:
+        if timeout is None:
+            return self.local_timeout
+        return min(self.local_timeout, timeout)
+
+    def get_local(self, key: str) -> object:
+        value: bytes = self.local.get(key, MISSING)
+        if value is MISSING:
+            return MISSING
+        # The local copies are pickled so callers never share instances
+        return pickle.loads(value)
+
+    def set_local(self, key: str, value: object, timeout: int or None) -> None:
+        if isinstance(value, CachedValue) and value.expires_at is not None:
+            timeout = value.expires_at - time.time()
+        local_timeout: float = self.get_local_timeout(timeout)
+        if local_timeout <= 0:
+            self.local.delete(key)
+            return
+        value: bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.local.set(key, value, local_timeout)
+
+    def get_entry(self, key: str, version: int = None) -> object:
+        local_key: str = self.make_key(key, version)
+        entry: object = self.get_local(local_key)
+        if entry is not MISSING:
+            Metrics.cache_hits.labels(LOCAL_TIER).inc()
+            return entry
+        entry = self.remote.get(key, MISSING, version=version)
+        if entry is MISSING:
+            Metrics.cache_misses.inc()
+            return MISSING
+        Metrics.cache_hits.labels(REMOTE_TIER).inc()
+        self.set_local(local_key, entry, None)
+        return entry
+
+    def get(
+        self, key: str, default: object = None, version: int = None
+    ) -> object:
+        entry: object = self.get_entry(key, version)
+        return default if entry is MISSING else get_value(entry)
+
+    def set(
+        self,
+        key: str,
+        value: object,
+        timeout: object = DEFAULT_TIMEOUT,
+        version: int = None,
+    ) -> None:
+        timeout = self.get_timeout(timeout)
+        self.remote.set(key, value, timeout=timeout, version=version)
+        self.set_local(self.make_key(key, version), value, timeout)
+
+    def add(
+        self,
+        key: str,
+        value: object,
+        timeout: object = DEFAULT_TIMEOUT,
+        version: int = None,
+    ) -> bool:
+        timeout = self.get_timeout(timeout)
+        added: bool = self.remote.add(
+            key, value, timeout=timeout, version=version
+        )
+        if added:
+            self.set_local(self.make_key(key, version), value, timeout)
+        return added
+
+    def touch(
+        self, key: str, timeout: object = DEFAULT_TIMEOUT, version: int = None
+    ) -> bool:
+        self.local.delete(self.make_key(key, version))
+        timeout = self.get_timeout(timeout)
+        return self.remote.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key: str, version: int = None) -> bool:
+        self.local.delete(self.make_key(key, version))
+        return self.remote.delete(key, version=version)
+
+    def incr(self, key: str, delta: int = 1, version: int = None) -> int:
+        self.local.delete(self.make_key(key, version))
+        return self.remote.incr(key, delta, version=version)
+
+    def has_key(self, key: str, version: int = None) -> bool:
+        if self.local.get(self.make_key(key, version), MISSING) is not MISSING:
+            return True
+        return self.remote.has_key(key, version=version)
+
+    def get_many(self, keys: list, version: int = None) -> dict:
+        values: dict = {}
+        remote_keys: list = []
+        for key in keys:
+            entry: object = self.get_local(self.make_key(key, version))
+            if entry is MISSING:
+                remote_keys.append(key)
+            else:
+                Metrics.cache_hits.labels(LOCAL_TIER).inc()
+                values[key] = get_value(entry)
+        if not remote_keys:
+            return values
+        remote_values: dict = self.remote.get_many(
+            remote_keys, version=version
+        )
+        for key, entry in remote_values.items():
+            Metrics.cache_hits.labels(REMOTE_TIER).inc()
+            self.set_local(self.make_key(key, version), entry, None)
+            values[key] = get_value(entry)
+        missing: int = len(remote_keys) - len(remote_values)
+        if missing:
+            Metrics.cache_misses.inc(missing)
+        return values
+
+    def set_many(
+        self,
+        data: dict,
+        timeout: object = DEFAULT_TIMEOUT,
+        version: int = None,
+    ) -> list:
+        timeout = self.get_timeout(timeout)
+        failed_keys: list = self.remote.set_many(
+            data, timeout=timeout, version=version
+        )
+        for key, value in data.items():
+            if key not in failed_keys:
+                self.set_local(self.make_key(key, version), value, timeout)
+        return failed_keys
+
+    def delete_many(self, keys: list, version: int = None) -> None:
+        for key in keys:
+            self.local.delete(self.make_key(key, version))
+        self.remote.delete_many(keys, version=version)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.remote.clear()
+
+    def close(self, **kwargs: dict) -> None:
+        self.remote.close(**kwargs)
+
+    def get_or_set(
+        self,
+        key: str,
+        default: object,
+        timeout: object = DEFAULT_TIMEOUT,
+        version: int = None,
+    ) -> object:
+        entry: object = self.get_entry(key, version)
+        if entry is MISSING:
+            return self.compute_once(key, default, timeout, version)
+        if not self.is_refresh_due(entry):
+            return get_value(entry)
+        # Only the caller that takes the lock refreshes the value, the rest
+        # keep serving the current one until it is replaced
+        if self.acquire_lock(key, version):
+            try:
+                return self.compute(key, default, timeout, version)
+            finally:
+                self.release_lock(key, version)
+        return get_value(entry)
+
+    def compute_once(
+        self, key: str, default: object, timeout: object, version: int
+    ) -> object:
+        deadline: float = time.monotonic() + self.lock_timeout
+        while not self.acquire_lock(key, version):
+            if time.monotonic() >= deadline:
+                # The lock holder took too long, compute it anyway
+                return self.compute(key, default, timeout, version)
+            time.sleep(self.lock_poll)
+            entry: object = self.get_entry(key, version)
+            if entry is not MISSING:
+                return get_value(entry)
+        try:
+            return self.compute(key, default, timeout, version)
+        finally:
+            self.release_lock(key, version)
+
+    def compute(
+        self, key: str, default: object, timeout: object, version: int
+    ) -> object:
+        Metrics.cache_recomputes.inc()
+        timeout = self.get_timeout(timeout)
+        start: float = time.monotonic()
+        value: object = default() if callable(default) else default
+        delta: float = time.monotonic() - start
+        expires_at: float = None if timeout is None else time.time() + timeout
+        self.set(key, CachedValue(value, delta, expires_at), timeout, version)
+        return value
+
+    def is_refresh_due(self, entry: object) -> bool:
+        """
+        Probabilistic early expiration, the closer the value is to expire
+        and the longer it takes to compute the likelier it is refreshed
+        """
+        if not isinstance(entry, CachedValue) or entry.expires_at is None:
+            return False
+        gap: float = -entry.delta * self.early_refresh_beta
+        gap *= math.log(1.0 - random.random())
+        return time.time() + gap >= entry.expires_at
+
+    def get_lock_key(self, key: str) -> str:
+        return f"{key}:lock"
+
+    def acquire_lock(self, key: str, version: int = None) -> bool:
+        return self.remote.add(
+            self.get_lock_key(key),
+            1,
+            timeout=math.ceil(self.lock_timeout),
+            version=version,
+        )
+
+    def release_lock(self, key: str, version: int = None) -> None:
+        self.remote.delete(self.get_lock_key(key), version=version)
+
+
+def get_value(entry: object) -> object:
+    return entry.value if isinstance(entry, CachedValue) else entry
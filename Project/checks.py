@@ -0,0 +1,184 @@
+from django.conf import settings
+from django.core.checks import Tags
+from django.core.checks import Warning
+from django.core.checks import register
+from django.db.models import Model
+from django.db.models import UniqueConstraint
+from django.urls import URLPattern
+from django.urls import URLResolver
+from django.urls import get_resolver
+from rest_framework.viewsets import GenericViewSet
+
+from Project.pagination import KeysetResultsSetPagination
+from Project.pagination import SelectableResultsSetPagination
+
+
+KEYSET_PAGINATIONS: tuple = (
+    KeysetResultsSetPagination,
+    SelectableResultsSetPagination,
+)
+
+
+@register(Tags.models)
+def check_viewset_indexes(app_configs: list = None, **kwargs: dict) -> list:
+    """
+    Warns about the viewset orderings and filters that no index of the
+    model backs, they would sort or scan the whole table on every list
+    """
+    errors: list = []
+    for viewset in get_viewsets(get_resolver().url_patterns):
+        errors += check_viewset(viewset)
+    return errors
+
+
+def check_viewset(viewset: type) -> list:
+    queryset: object = getattr(viewset, "queryset", None)
+    if queryset is None:
+        return []
+    model: Model = queryset.model
+    indexes: list = get_indexes(model)
+    errors: list = []
+    for ordering in get_orderings(viewset):
+        if not is_ordering_indexed(model, ordering, indexes):
+            errors.append(
+                Warning(
+                    f"{viewset.__name__} orders by {', '.join(ordering)} "
+                    "without an index that backs it",
+                    hint="Add a model index with these fields in this order",
+                    obj=viewset,
+                    id="Project.W001",
+                )
+            )
+    for field in get_filter_fields(viewset):
+        if not is_field_indexed(model, field, indexes):
+            errors.append(
+                Warning(
+                    f"{viewset.__name__} filters by {field} "
+                    "without an index that starts with it",
+                    hint="Add a model index whose first field is this one",
+                    obj=viewset,
+                    id="Project.W002",
+                )
+            )
+    return errors
+
+
+def get_viewsets(patterns: list) -> list:
+    viewsets: list = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            viewsets += get_viewsets(pattern.url_patterns)
+            continue
+        if not isinstance(pattern, URLPattern):
+            continue
+        viewset: type = getattr(pattern.callback, "cls", None)
+        is_viewset: bool = isinstance(viewset, type) and issubclass(
+            viewset, GenericViewSet
+        )
+        if is_viewset and viewset not in viewsets:
+            viewsets.append(viewset)
+    return viewsets
+
+
+def get_orderings(viewset: type) -> list:
+    orderings: list = []
+    queryset_ordering: tuple = tuple(viewset.queryset.query.order_by)
+    if queryset_ordering:
+        orderings.append(queryset_ordering)
+    pagination_class: type = getattr(viewset, "pagination_class", None)
+    if pagination_class and issubclass(pagination_class, KEYSET_PAGINATIONS):
+        orderings.append(
+            tuple(
+                getattr(
+                    viewset,
+                    "pagination_ordering",
+                    KeysetResultsSetPagination.ordering,
+                )
+            )
+        )
+    return orderings
+
+
+def get_filter_fields(viewset: type) -> list:
+    filterset_class: type = getattr(viewset, "filterset_class", None)
+    if not filterset_class:
+        return []
+    fields: list = []
+    for filter in filterset_class.base_filters.values():
+        # Method filters decide their own lookups
+        if filter.method is None and filter.field_name not in fields:
+            fields.append(filter.field_name)
+    return fields
+
+
+def get_field_name(model: Model, name: str) -> str:
+    return model._meta.pk.name if name == "pk" else name
+
+
+def get_indexes(model: Model) -> list:
+    """
+    Returns the fields of every index of the model, the single column ones
+    included
+    """
+    indexes: list = [
+        (field.name,)
+        for field in model._meta.concrete_fields
+        if field.primary_key or field.unique or field.db_index
+    ]
+    indexes += [
+        tuple(field.lstrip("-") for field in index.fields)
+        for index in model._meta.indexes
+    ]
+    indexes += [tuple(fields) for fields in model._meta.unique_together]
+    indexes += [
+        tuple(constraint.fields)
+        for constraint in model._meta.constraints
+        if isinstance(constraint, UniqueConstraint) and constraint.fields
+    ]
+    return indexes
+
+
+def is_ordering_indexed(model: Model, ordering: tuple, indexes: list) -> bool:
+    # An index is only read backwards when every field has the same direction
+    directions: set = {field.startswith("-") for field in ordering}
+    if len(directions) > 1:
+        return False
+    fields: tuple = tuple(
+        get_field_name(model, field.lstrip("-")) for field in ordering
+    )
+    return any(index[: len(fields)] == fields for index in indexes)
+
+
+def is_field_indexed(model: Model, field: str, indexes: list) -> bool:
+    if "__" in field:
+        # Lookups across relations are indexed on the related model
+        return True
+    name: str = get_field_name(model, field)
+    return any(index[0] == name for index in indexes)
+
+
+@register()
+def check_password_hashing_pool(
+    app_configs: list = None, **kwargs: dict
+) -> list:
+    """
+    Warns when the password hashing pool holds as many hashes as the
+    requests a process serves at once, it would never reject a hash
+    """
+    capacity: int = (
+        settings.PASSWORD_HASHING_WORKERS
+        + settings.PASSWORD_HASHING_QUEUE_SIZE
+    )
+    if capacity < settings.SERVER_THREADS:
+        return []
+    return [
+        Warning(
+            f"The password hashing pool holds {capacity} hashes and the "
+            f"server only serves {settings.SERVER_THREADS} requests at once",
+            hint=(
+                "Lower PASSWORD_HASHING_WORKERS and "
+                "PASSWORD_HASHING_QUEUE_SIZE below SERVER_THREADS"
+            ),
+            id="Project.W003",
+        )
+    ]
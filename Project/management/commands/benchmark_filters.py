@@ -0,0 +1,169 @@
+import logging
+import random
+import statistics
+import time
+from datetime import date
+from datetime import timedelta
+from logging import Logger
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from django.db.models import QuerySet
+from tqdm import trange as progress
+
+from Users.choices import GenderChoices
+from Users.choices import PreferredLanguageChoices
+from Users.filters import ProfileFilter
+from Users.filters import UserFilter
+from Users.models import Profile
+from Users.models import User
+
+
+logger: Logger = logging.getLogger(__name__)
+
+EMAIL_DOMAIN: str = "benchmark.com"
+PAGE_SIZE: int = 10
+USER_FILTERS: dict = {
+    "verified users": {"is_verified": "true"},
+    "premium users": {"is_premium": "true"},
+    "verified premium users": {"is_verified": "true", "is_premium": "true"},
+    "verified users created last month": {"is_verified": "true", "days": 30},
+}
+PROFILE_FILTERS: dict = {
+    "female profiles": {"gender": GenderChoices.FEMALE.value},
+    "spanish profiles": {
+        "preferred_language": PreferredLanguageChoices.SPANISH.value
+    },
+    "profiles between 25 and 40 years": {"min_age": 25, "max_age": 40},
+    "female profiles between 25 and 40 years": {
+        "gender": GenderChoices.FEMALE.value,
+        "min_age": 25,
+        "max_age": 40,
+    },
+}
+
+
+class Command(BaseCommand):
+
+    help: str = "Benchmarks the users and profiles filters on fake data"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("-i", "--instances", type=int, default=1000000)
+        parser.add_argument("-b", "--batch-size", type=int, default=5000)
+        parser.add_argument("-r", "--repeat", type=int, default=5)
+        parser.add_argument(
+            "-n", "--no-populate", dest="populate", action="store_false"
+        )
+        parser.add_argument("-c", "--clean", action="store_true")
+        parser.set_defaults(populate=True)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        if settings.ENVIRONMENT_NAME not in ["dev", "local", "test"]:
+            logger.critical(
+                "This command creates fake data do NOT run this in"
+                + " production environments"
+            )
+            return
+        if options["populate"]:
+            self.populate(options["instances"], options["batch_size"])
+        self.benchmark(options["repeat"])
+        if options["clean"]:
+            self.clean()
+
+    def get_benchmark_users(self) -> QuerySet:
+        return User.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}")
+
+    def populate(self, instances_number: int, batch_size: int) -> None:
+        """
+        Inserts the users and their profiles in batches, skipping the model
+        save so a million rows are created in minutes
+        """
+        self.stdout.write("Creating benchmark users and profiles")
+        offset: int = self.get_benchmark_users().count()
+        password: str = make_password("password")
+        randomizer: random.Random = random.Random(offset)
+        for start in progress(0, instances_number, batch_size):
+            end: int = min(start + batch_size, instances_number)
+            users: list = [
+                self.build_user(offset + index, password, randomizer)
+                for index in range(start, end)
+            ]
+            User.objects.bulk_create(users)
+            users = list(
+                self.get_benchmark_users().filter(
+                    email__in=[user.email for user in users]
+                )
+            )
+            Profile.objects.bulk_create(
+                [self.build_profile(user, randomizer) for user in users]
+            )
+        self.stdout.write("Benchmark users and profiles created")
+
+    def build_user(
+        self, index: int, password: str, randomizer: random.Random
+    ) -> User:
+        return User(
+            email=f"benchmark{index}@{EMAIL_DOMAIN}",
+            first_name="Benchmark",
+            last_name=str(index),
+            password=password,
+            is_verified=randomizer.random() < 0.8,
+            is_premium=randomizer.random() < 0.1,
+        )
+
+    def build_profile(self, user: User, randomizer: random.Random) -> Profile:
+        age_in_days: int = randomizer.randint(0, 90 * 365)
+        return Profile(
+            user=user,
+            gender=randomizer.choice(GenderChoices.values),
+            preferred_language=randomizer.choice(
+                PreferredLanguageChoices.values
+            ),
+            birth_date=date.today() - timedelta(days=age_in_days),
+        )
+
+    def benchmark(self, repeat: int) -> None:
+        users: QuerySet = User.objects.order_by("-created_at")
+        profiles: QuerySet = Profile.objects.order_by("-created_at")
+        for name, data in USER_FILTERS.items():
+            data = self.get_user_filter_data(data)
+            queryset: QuerySet = UserFilter(data, users).qs
+            self.benchmark_queryset(name, queryset, repeat)
+        for name, data in PROFILE_FILTERS.items():
+            queryset: QuerySet = ProfileFilter(data, profiles).qs
+            self.benchmark_queryset(name, queryset, repeat)
+
+    def get_user_filter_data(self, data: dict) -> dict:
+        data = data.copy()
+        days: int = data.pop("days", None)
+        if days:
+            created_after: date = date.today() - timedelta(days=days)
+            data["created_at_after"] = f"{created_after.isoformat()}T00:00"
+        return data
+
+    def benchmark_queryset(
+        self, name: str, queryset: QuerySet, repeat: int
+    ) -> None:
+        page_time: float = self.measure(
+            lambda: list(queryset[:PAGE_SIZE]), repeat
+        )
+        count_time: float = self.measure(queryset.count, repeat)
+        self.stdout.write(
+            f"{name}: page {page_time:.2f} ms, count {count_time:.2f} ms"
+        )
+
+    def measure(self, query: Callable, repeat: int) -> float:
+        timings: list = []
+        for _ in range(max(repeat, 1)):
+            start: float = time.perf_counter()
+            query()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def clean(self) -> None:
+        self.stdout.write("Deleting benchmark users and profiles")
+        self.get_benchmark_users().delete()
+        self.stdout.write("Benchmark users and profiles deleted")
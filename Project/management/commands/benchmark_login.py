@@ -0,0 +1,109 @@
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging import Logger
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from django.db import connection
+
+from Users.hashing import HashingBusy
+from Users.models import User
+from Users.serializers import UserLoginSerializer
+
+
+logger: Logger = logging.getLogger(__name__)
+
+EMAIL: str = "login@benchmark.com"
+PASSWORD: str = "benchmark password 123"
+
+
+class Command(BaseCommand):
+
+    help: str = "Benchmarks the login throughput with concurrent clients"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("-l", "--logins", type=int, default=200)
+        parser.add_argument("-c", "--concurrency", type=int, default=8)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        if settings.ENVIRONMENT_NAME not in ["dev", "local", "test"]:
+            logger.critical(
+                "This command creates fake data do NOT run this in"
+                + " production environments"
+            )
+            return
+        self.create_user()
+        try:
+            self.benchmark(options["logins"], max(options["concurrency"], 1))
+        finally:
+            User.objects.filter(email=EMAIL).delete()
+
+    def create_user(self) -> None:
+        User.objects.filter(email=EMAIL).delete()
+        User.objects.create_user(
+            email=EMAIL,
+            password=PASSWORD,
+            first_name="Benchmark",
+            last_name="Login",
+            is_verified=True,
+        )
+
+    def benchmark(self, logins: int, concurrency: int) -> None:
+        """
+        Every client logs in its share of the logins one after the other,
+        the throttled logins are counted apart from the timings
+        """
+        shares: list = [
+            logins // concurrency + (index < logins % concurrency)
+            for index in range(concurrency)
+        ]
+        start: float = time.perf_counter()
+        if concurrency == 1:
+            results: list = [self.run_client(logins)]
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results: list = list(
+                    executor.map(self.run_threaded_client, shares)
+                )
+        elapsed: float = time.perf_counter() - start
+        timings: list = [timing for result in results for timing in result[0]]
+        throttled: int = sum(result[1] for result in results)
+        self.stdout.write(
+            f"logins: {len(timings)} ok, {throttled} throttled, "
+            f"{len(timings) / elapsed:.2f} per second"
+        )
+        if timings:
+            self.stdout.write(
+                f"latency: median {statistics.median(timings):.2f} ms, "
+                f"max {max(timings):.2f} ms"
+            )
+
+    def run_client(self, logins: int) -> tuple:
+        timings: list = []
+        throttled: int = 0
+        for _ in range(logins):
+            start: float = time.perf_counter()
+            try:
+                self.login()
+            except HashingBusy:
+                throttled += 1
+                continue
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings, throttled
+
+    def run_threaded_client(self, logins: int) -> tuple:
+        try:
+            return self.run_client(logins)
+        finally:
+            # Every client thread opens its own database connection
+            connection.close()
+
+    def login(self) -> None:
+        serializer: UserLoginSerializer = UserLoginSerializer(
+            data={"email": EMAIL, "password": PASSWORD}
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from Users.bloom import email_filter
+from Users.bloom import normalize_email
+from Users.models import User
+
+
+class Command(BaseCommand):
+
+    help: str = "Builds the bloom filter of the taken emails"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("-b", "--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "-r",
+            "--reset",
+            action="store_true",
+            help="Clears the filter first, dropping the deleted emails",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        if not settings.EMAIL_FILTER_ENABLED:
+            self.stdout.write("The email filter is disabled")
+            return
+        # The availability checks use the database until it is built
+        email_filter.start_build(options["reset"])
+        emails: object = User.objects.values_list("email", flat=True)
+        batch: list = []
+        added: int = 0
+        for email in emails.iterator(chunk_size=options["batch_size"]):
+            batch.append(normalize_email(email))
+            if len(batch) == options["batch_size"]:
+                email_filter.add_many(batch)
+                added += len(batch)
+                batch = []
+        if batch:
+            email_filter.add_many(batch)
+            added += len(batch)
+        email_filter.finish_build()
+        self.stdout.write(f"{added} emails added to the email filter")
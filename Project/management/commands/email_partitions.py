@@ -0,0 +1,64 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+from django.utils import timezone
+
+from Emails.archive import get_retention_cutoff
+from Emails.partitions import PartitioningError
+from Emails.partitions import add_partitions
+from Emails.partitions import drop_partitions
+from Emails.partitions import get_month
+from Emails.partitions import is_partitioning_supported
+from Emails.partitions import setup_partitions
+
+
+SETUP: str = "setup"
+ADD: str = "add"
+DROP: str = "drop"
+
+
+class Command(BaseCommand):
+
+    help: str = "Manages the monthly partitions of the emails table"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("action", choices=[SETUP, ADD, DROP])
+        parser.add_argument(
+            "-m",
+            "--months",
+            type=int,
+            default=settings.EMAIL_PARTITION_MONTHS_AHEAD,
+            help="Months ahead that must have a partition",
+        )
+        parser.add_argument(
+            "-b",
+            "--before",
+            type=date.fromisoformat,
+            default=None,
+            help="Drops the partitions older than this date month",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        if not is_partitioning_supported():
+            self.stdout.write("Partitioning is only supported on MySQL")
+            return
+        try:
+            statements: list = self.run_action(options)
+        except PartitioningError as error:
+            raise CommandError(str(error))
+        for statement in statements:
+            self.stdout.write(statement)
+        self.stdout.write(f"{len(statements)} statements executed")
+
+    def run_action(self, options: dict) -> list:
+        if options["action"] == SETUP:
+            return setup_partitions(options["months"])
+        if options["action"] == ADD:
+            return add_partitions(options["months"])
+        before: date = options["before"] or get_retention_cutoff().date()
+        if before > timezone.now().date():
+            before = timezone.now().date()
+        return drop_partitions(get_month(before))
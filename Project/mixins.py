@@ -0,0 +1,421 @@
+import calendar
+import json
+from datetime import datetime
+from typing import Iterator
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Expression
+from django.db.models import F
+from django.db.models import Field
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.mixins import ListModelMixin
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from Project.pagination import KeysetResultsSetPagination
+from Project.pagination import get_keyset_filter
+from Project.pagination import get_keyset_values
+from Project.utils.request_cache import forget_cached_object
+
+
+PRECONDITION_FAILED: int = status.HTTP_412_PRECONDITION_FAILED
+JSON_STREAM: str = "json"
+NDJSON_STREAM: str = "ndjson"
+STREAM_CONTENT_TYPES: dict = {
+    JSON_STREAM: "application/json",
+    NDJSON_STREAM: "application/x-ndjson",
+}
+
+
+class SerializerRelationsMixin:
+    """
+    Viewset mixin that loads the relations declared by the serializer on
+    its Meta select_related_fields and prefetch_related_fields, so the
+    serializer does not query once per instance
+    """
+
+    def get_serializer_meta(self) -> type or None:
+        return getattr(self.get_serializer_class(), "Meta", None)
+
+    def get_select_related_fields(self) -> tuple:
+        return getattr(self.get_serializer_meta(), "select_related_fields", ())
+
+    def get_prefetch_related_fields(self) -> tuple:
+        return getattr(
+            self.get_serializer_meta(), "prefetch_related_fields", ()
+        )
+
+    def get_queryset(self) -> QuerySet:
+        queryset: QuerySet = super().get_queryset()
+        select_related_fields: tuple = self.get_select_related_fields()
+        prefetch_related_fields: tuple = self.get_prefetch_related_fields()
+        if select_related_fields:
+            queryset = queryset.select_related(*select_related_fields)
+        if prefetch_related_fields:
+            queryset = queryset.prefetch_related(*prefetch_related_fields)
+        return queryset
+
+
+class SparseFieldsMixin(SerializerRelationsMixin):
+    """
+    Viewset mixin that serializes only the fields named on the fields query
+    parameter and not on the exclude one, both comma separated, on the read
+    requests, unknown names are rejected with a 400. The serializers apply
+    it with SparseFieldsSerializerMixin, and the lists do not select the
+    columns and relations that only the dropped fields read. Serializers
+    can name the columns of the fields that are not model fields on their
+    Meta sparse_field_sources.
+    """
+
+    sparse_fields_query_param: str = "fields"
+    sparse_exclude_query_param: str = "exclude"
+    sparse_queryset_actions: list = ["list"]
+
+    def get_query_param_names(self, name: str) -> set or None:
+        value: str = self.request.query_params.get(name)
+        if value is None:
+            return None
+        return {field.strip() for field in value.split(",") if field.strip()}
+
+    @cached_property
+    def sparse_fields(self) -> set or None:
+        """
+        The names of the fields to serialize, None serializes all of them
+        """
+        request: HttpRequest = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        fields: set = self.get_query_param_names(
+            self.sparse_fields_query_param
+        )
+        exclude: set = self.get_query_param_names(
+            self.sparse_exclude_query_param
+        )
+        if fields is None and not exclude:
+            return None
+        names: set = set(self.get_serializer_class()().fields)
+        self.validate_sparse_names(
+            self.sparse_fields_query_param, fields, names
+        )
+        self.validate_sparse_names(
+            self.sparse_exclude_query_param, exclude, names
+        )
+        return {
+            name
+            for name in names
+            if (fields is None or name in fields)
+            and name not in (exclude or ())
+        }
+
+    def validate_sparse_names(
+        self, query_param: str, requested: set or None, names: set
+    ) -> None:
+        unknown: list = sorted((requested or set()) - names)
+        if unknown:
+            raise ValidationError(
+                {query_param: [f"Unknown fields: {', '.join(unknown)}."]}
+            )
+
+    def get_sparse_data(self, data: dict) -> dict:
+        if self.sparse_fields is None:
+            return data
+        return {
+            name: value
+            for name, value in data.items()
+            if name in self.sparse_fields
+        }
+
+    def get_serializer_context(self) -> dict:
+        context: dict = super().get_serializer_context()
+        context["sparse_fields"] = self.sparse_fields
+        return context
+
+    def is_sparse_queryset(self) -> bool:
+        # Other actions cache the whole instance, so they load every column
+        return (
+            self.action in self.sparse_queryset_actions
+            and self.sparse_fields is not None
+        )
+
+    def filter_sparse_relations(self, relations: tuple) -> tuple:
+        if not self.is_sparse_queryset():
+            return relations
+        return tuple(
+            relation
+            for relation in relations
+            if relation.split("__")[0] in self.sparse_fields
+        )
+
+    def get_select_related_fields(self) -> tuple:
+        return self.filter_sparse_relations(
+            super().get_select_related_fields()
+        )
+
+    def get_prefetch_related_fields(self) -> tuple:
+        return self.filter_sparse_relations(
+            super().get_prefetch_related_fields()
+        )
+
+    def get_field_columns(self, name: str, field: Field) -> set:
+        model: type = self.queryset.model
+        sources: dict = getattr(
+            self.get_serializer_meta(), "sparse_field_sources", {}
+        )
+        if name in sources:
+            return set(sources[name])
+        source: str = field.source.split(".")[0]
+        try:
+            model_field: Field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return set()
+        return {source} if model_field.concrete else set()
+
+    def get_deferred_columns(self) -> list:
+        fields: dict = self.get_serializer_class()().fields
+        deferred_columns: set = set()
+        kept_columns: set = {self.queryset.model._meta.pk.name}
+        # The pagination and the streaming read the ordering values
+        for ordering_field in getattr(
+            self, "pagination_ordering", KeysetResultsSetPagination.ordering
+        ):
+            kept_columns.add(ordering_field.lstrip("-"))
+        for name, field in fields.items():
+            columns: set = self.get_field_columns(name, field)
+            if name in self.sparse_fields:
+                kept_columns |= columns
+            else:
+                deferred_columns |= columns
+        return sorted(deferred_columns - kept_columns)
+
+    def get_queryset(self) -> QuerySet:
+        queryset: QuerySet = super().get_queryset()
+        if self.is_sparse_queryset():
+            deferred_columns: list = self.get_deferred_columns()
+            if deferred_columns:
+                queryset = queryset.defer(*deferred_columns)
+        return queryset
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Serializer mixin that drops the fields left out by the sparse_fields of
+    its context, set by SparseFieldsMixin
+    """
+
+    def __init__(self, *args: tuple, **kwargs: dict) -> None:
+        super().__init__(*args, **kwargs)
+        sparse_fields: set = self.context.get("sparse_fields")
+        if isinstance(sparse_fields, set):
+            for name in list(self.fields):
+                if name not in sparse_fields:
+                    self.fields.pop(name)
+
+
+class StreamingListMixin(ListModelMixin):
+    """
+    List mixin that streams the whole list as JSON or NDJSON when the
+    request asks for it with stream=json or stream=ndjson. The queryset is
+    read and serialized in keyset chunks, so the memory does not grow with
+    the number of results.
+    """
+
+    stream_query_param: str = "stream"
+
+    def list(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> Response or StreamingHttpResponse:
+        stream_format: str = request.query_params.get(self.stream_query_param)
+        if stream_format in STREAM_CONTENT_TYPES:
+            return self.get_streaming_response(stream_format)
+        return super().list(request, *args, **kwargs)
+
+    def get_streaming_response(
+        self, stream_format: str
+    ) -> StreamingHttpResponse:
+        queryset: QuerySet = self.filter_queryset(self.get_queryset())
+        serialized_items: Iterator = self.serialize_chunks(queryset)
+        if stream_format == NDJSON_STREAM:
+            content: Iterator = self.stream_ndjson(serialized_items)
+        else:
+            content: Iterator = self.stream_json(serialized_items)
+        return StreamingHttpResponse(
+            content, content_type=STREAM_CONTENT_TYPES[stream_format]
+        )
+
+    def get_stream_ordering(self) -> tuple:
+        return getattr(
+            self, "pagination_ordering", KeysetResultsSetPagination.ordering
+        )
+
+    def iterate_chunks(self, queryset: QuerySet) -> Iterator[list]:
+        ordering: tuple = self.get_stream_ordering()
+        queryset = queryset.order_by(*ordering)
+        chunk_size: int = settings.STREAMING_CHUNK_SIZE
+        chunk: list = list(queryset[:chunk_size])
+        while chunk:
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last_values: list = get_keyset_values(chunk[-1], ordering)
+            chunk = list(
+                queryset.filter(get_keyset_filter(ordering, last_values))[
+                    :chunk_size
+                ]
+            )
+
+    def serialize_chunks(self, queryset: QuerySet) -> Iterator[bytes]:
+        for chunk in self.iterate_chunks(queryset):
+            for item in self.get_serializer(chunk, many=True).data:
+                yield json.dumps(item, cls=JSONEncoder).encode()
+
+    def stream_json(self, items: Iterator[bytes]) -> Iterator[bytes]:
+        yield b"["
+        for index, item in enumerate(items):
+            yield item if index == 0 else b"," + item
+        yield b"]"
+
+    def stream_ndjson(self, items: Iterator[bytes]) -> Iterator[bytes]:
+        for item in items:
+            yield item + b"\n"
+
+
+class ConditionalRequestMixin:
+    """
+    Detail viewset mixin that sets the ETag and Last-Modified headers from
+    the instance version field. Retrieves answer 304 before serializing when
+    the client copy is current, and updates with a stale If-Match answer
+    412. The If-Match version is claimed with a conditional UPDATE, so two
+    updates sent with the same ETag can not both succeed and no row is
+    locked.
+    """
+
+    version_field: str = "updated_at"
+
+    def get_lookup_filter(self) -> dict:
+        lookup_url_kwarg: str = self.lookup_url_kwarg or self.lookup_field
+        return {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+    def get_version_expression(self) -> Expression:
+        # Views that serve related rows version them together
+        return F(self.version_field)
+
+    def get_current_version(self) -> datetime or None:
+        # Only the version columns are read, not the whole row
+        return (
+            self.queryset.model._base_manager.filter(
+                **self.get_lookup_filter()
+            )
+            .annotate(current_version=self.get_version_expression())
+            .values_list("current_version", flat=True)
+            .first()
+        )
+
+    def get_object_version(self) -> datetime or None:
+        return self.get_current_version()
+
+    def get_updated_version(self) -> datetime or None:
+        return self.get_object_version()
+
+    def get_validator_version(self, version: datetime) -> datetime:
+        # Views whose data changes without a save serve a newer version
+        return version
+
+    def get_conditional_response(
+        self, request: HttpRequest, version: datetime or None
+    ) -> HttpResponse or None:
+        if version is None:
+            return get_conditional_response(request)
+        version = self.get_validator_version(version)
+        return get_conditional_response(
+            request,
+            etag=get_etag(version),
+            last_modified=calendar.timegm(version.utctimetuple()),
+        )
+
+    def set_validators(
+        self, response: HttpResponse, version: datetime or None
+    ) -> HttpResponse:
+        is_valid_response: bool = 200 <= response.status_code < 300
+        if version and (is_valid_response or response.status_code == 304):
+            version = self.get_validator_version(version)
+            response["ETag"] = get_etag(version)
+            response["Last-Modified"] = http_date(
+                calendar.timegm(version.utctimetuple())
+            )
+        return response
+
+    def claim_version(self, version: datetime) -> bool:
+        claimed: int = (
+            self.queryset.model._base_manager.filter(
+                **self.get_lookup_filter()
+            )
+            .annotate(current_version=self.get_version_expression())
+            .filter(current_version=version)
+            .update(**{self.version_field: timezone.now()})
+        )
+        if claimed:
+            # The instance loaded before the claim holds the previous version
+            lookup_url_kwarg: str = self.lookup_url_kwarg or self.lookup_field
+            forget_cached_object(
+                self.request,
+                self.queryset.model,
+                self.kwargs[lookup_url_kwarg],
+            )
+        return claimed == 1
+
+    def retrieve(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        version: datetime = self.get_object_version()
+        response: HttpResponse = self.get_conditional_response(
+            request, version
+        )
+        if response is None:
+            response = self.get_retrieve_response(request, *args, **kwargs)
+        return self.set_validators(response, version)
+
+    def get_retrieve_response(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        return super().retrieve(request, *args, **kwargs)
+
+    def update(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        with transaction.atomic():
+            version: datetime = self.get_current_version()
+            response: HttpResponse = self.get_conditional_response(
+                request, version
+            )
+            has_if_match: bool = "HTTP_IF_MATCH" in request.META
+            if response is None and has_if_match and version:
+                if not self.claim_version(version):
+                    # Another update claimed the same version first
+                    response = Response(status=PRECONDITION_FAILED)
+            if response is not None:
+                return self.set_validators(response, version)
+            response = self.get_update_response(request, *args, **kwargs)
+        return self.set_validators(response, self.get_updated_version())
+
+    def get_update_response(
+        self, request: HttpRequest, *args: tuple, **kwargs: dict
+    ) -> HttpResponse:
+        return super().update(request, *args, **kwargs)
+
+
+def get_etag(version: datetime) -> str:
+    timestamp: int = calendar.timegm(version.utctimetuple())
+    return quote_etag(f"{timestamp}{version.microsecond:06d}")
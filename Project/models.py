@@ -0,0 +1,115 @@
+import copy
+
+from django.core.files import File
+from django.db.models import Field
+from django.db.models import Model
+from django.db.models.fields.files import FieldFile
+
+
+UNSAVED: object = object()
+MUTABLE_TYPES: tuple = (dict, list, set, bytearray)
+
+
+def get_loaded_value(value: object) -> object:
+    # Only the mutable values, like the JSONField ones, can change in place
+    if isinstance(value, MUTABLE_TYPES):
+        return copy.deepcopy(value)
+    return value
+
+
+class DirtyFieldsMixin(Model):
+    """
+    Model mixin that keeps the field values loaded from the database. Saves
+    of loaded instances only write the changed columns and the auto_now
+    ones, and saves without changes skip the UPDATE and its signals.
+    """
+
+    class Meta:
+        abstract: bool = True
+
+    def __init__(self, *args: tuple, **kwargs: dict) -> None:
+        super().__init__(*args, **kwargs)
+        self.loaded_values: dict = {}
+
+    @classmethod
+    def from_db(cls, db: str, field_names: list, values: list) -> Model:
+        instance: Model = super().from_db(db, field_names, values)
+        instance.store_loaded_values()
+        return instance
+
+    def refresh_from_db(self, using: str = None, fields: list = None) -> None:
+        super().refresh_from_db(using, fields)
+        self.store_loaded_values(fields)
+
+    def get_loaded_fields(self, names: list = None) -> list:
+        # The deferred fields are not in the instance dict until read
+        return [
+            field
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (names is None or {field.name, field.attname} & set(names))
+        ]
+
+    def store_loaded_values(self, names: list = None) -> None:
+        loaded_values: dict = {} if names is None else self.loaded_values
+        self.loaded_values = {
+            **loaded_values,
+            **{
+                field.attname: get_loaded_value(self.get_field_value(field))
+                for field in self.get_loaded_fields(names)
+            },
+        }
+
+    def get_field_value(self, field: Field) -> object:
+        value: object = self.__dict__[field.attname]
+        if isinstance(value, FieldFile) and value._committed:
+            return value.name
+        if isinstance(value, File):
+            # New files are always written
+            return UNSAVED
+        return value
+
+    def get_dirty_fields(self) -> list:
+        dirty_fields: list = []
+        for field in self.get_loaded_fields():
+            value: object = self.get_field_value(field)
+            loaded_value: object = self.loaded_values.get(
+                field.attname, UNSAVED
+            )
+            if value is UNSAVED or loaded_value is UNSAVED:
+                dirty_fields.append(field.name)
+            elif value != loaded_value:
+                dirty_fields.append(field.name)
+        return dirty_fields
+
+    def get_auto_now_fields(self) -> list:
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+
+    def is_default_save(self, args: tuple, kwargs: dict) -> bool:
+        # Inserts and explicit update fields are left to the default save
+        return bool(
+            self._state.adding
+            or args
+            or kwargs.get("force_insert")
+            or kwargs.get("update_fields") is not None
+        )
+
+    def save(self, *args: tuple, **kwargs: dict) -> None:
+        dirty_fields: list = []
+        if not self.is_default_save(args, kwargs):
+            dirty_fields = self.get_dirty_fields()
+            if not dirty_fields:
+                return
+        # A changed primary key saves a new row, every field is written
+        if dirty_fields and self._meta.pk.name not in dirty_fields:
+            kwargs["update_fields"] = dirty_fields + [
+                field
+                for field in self.get_auto_now_fields()
+                if field not in dirty_fields
+            ]
+        super().save(*args, **kwargs)
+        self.store_loaded_values(kwargs.get("update_fields"))
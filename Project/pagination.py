@@ -1,7 +1,244 @@
+import base64
+import json
+from datetime import datetime
+from datetime import time
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import View
+
+
+EXACT_COUNT: str = "exact"
+ESTIMATED_COUNT: str = "estimated"
+KEYSET_PAGINATION: str = "keyset"
+ESTIMATED_COUNT_QUERY: str = (
+    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+)
 
 
 class ListTenResultsSetPagination(PageNumberPagination):
     page_size: int = 10
     page_size_query_param: str = "page_size"
     max_page_size: int = 1000
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    Keeps the microseconds of the times, DjangoJSONEncoder cuts them to
+    milliseconds and the rows of the same millisecond would be skipped
+    """
+
+    def default(self, value: object) -> object:
+        if isinstance(value, (datetime, time)):
+            return value.isoformat()
+        return super().default(value)
+
+
+class KeysetResultsSetPagination(BasePagination):
+    """
+    Keyset pagination, the opaque cursor holds the ordering values of the
+    last result so pages are read from the index without OFFSET or COUNT.
+    Views can change the ordering with a pagination_ordering attribute, it
+    must end with an unique field.
+    """
+
+    page_size: int = 10
+    page_size_query_param: str = "page_size"
+    max_page_size: int = 1000
+    cursor_query_param: str = "cursor"
+    count_query_param: str = "count"
+    ordering: tuple = ("-created_at", "-id")
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: HttpRequest, view: View = None
+    ) -> list:
+        self.request: HttpRequest = request
+        self.ordering: tuple = getattr(
+            view, "pagination_ordering", self.ordering
+        )
+        self.count: int or None = self.get_count(queryset)
+        page_size: int = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor: list = self.decode_cursor(request, queryset)
+        if cursor:
+            queryset = queryset.filter(self.get_cursor_filter(cursor))
+        results: list = list(queryset[: page_size + 1])
+        self.has_next: bool = len(results) > page_size
+        self.page: list = results[:page_size]
+        return self.page
+
+    def get_paginated_response(self, data: list) -> Response:
+        response_data: dict = {"next": self.get_next_link(), "results": data}
+        if self.count is not None:
+            response_data = {"count": self.count, **response_data}
+        return Response(response_data)
+
+    def get_page_size(self, request: HttpRequest) -> int:
+        try:
+            page_size: int = int(
+                request.query_params[self.page_size_query_param]
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_count(self, queryset: QuerySet) -> int or None:
+        count_mode: str = self.request.query_params.get(self.count_query_param)
+        if count_mode == ESTIMATED_COUNT:
+            return get_estimated_count(queryset)
+        if count_mode == EXACT_COUNT:
+            return queryset.count()
+        return None
+
+    def get_next_link(self) -> str or None:
+        if not self.has_next:
+            return None
+        url: str = self.request.build_absolute_uri()
+        cursor: str = self.encode_cursor(self.page[-1])
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_ordering_fields(self) -> list:
+        return [field.lstrip("-") for field in self.ordering]
+
+    def encode_cursor(self, instance: object) -> str:
+        values: list = get_keyset_values(instance, self.ordering)
+        cursor: bytes = json.dumps(values, cls=CursorJSONEncoder).encode()
+        return base64.urlsafe_b64encode(cursor).decode()
+
+    def decode_cursor(self, request: HttpRequest, queryset: QuerySet) -> list:
+        encoded_cursor: str = request.query_params.get(self.cursor_query_param)
+        if not encoded_cursor:
+            return []
+        try:
+            values: list = json.loads(base64.urlsafe_b64decode(encoded_cursor))
+            fields: list = self.get_ordering_fields()
+            if len(values) != len(fields):
+                raise ValueError("Cursor does not match the ordering")
+            return [
+                queryset.model._meta.get_field(field).to_python(value)
+                for field, value in zip(fields, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound("Invalid cursor")
+
+    def get_cursor_filter(self, cursor: list) -> Q:
+        return get_keyset_filter(self.ordering, cursor)
+
+    def get_schema_operation_parameters(self, view: View) -> list:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Adds the exact or estimated results count.",
+                "schema": {
+                    "type": "string",
+                    "enum": [EXACT_COUNT, ESTIMATED_COUNT],
+                },
+            },
+        ]
+
+
+class SelectableResultsSetPagination(BasePagination):
+    """
+    Page number pagination by default, keyset pagination when the request
+    asks for it with pagination=keyset or sends a cursor
+    """
+
+    pagination_query_param: str = "pagination"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: HttpRequest, view: View = None
+    ) -> list:
+        self.paginator: BasePagination = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: list) -> Response:
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginator(self, request: HttpRequest) -> BasePagination:
+        keyset_paginator: KeysetResultsSetPagination = (
+            KeysetResultsSetPagination()
+        )
+        pagination: str = request.query_params.get(self.pagination_query_param)
+        has_cursor: bool = (
+            keyset_paginator.cursor_query_param in request.query_params
+        )
+        if pagination == KEYSET_PAGINATION or has_cursor:
+            return keyset_paginator
+        return ListTenResultsSetPagination()
+
+    def get_schema_operation_parameters(self, view: View) -> list:
+        return [
+            *ListTenResultsSetPagination().get_schema_operation_parameters(
+                view
+            ),
+            *KeysetResultsSetPagination().get_schema_operation_parameters(
+                view
+            ),
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Pagination mode, page number by default.",
+                "schema": {"type": "string", "enum": [KEYSET_PAGINATION]},
+            },
+        ]
+
+
+def get_keyset_values(instance: object, ordering: tuple) -> list:
+    return [getattr(instance, field.lstrip("-")) for field in ordering]
+
+
+def get_keyset_filter(ordering: tuple, values: list) -> Q:
+    """
+    Builds the row comparison (a, b) > (x, y) as
+    a > x OR (a = x AND b > y), with the direction of each field
+    """
+    keyset_filter: Q = Q()
+    equal_filter: Q = Q()
+    for ordering_field, value in zip(ordering, values):
+        field: str = ordering_field.lstrip("-")
+        lookup: str = "lt" if ordering_field.startswith("-") else "gt"
+        keyset_filter |= equal_filter & Q(**{f"{field}__{lookup}": value})
+        equal_filter &= Q(**{field: value})
+    return keyset_filter
+
+
+def get_estimated_count(queryset: QuerySet) -> int:
+    """
+    Reads the table statistics instead of counting when the whole table is
+    listed on MySQL, filtered querysets are counted
+    """
+    if connection.vendor != "mysql" or queryset.query.where:
+        return queryset.count()
+    with connection.cursor() as cursor:
+        cursor.execute(ESTIMATED_COUNT_QUERY, [queryset.model._meta.db_table])
+        row: tuple = cursor.fetchone()
+    return row[0] if row and row[0] is not None else queryset.count()
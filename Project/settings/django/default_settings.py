@@ -76,9 +76,26 @@ REST_FRAMEWORK: dict = {
         "django_filters.rest_framework.DjangoFilterBackend"
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication"
+        "Users.authentication.CachedJWTAuthentication"
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Clients are identified by REMOTE_ADDR, X-Forwarded-For can be spoofed.
+    # Set to the number of trusted proxies when deployed behind them.
+    "NUM_PROXIES": 0,
+    # Sliding window rates of the throttled views, by IP and by account
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "30/min",
+        "login_account": "10/min",
+        "token_ip": "30/min",
+        "token_account": "10/min",
+        "signup_ip": "20/hour",
+        "signup_account": "5/hour",
+        "password_reset_ip": "20/hour",
+        "password_reset_account": "5/hour",
+        "suggestion_ip": "60/hour",
+        "suggestion_account": "20/hour",
+        "email_available_ip": "120/min",
+    },
 }
 
 SPECTACULAR_SETTINGS: dict = {
@@ -97,14 +114,63 @@ WSGI_APPLICATION: str = "Project.wsgi.application"
 
 CACHES: dict = {
     "default": {
-        "BACKEND": "redis_cache.RedisCache",
+        "BACKEND": "Project.cache.TwoTierCache",
         "LOCATION": "redis:6379",
+        "TIMEOUT": 300,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "REMOTE_BACKEND": "redis_cache.RedisCache",
+            "LOCAL_MAX_SIZE": 10000,
+            "LOCAL_TIMEOUT": 5.0,
+            "EARLY_REFRESH_BETA": 1.0,
+            "LOCK_TIMEOUT": 10.0,
         },
-    }
+    },
+    # Shared by every process without a local tier, for the values that
+    # must not be served stale after a write
+    "remote": {
+        "BACKEND": "redis_cache.RedisCache",
+        "LOCATION": "redis:6379",
+        "TIMEOUT": 300,
+    },
 }
 
+REDIS_URL: str = "redis://redis:6379/0"
+
+# Streaming list responses settings
+STREAMING_CHUNK_SIZE: int = 500
+
+# Authenticated user cache settings
+USER_CACHE_ALIAS: str = "default"
+USER_CACHE_TIMEOUT: int = 300
+
+# Cached user and profile representations settings, their ETags must
+# change on every process right after a write
+REPRESENTATION_CACHE_ALIAS: str = "remote"
+REPRESENTATION_CACHE_TIMEOUT: int = 3600
+
+# Batch retrieve endpoints settings
+BATCH_RETRIEVE_MAX_IDS: int = 100
+
+# Throttling settings, the counters are stored on REDIS_URL
+THROTTLING_ENABLED: bool = True
+
+# Bloom filter of the taken emails, stored on REDIS_URL
+EMAIL_FILTER_ENABLED: bool = True
+EMAIL_FILTER_KEY: str = "users:email_filter"
+EMAIL_FILTER_SIZE: int = 2**24
+EMAIL_FILTER_HASHES: int = 7
+
+# Requests each server process serves at once, the threads of its workers
+SERVER_THREADS: int = 32
+
+# Password hashing pool settings, the pool must hold fewer hashes than the
+# server threads or a process never fills it and never rejects a hash
+PASSWORD_HASHING_WORKERS: int = max(
+    min(os.cpu_count() or 1, SERVER_THREADS // 4), 1
+)
+PASSWORD_HASHING_QUEUE_SIZE: int = PASSWORD_HASHING_WORKERS
+PASSWORD_HASHING_RETRY_AFTER: int = 1
+
 LOGGING: dict = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -191,6 +257,28 @@ CELERY_TIMEZONE: str = TIME_ZONE
 CELERY_TASK_TRACK_STARTED: bool = True
 CELERY_TASK_TIME_LIMIT: int = 30 * 60
 
+# Server-sent events settings
+EVENTS_ENABLED: bool = True
+EVENTS_PATH: str = "/api/events/"
+EVENTS_CHANNEL_PREFIX: str = "events:user:"
+EVENTS_QUEUE_SIZE: int = 100
+EVENTS_KEEPALIVE_SECONDS: float = 15.0
+EVENTS_RECONNECT_SECONDS: float = 1.0
+
+# Email tracking settings
+EMAIL_TRACKING_FLUSH_CHUNK_SIZE: int = 500
+EMAIL_TRACKING_FLUSH_LOCK_TIMEOUT: int = 600
+
+# Email retention settings
+EMAIL_RETENTION_DAYS: int = 90
+EMAIL_ARCHIVE_CHUNK_SIZE: int = 500
+EMAIL_ARCHIVE_MAX_CHUNKS: int = 200
+EMAIL_ARCHIVE_PAUSE_SECONDS: float = 0.5
+
+# Email partitioning settings
+EMAIL_PARTITION_MONTHS_AHEAD: int = 3
+EMAIL_DISPATCH_LOOKBACK_DAYS: int = 7
+
 # Suggestion email settings
 SUGGESTIONS_EMAIL: str = ""
 SUGGESTIONS_EMAIL_HEADER: str = "from user with id:"
@@ -6,3 +6,21 @@ ENVIRONMENT_NAME: str = "test"
 STATICFILES_DIRS: tuple = ()
 PROJECT_DIR: str = Path(__file__).resolve().parent.parent.parent
 STATIC_ROOT: str = os.path.join(PROJECT_DIR, "media")
+
+CACHES: dict = {
+    "default": {
+        "BACKEND": "Project.cache.TwoTierCache",
+        "OPTIONS": {
+            "REMOTE_BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    },
+    "remote": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "remote",
+    },
+}
+
+EVENTS_ENABLED: bool = False
+THROTTLING_ENABLED: bool = False
+EMAIL_FILTER_ENABLED: bool = False
+EMAIL_ARCHIVE_PAUSE_SECONDS: float = 0.0
@@ -0,0 +1,151 @@
+import time
+from uuid import uuid4
+
+from mock import MagicMock
+from mock import patch
+
+from Project.cache import CachedValue
+from Project.cache import TwoTierCache
+from Project.utils.metrics_common import Metrics
+
+
+REMOTE_BACKEND: str = "django.core.cache.backends.locmem.LocMemCache"
+
+
+def get_cache(**options: dict) -> TwoTierCache:
+    options = {"REMOTE_BACKEND": REMOTE_BACKEND, **options}
+    return TwoTierCache(str(uuid4()), {"TIMEOUT": 60, "OPTIONS": options})
+
+
+def get_local_hits() -> float:
+    return Metrics.cache_hits.labels("local")._value.get()
+
+
+class TestTwoTierCache:
+    def test_set_stores_the_value_on_both_tiers(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("key", "value")
+        assert cache.remote.get("key") == "value"
+        assert len(cache.local) == 1
+        assert cache.get("key") == "value"
+
+    def test_local_tier_serves_without_the_remote(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("key", "value")
+        cache.remote.delete("key")
+        local_hits: float = get_local_hits()
+        assert cache.get("key") == "value"
+        assert get_local_hits() == local_hits + 1
+
+    def test_remote_tier_fills_the_local_tier(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.remote.set("key", "value")
+        assert cache.get("key") == "value"
+        cache.remote.delete("key")
+        assert cache.get("key") == "value"
+
+    def test_local_tier_expires_before_the_remote(self) -> None:
+        cache: TwoTierCache = get_cache(LOCAL_TIMEOUT=0)
+        cache.set("key", "value")
+        assert len(cache.local) == 0
+        assert cache.get("key") == "value"
+
+    def test_local_copies_are_not_shared(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("key", {"name": "value"})
+        cache.get("key")["name"] = "changed"
+        assert cache.get("key") == {"name": "value"}
+
+    def test_delete_removes_the_value_from_both_tiers(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("key", "value")
+        cache.delete("key")
+        assert cache.get("key") is None
+        assert cache.remote.get("key") is None
+
+    def test_missing_key_counts_a_miss(self) -> None:
+        cache: TwoTierCache = get_cache()
+        misses: float = Metrics.cache_misses._value.get()
+        assert cache.get("key", "default") == "default"
+        assert Metrics.cache_misses._value.get() == misses + 1
+
+    def test_incr_invalidates_the_local_copy(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("counter", 1)
+        assert cache.incr("counter") == 2
+        assert cache.get("counter") == 2
+
+    def test_get_many_reads_both_tiers(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("local", 1)
+        cache.remote.set("remote", 2)
+        values: dict = cache.get_many(["local", "remote", "missing"])
+        assert values == {"local": 1, "remote": 2}
+
+    def test_set_many_and_delete_many(self) -> None:
+        cache: TwoTierCache = get_cache()
+        assert cache.set_many({"first": 1, "second": 2}) == []
+        assert cache.get_many(["first", "second"]) == {"first": 1, "second": 2}
+        cache.delete_many(["first", "second"])
+        assert cache.get_many(["first", "second"]) == {}
+
+    def test_add_does_not_replace_the_value(self) -> None:
+        cache: TwoTierCache = get_cache()
+        assert cache.add("key", "value") is True
+        assert cache.add("key", "other value") is False
+        assert cache.get("key") == "value"
+
+    def test_clear_empties_both_tiers(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("key", "value")
+        cache.clear()
+        assert len(cache.local) == 0
+        assert cache.has_key("key") is False
+
+
+class TestTwoTierCacheGetOrSet:
+    def test_value_is_computed_once(self) -> None:
+        cache: TwoTierCache = get_cache()
+        compute: MagicMock = MagicMock(return_value="value")
+        assert cache.get_or_set("key", compute) == "value"
+        assert cache.get_or_set("key", compute) == "value"
+        assert cache.get("key") == "value"
+        compute.assert_called_once()
+
+    def test_value_far_from_expiring_is_not_refreshed(self) -> None:
+        cache: TwoTierCache = get_cache()
+        entry: CachedValue = CachedValue("value", 0.01, time.time() + 3600)
+        assert cache.is_refresh_due(entry) is False
+
+    def test_value_close_to_expiring_is_refreshed(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("key", CachedValue("old value", 10**6, time.time() + 1))
+        assert cache.get_or_set("key", lambda: "new value") == "new value"
+        assert cache.get("key") == "new value"
+
+    def test_stale_value_is_served_while_another_caller_refreshes(
+        self,
+    ) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.set("key", CachedValue("old value", 10**6, time.time() + 1))
+        cache.acquire_lock("key")
+        compute: MagicMock = MagicMock(return_value="new value")
+        assert cache.get_or_set("key", compute) == "old value"
+        compute.assert_not_called()
+
+    def test_miss_waits_for_the_caller_computing_it(self) -> None:
+        cache: TwoTierCache = get_cache()
+        cache.acquire_lock("key")
+        compute: MagicMock = MagicMock(return_value="other value")
+
+        def finish_computing(seconds: float) -> None:
+            cache.remote.set("key", CachedValue("value", 0.01, None))
+
+        with patch("Project.cache.time.sleep", side_effect=finish_computing):
+            assert cache.get_or_set("key", compute) == "value"
+        compute.assert_not_called()
+
+    def test_miss_is_computed_when_the_lock_is_not_released(self) -> None:
+        cache: TwoTierCache = get_cache(LOCK_TIMEOUT=0)
+        cache.acquire_lock("key")
+        assert cache.get_or_set("key", lambda: "value") == "value"
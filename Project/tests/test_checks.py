@@ -0,0 +1,81 @@
+from django.db.models import QuerySet
+from django_filters import rest_framework as filters
+from rest_framework import viewsets
+
+from Emails.views import SuggestionViewSet
+from Project.checks import check_password_hashing_pool
+from Project.checks import check_viewset
+from Project.checks import check_viewset_indexes
+from Project.checks import get_viewsets
+from Project.urls import urlpatterns
+from Users.models import User
+from Users.views import ProfileViewSet
+from Users.views import UserViewSet
+
+
+class UnindexedFilter(filters.FilterSet):
+    last_name: filters.Filter = filters.CharFilter()
+    full_name: filters.Filter = filters.CharFilter(method="filter_full_name")
+
+    class Meta:
+        model: User = User
+        fields: list = ["last_name", "full_name"]
+
+    def filter_full_name(
+        self, queryset: QuerySet, name: str, value: str
+    ) -> QuerySet:
+        return queryset
+
+
+class TestViewsetIndexesCheck:
+    def test_project_viewsets_are_indexed(self) -> None:
+        assert check_viewset_indexes() == []
+
+    def test_get_viewsets_finds_the_routed_viewsets(self) -> None:
+        viewsets: list = get_viewsets(urlpatterns)
+        assert UserViewSet in viewsets
+        assert ProfileViewSet in viewsets
+        assert SuggestionViewSet in viewsets
+
+    def test_unindexed_ordering_is_reported(self) -> None:
+        class FirstNameViewSet(viewsets.GenericViewSet):
+            queryset: QuerySet = User.objects.order_by("first_name")
+
+        errors: list = check_viewset(FirstNameViewSet)
+        assert [error.id for error in errors] == ["Project.W001"]
+
+    def test_mixed_directions_ordering_is_reported(self) -> None:
+        class MixedViewSet(viewsets.GenericViewSet):
+            queryset: QuerySet = User.objects.order_by("-created_at", "id")
+
+        errors: list = check_viewset(MixedViewSet)
+        assert [error.id for error in errors] == ["Project.W001"]
+
+    def test_indexed_ordering_is_not_reported(self) -> None:
+        class CreatedViewSet(viewsets.GenericViewSet):
+            queryset: QuerySet = User.objects.order_by("created_at", "pk")
+
+        assert check_viewset(CreatedViewSet) == []
+
+    def test_unindexed_filter_is_reported(self) -> None:
+        class LastNameViewSet(viewsets.GenericViewSet):
+            queryset: QuerySet = User.objects.order_by("-id")
+            filterset_class: UnindexedFilter = UnindexedFilter
+
+        errors: list = check_viewset(LastNameViewSet)
+        assert [error.id for error in errors] == ["Project.W002"]
+        assert "last_name" in errors[0].msg
+
+
+class TestPasswordHashingPoolCheck:
+    def test_default_pool_is_smaller_than_the_server(self) -> None:
+        assert check_password_hashing_pool() == []
+
+    def test_pool_as_big_as_the_server_is_reported(
+        self, settings: object
+    ) -> None:
+        settings.SERVER_THREADS = 4
+        settings.PASSWORD_HASHING_WORKERS = 2
+        settings.PASSWORD_HASHING_QUEUE_SIZE = 2
+        errors: list = check_password_hashing_pool()
+        assert [error.id for error in errors] == ["Project.W003"]
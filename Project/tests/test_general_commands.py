@@ -1,18 +1,25 @@
+from io import StringIO
 from logging import Logger
 
 import pytest
 from django.core.management import call_command
 from django.test import override_settings
+from mock import patch
 
 from Emails.models.models import Email
 from Emails.models.models import Suggestion
+from Project.management.commands.benchmark_filters import (
+    Command as BenchmarkCommand,
+)
 from Project.management.commands.populate_db import Command as PopulateCommand
 from Users.factories.user import UserFactory
+from Users.hashing import HashingBusy
 from Users.models import Profile
 from Users.models import User
 
 
 COMMAND: str = "populate_db"
+LOGIN: str = "Project.management.commands.benchmark_login.Command.login"
 
 
 @pytest.mark.django_db
@@ -89,3 +96,92 @@ class TestPopulateCommand:
         assert Email.objects.all().count() == 5
         assert Profile.objects.all().count() == 5
         assert Suggestion.objects.all().count() == 5
+
+
+@pytest.mark.django_db
+class TestEmailPartitionsCommand:
+    def test_email_partitions_does_nothing_without_mysql(self) -> None:
+        output: StringIO = StringIO()
+        command: str = "Project.management.commands.email_partitions"
+        with patch(f"{command}.is_partitioning_supported", return_value=False):
+            with patch(f"{command}.setup_partitions") as setup:
+                call_command("email_partitions", "setup", stdout=output)
+        setup.assert_not_called()
+        assert "only supported on MySQL" in output.getvalue()
+
+    def test_email_partitions_runs_the_action(self) -> None:
+        output: StringIO = StringIO()
+        command: str = "Project.management.commands.email_partitions"
+        with patch(f"{command}.is_partitioning_supported", return_value=True):
+            with patch(f"{command}.add_partitions") as add:
+                add.return_value = ["ALTER TABLE"]
+                call_command(
+                    "email_partitions", "add", "-m", "2", stdout=output
+                )
+        add.assert_called_once_with(2)
+        assert "1 statements executed" in output.getvalue()
+
+
+@pytest.mark.django_db
+class TestBenchmarkFiltersCommand:
+    @override_settings(ENVIRONMENT_NAME="production")
+    def test_benchmark_filters_fails_on_non_dev_mode(
+        self, caplog: Logger
+    ) -> None:
+        caplog.clear()
+        call_command("benchmark_filters", "-i", "5")
+        message: str = (
+            "This command creates fake data do NOT run "
+            + "this in production environments"
+        )
+        assert [message] == [record.message for record in caplog.records]
+        assert User.objects.all().count() == 0
+
+    def test_populate_creates_users_with_profiles(self) -> None:
+        command: BenchmarkCommand = BenchmarkCommand()
+        command.populate(7, 3)
+        command.populate(2, 3)
+        assert command.get_benchmark_users().count() == 9
+        assert Profile.objects.all().count() == 9
+
+    def test_benchmark_filters_reports_every_filter(self) -> None:
+        output: StringIO = StringIO()
+        call_command(
+            "benchmark_filters", "-i", "10", "-r", "1", "-c", stdout=output
+        )
+        lines: list = output.getvalue().splitlines()
+        assert len([line for line in lines if " ms, count " in line]) == 8
+        assert User.objects.all().count() == 0
+
+
+@pytest.mark.django_db
+class TestBenchmarkLoginCommand:
+    @override_settings(ENVIRONMENT_NAME="production")
+    def test_benchmark_login_fails_on_non_dev_mode(
+        self, caplog: Logger
+    ) -> None:
+        caplog.clear()
+        call_command("benchmark_login", "-l", "2")
+        message: str = (
+            "This command creates fake data do NOT run "
+            + "this in production environments"
+        )
+        assert [message] == [record.message for record in caplog.records]
+        assert User.objects.all().count() == 0
+
+    def test_benchmark_login_reports_the_throughput(self) -> None:
+        output: StringIO = StringIO()
+        call_command("benchmark_login", "-l", "4", "-c", "1", stdout=output)
+        lines: list = output.getvalue().splitlines()
+        assert lines[0].startswith("logins: 4 ok, 0 throttled")
+        assert lines[1].startswith("latency: median")
+        assert User.objects.all().count() == 0
+
+    def test_benchmark_login_counts_the_rejected_hashes(self) -> None:
+        output: StringIO = StringIO()
+        with patch(LOGIN, side_effect=HashingBusy(wait=1)):
+            call_command(
+                "benchmark_login", "-l", "2", "-c", "1", stdout=output
+            )
+        assert output.getvalue().startswith("logins: 0 ok, 2 throttled")
+        assert User.objects.all().count() == 0
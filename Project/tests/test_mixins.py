@@ -0,0 +1,417 @@
+import json
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mock import MagicMock
+from mock import patch
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework.test import APIRequestFactory
+
+from Emails.serializers import SuggestionEmailSerializer
+from Emails.views import SuggestionViewSet
+from Project.mixins import get_etag
+from Project.utils.testing import assert_constant_query_count
+from Users.fakers.user import AdminFaker
+from Users.fakers.user import UserFaker
+from Users.fakers.user import VerifiedUserFaker
+from Users.models import Profile
+from Users.models import User
+from Users.models import get_adult_date
+from Users.models import get_birth_date_cutoff
+from Users.views import UserViewSet
+
+
+USERS_ENDPOINT: str = "/api/users"
+PROFILES_ENDPOINT: str = "/api/profiles"
+
+
+@pytest.fixture(scope="function")
+def client() -> APIClient:
+    return APIClient()
+
+
+def get_content(response: StreamingHttpResponse) -> bytes:
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+class TestStreamingListMixin:
+    def test_stream_json_list(self, client: APIClient) -> None:
+        users: list = [UserFaker() for _ in range(3)]
+        admin: User = AdminFaker()
+        client.force_authenticate(user=admin)
+        response: StreamingHttpResponse = client.get(
+            f"{USERS_ENDPOINT}/?stream=json"
+        )
+        assert response.status_code == 200
+        assert response.streaming is True
+        assert response["Content-Type"] == "application/json"
+        emails: list = [
+            user["email"] for user in json.loads(get_content(response))
+        ]
+        assert emails == [user.email for user in [admin, *reversed(users)]]
+
+    def test_stream_ndjson_list(self, client: APIClient) -> None:
+        VerifiedUserFaker()
+        client.force_authenticate(user=AdminFaker())
+        response: StreamingHttpResponse = client.get(
+            f"{PROFILES_ENDPOINT}/?stream=ndjson"
+        )
+        lines: list = get_content(response).splitlines()
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert len(lines) == 2
+        assert "is_adult" in json.loads(lines[0])
+
+    def test_stream_empty_list(self, client: APIClient) -> None:
+        client.force_authenticate(user=AdminFaker())
+        Profile.objects.all().delete()
+        response: StreamingHttpResponse = client.get(
+            f"{PROFILES_ENDPOINT}/?stream=json"
+        )
+        assert json.loads(get_content(response)) == []
+
+    def test_stream_reads_the_queryset_in_chunks(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        for _ in range(4):
+            UserFaker()
+        client.force_authenticate(user=AdminFaker())
+        with patch.object(settings, "STREAMING_CHUNK_SIZE", 2):
+            response: StreamingHttpResponse = client.get(
+                f"{USERS_ENDPOINT}/?stream=ndjson"
+            )
+            with django_assert_num_queries(3):
+                lines: list = get_content(response).splitlines()
+        assert len(lines) == 5
+
+    def test_paginated_list_is_kept_without_stream(
+        self, client: APIClient
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        response = client.get(f"{USERS_ENDPOINT}/?stream=xml")
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+
+
+@pytest.mark.django_db
+class TestSerializerRelationsMixin:
+    def test_serializer_relations_are_applied(self) -> None:
+        view: SuggestionViewSet = SuggestionViewSet()
+        view.action = "user"
+        view.request = MagicMock()
+        queryset = view.get_queryset()
+        assert queryset._prefetch_related_lookups == (
+            *SuggestionEmailSerializer.Meta.prefetch_related_fields,
+        )
+
+    def test_select_related_follows_the_action_serializer(self) -> None:
+        view: UserViewSet = UserViewSet()
+        view.action = "retrieve"
+        view.request = MagicMock()
+        assert view.get_queryset().query.select_related == {"profile": {}}
+        view.action = "list"
+        assert view.get_queryset().query.select_related is False
+
+
+@pytest.mark.django_db
+class TestSparseFieldsMixin:
+    def get_view(self, action: str, query: str) -> UserViewSet:
+        view: UserViewSet = UserViewSet()
+        view.action = action
+        view.request = Request(APIRequestFactory().get(f"/?{query}"))
+        return view
+
+    def test_fields_and_exclude_select_the_serialized_fields(self) -> None:
+        view: UserViewSet = self.get_view("list", "fields=email")
+        assert view.sparse_fields == {"email"}
+        view = self.get_view("list", "exclude=email,phone_number")
+        assert view.sparse_fields == {
+            "first_name",
+            "created_at",
+            "updated_at",
+        }
+        view = self.get_view("list", "fields=email,first_name&exclude=email")
+        assert view.sparse_fields == {"first_name"}
+        assert self.get_view("list", "").sparse_fields is None
+
+    def test_unknown_fields_are_rejected(self, client: APIClient) -> None:
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(
+            f"{USERS_ENDPOINT}/?fields=email,wrong,id"
+        )
+        assert response.status_code == 400
+        assert response.data == {"fields": ["Unknown fields: id, wrong."]}
+        response = client.get(f"{USERS_ENDPOINT}/?exclude=email,wrong")
+        assert response.status_code == 400
+        assert response.data == {"exclude": ["Unknown fields: wrong."]}
+
+    def test_writes_serialize_every_field(self) -> None:
+        view: UserViewSet = UserViewSet()
+        view.action = "update"
+        view.request = Request(APIRequestFactory().put("/?fields=email"))
+        assert view.sparse_fields is None
+
+    def test_dropped_columns_are_deferred_on_lists(self) -> None:
+        view: UserViewSet = self.get_view("list", "fields=email")
+        assert view.get_queryset().query.deferred_loading == (
+            {"phone_number", "first_name", "updated_at"},
+            True,
+        )
+        view = self.get_view("retrieve", "fields=email")
+        assert view.get_queryset().query.deferred_loading[0] == frozenset()
+
+    def test_dropped_relations_are_not_selected(self) -> None:
+        view: UserViewSet = self.get_view("retrieve", "fields=email")
+        view.sparse_queryset_actions = ["retrieve"]
+        assert view.get_queryset().query.select_related is False
+        view = self.get_view("retrieve", "fields=email,profile")
+        view.sparse_queryset_actions = ["retrieve"]
+        assert view.get_queryset().query.select_related == {"profile": {}}
+
+    def test_sparse_list_reads_only_the_kept_columns(
+        self, client: APIClient
+    ) -> None:
+        VerifiedUserFaker()
+        client.force_authenticate(user=AdminFaker())
+        with CaptureQueriesContext(connection) as context:
+            response: Response = client.get(
+                f"{PROFILES_ENDPOINT}/?fields=id,nickname"
+            )
+        assert response.status_code == 200
+        assert set(response.data["results"][0]) == {"id", "nickname"}
+        assert '"bio"' not in context.captured_queries[-1]["sql"]
+
+    def test_sparse_stream_and_retrieve(self, client: APIClient) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=AdminFaker())
+        response: StreamingHttpResponse = client.get(
+            f"{USERS_ENDPOINT}/?stream=json&exclude=phone_number,updated_at"
+        )
+        assert set(json.loads(get_content(response))[0]) == {
+            "first_name",
+            "email",
+            "created_at",
+        }
+        for _ in range(2):
+            response = client.get(
+                f"{USERS_ENDPOINT}/{user.id}/?fields=id,profile"
+            )
+            assert set(response.data) == {"id", "profile"}
+            assert "bio" in response.data["profile"]
+
+
+@pytest.mark.django_db
+class TestConstantQueryCountHelper:
+    def test_helper_fails_when_queries_grow(self) -> None:
+        created: list = []
+
+        def request() -> None:
+            for _ in created:
+                User.objects.exists()
+
+        with pytest.raises(AssertionError):
+            assert_constant_query_count(
+                request, lambda number: created.extend(range(number))
+            )
+
+
+@pytest.mark.django_db
+class TestConditionalRequestMixin:
+    def test_etag_changes_with_the_version(self) -> None:
+        version: datetime = timezone.now()
+        next_version: datetime = version + timedelta(microseconds=1)
+        assert get_etag(version) != get_etag(next_version)
+        assert get_etag(version).startswith('"')
+
+    def test_user_retrieve_sets_the_validators(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        response: Response = client.get(f"/api/users/{user.id}/")
+        assert response.status_code == 200
+        assert response["ETag"] == get_etag(user.updated_at)
+        assert "Last-Modified" in response
+
+    def test_user_retrieve_is_not_modified_without_queries(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        etag: str = client.get(f"/api/users/{user.id}/")["ETag"]
+        with django_assert_num_queries(0):
+            response: Response = client.get(
+                f"/api/users/{user.id}/", HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_profile_retrieve_is_not_modified_since_last_modified(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        url: str = f"/api/profiles/{user.profile.id}/"
+        last_modified: str = client.get(url)["Last-Modified"]
+        response: Response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == 304
+
+    def test_changed_profile_is_downloaded_again(
+        self, client: APIClient, django_capture_on_commit_callbacks: callable
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        url: str = f"/api/profiles/{user.profile.id}/"
+        etag: str = client.get(url)["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            user.profile.bio = "Changed bio"
+            user.profile.save()
+        response: Response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["bio"] == "Changed bio"
+        assert response["ETag"] != etag
+
+    @pytest.mark.parametrize("path", ["{id}/", "me/"])
+    def test_changed_profile_changes_the_user_etag(
+        self,
+        client: APIClient,
+        django_capture_on_commit_callbacks: callable,
+        path: str,
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        url: str = f"/api/users/{path.format(id=user.id)}"
+        etag: str = client.get(url)["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            client.put(
+                f"/api/profiles/{user.profile.id}/",
+                {"nickname": "changed nickname"},
+                format="json",
+            )
+        response: Response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["profile"]["nickname"] == "changed nickname"
+        assert response["ETag"] != etag
+
+    def test_user_if_match_follows_the_profile_changes(
+        self, client: APIClient, django_capture_on_commit_callbacks: callable
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        url: str = f"/api/users/{user.id}/"
+        etag: str = client.get(url)["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            client.put(
+                f"/api/profiles/{user.profile.id}/",
+                {"nickname": "changed nickname"},
+                format="json",
+            )
+        assert User.objects.get(pk=user.pk).updated_at == user.updated_at
+        response: Response = client.put(
+            url, {"first_name": "Stale"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == 412
+        response = client.put(
+            url,
+            {"first_name": "Current"},
+            format="json",
+            HTTP_IF_MATCH=client.get(url)["ETag"],
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("endpoint", ["users", "profiles"])
+    def test_profile_turning_adult_changes_the_etag(
+        self, client: APIClient, endpoint: str
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        user.profile.birth_date = get_birth_date_cutoff(18) + timedelta(days=1)
+        user.profile.save()
+        client.force_authenticate(user=user)
+        pk: int = user.id if endpoint == "users" else user.profile.id
+        url: str = f"/api/{endpoint}/{pk}/"
+        response: Response = client.get(url)
+        etag: str = response["ETag"]
+        last_modified: str = response["Last-Modified"]
+        next_day: date = timezone.localdate() + timedelta(days=1)
+        with patch("Users.models.timezone.localdate", return_value=next_day):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200
+            assert response["ETag"] != etag
+            response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == 200
+            response = client.put(
+                url,
+                {"first_name": "Adult", "bio": "Adult"},
+                format="json",
+                HTTP_IF_MATCH=response["ETag"],
+            )
+            assert response.status_code == 200
+
+    def test_adult_date_of_leap_day_births(self) -> None:
+        assert get_adult_date(date(2008, 2, 29)) == date(2026, 3, 1)
+        assert get_adult_date(date(2008, 3, 1)) == date(2026, 3, 1)
+        assert get_adult_date(date(2008, 2, 28)) == date(2026, 2, 28)
+
+    def test_update_with_current_if_match_succeeds(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        url: str = f"/api/profiles/{user.profile.id}/"
+        etag: str = client.get(url)["ETag"]
+        response: Response = client.put(
+            url, {"bio": "New bio"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert response["ETag"] == client.get(url)["ETag"]
+
+    def test_unchanged_update_with_if_match_moves_the_version(
+        self, client: APIClient
+    ) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        url: str = f"/api/profiles/{user.profile.id}/"
+        etag: str = client.get(url)["ETag"]
+        response: Response = client.put(
+            url, {"bio": user.profile.bio}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        response = client.put(
+            url, {"bio": "New bio"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == 412
+
+    def test_update_with_stale_if_match_fails(self, client: APIClient) -> None:
+        user: User = VerifiedUserFaker()
+        client.force_authenticate(user=user)
+        url: str = f"/api/users/{user.id}/"
+        etag: str = client.get(url)["ETag"]
+        client.put(url, {"first_name": "First"}, format="json")
+        response: Response = client.put(
+            url, {"first_name": "Second"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == 412
+        assert User.objects.get(pk=user.pk).first_name == "First"
+
+    def test_version_can_only_be_claimed_once(self) -> None:
+        user: User = VerifiedUserFaker()
+        view: UserViewSet = UserViewSet(
+            kwargs={"pk": user.pk}, request=HttpRequest()
+        )
+        version: datetime = view.get_current_version()
+        assert view.claim_version(version) is True
+        assert view.claim_version(version) is False
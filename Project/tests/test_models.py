@@ -0,0 +1,97 @@
+import pytest
+from django.utils import timezone
+
+from Emails.fakers.suggestion import SuggestionErrorFaker
+from Emails.models.models import Suggestion
+from Users.fakers.user import UserFaker
+from Users.models import User
+
+
+def get_updated_columns(captured_queries: list) -> str:
+    sql: str = captured_queries[0]["sql"]
+    return sql[sql.index(" SET ") : sql.index(" WHERE ")]
+
+
+@pytest.mark.django_db
+class TestDirtyFieldsMixin:
+    def test_unchanged_instance_is_not_saved(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        user: User = User.objects.get(pk=UserFaker().pk)
+        updated_at: timezone.datetime = user.updated_at
+        with django_assert_num_queries(0):
+            user.first_name = user.first_name
+            user.save()
+        assert User.objects.get(pk=user.pk).updated_at == updated_at
+
+    def test_only_the_changed_columns_are_updated(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        user: User = User.objects.get(pk=UserFaker().pk)
+        user.first_name = "Changed"
+        with django_assert_num_queries(1) as context:
+            user.save()
+        columns: str = get_updated_columns(context.captured_queries)
+        assert '"first_name"' in columns
+        assert '"updated_at"' in columns
+        assert '"email"' not in columns
+        assert User.objects.get(pk=user.pk).first_name == "Changed"
+
+    def test_saved_changes_are_not_written_again(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        user: User = User.objects.get(pk=UserFaker().pk)
+        user.last_name = "Changed"
+        user.save()
+        with django_assert_num_queries(0):
+            user.save()
+
+    def test_in_place_json_changes_are_detected(self) -> None:
+        suggestion: Suggestion = SuggestionErrorFaker()
+        suggestion.parameters["name"] = "Changed"
+        assert suggestion.get_dirty_fields() == ["parameters"]
+
+    def test_only_the_mutable_values_are_copied(self) -> None:
+        suggestion: Suggestion = Suggestion.objects.get(
+            pk=SuggestionErrorFaker().pk
+        )
+        loaded_values: dict = suggestion.loaded_values
+        assert loaded_values["parameters"] == suggestion.parameters
+        assert loaded_values["parameters"] is not suggestion.parameters
+        user: User = User.objects.get(pk=suggestion.user_id)
+        assert user.loaded_values["updated_at"] is user.updated_at
+
+    def test_loaded_values_are_not_shared(self) -> None:
+        user: User = User()
+        user.loaded_values["first_name"] = "Changed"
+        assert User().loaded_values == {}
+
+    def test_refresh_from_db_resets_the_loaded_values(self) -> None:
+        user: User = UserFaker()
+        User.objects.filter(pk=user.pk).update(first_name="Changed")
+        user.refresh_from_db(fields=["first_name"])
+        assert user.get_dirty_fields() == []
+
+    def test_deferred_fields_are_tracked_once_read(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        suggestion: Suggestion = Suggestion.objects.only("id").get(
+            pk=SuggestionErrorFaker().pk
+        )
+        suggestion.was_read = True
+        with django_assert_num_queries(1) as context:
+            suggestion.save()
+        columns: str = get_updated_columns(context.captured_queries)
+        assert '"was_read"' in columns
+        assert '"subject"' not in columns
+
+    def test_explicit_update_fields_are_kept(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        user: User = User.objects.get(pk=UserFaker().pk)
+        user.first_name = "Changed"
+        with django_assert_num_queries(1) as context:
+            user.save(update_fields=["last_name"])
+        columns: str = get_updated_columns(context.captured_queries)
+        assert '"first_name"' not in columns
+        assert user.get_dirty_fields() == ["first_name"]
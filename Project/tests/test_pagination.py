@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mock import patch
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from Emails.choices import CommentType
+from Emails.factories.suggestion import SuggestionEmailFactory
+from Project.pagination import get_estimated_count
+from Users.fakers.user import AdminFaker
+from Users.fakers.user import UserFaker
+from Users.models import User
+
+
+USERS_ENDPOINT: str = "/api/users"
+SUGGESTIONS_ENDPOINT: str = "/api/suggestions/user"
+
+
+@pytest.fixture(scope="function")
+def client() -> APIClient:
+    return APIClient()
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_keyset_pages_follow_the_next_cursor(
+        self, client: APIClient
+    ) -> None:
+        users: list = [UserFaker() for _ in range(3)]
+        admin: User = AdminFaker()
+        client.force_authenticate(user=admin)
+        url: str = f"{USERS_ENDPOINT}/?pagination=keyset&page_size=2"
+        emails: list = []
+        while url:
+            response: Response = client.get(url, format="json")
+            assert response.status_code == 200
+            assert "count" not in response.data
+            emails += [user["email"] for user in response.data["results"]]
+            url = response.data["next"]
+        expected_users: list = [admin, *reversed(users)]
+        assert emails == [user.email for user in expected_users]
+
+    def test_keyset_pages_keep_the_rows_of_the_same_millisecond(
+        self, client: APIClient
+    ) -> None:
+        admin: User = AdminFaker()
+        users: list = [UserFaker() for _ in range(4)]
+        created_at: object = timezone.now().replace(microsecond=500000)
+        for index, user in enumerate([admin, *users]):
+            User.objects.filter(pk=user.pk).update(
+                created_at=created_at + timedelta(microseconds=index)
+            )
+        client.force_authenticate(user=admin)
+        url: str = f"{USERS_ENDPOINT}/?pagination=keyset&page_size=1"
+        emails: list = []
+        while url:
+            response: Response = client.get(url, format="json")
+            emails += [user["email"] for user in response.data["results"]]
+            url = response.data["next"]
+        expected_users: list = [*reversed(users), admin]
+        assert emails == [user.email for user in expected_users]
+
+    def test_keyset_page_does_not_count(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        admin: User = AdminFaker()
+        client.force_authenticate(user=admin)
+        url: str = f"{USERS_ENDPOINT}/?pagination=keyset"
+        with django_assert_num_queries(1) as context:
+            # Only the page is queried
+            client.get(url, format="json")
+        assert "COUNT" not in context.captured_queries[0]["sql"]
+
+    def test_keyset_page_with_exact_count(self, client: APIClient) -> None:
+        UserFaker()
+        client.force_authenticate(user=AdminFaker())
+        url: str = f"{USERS_ENDPOINT}/?pagination=keyset&count=exact"
+        response: Response = client.get(url, format="json")
+        assert response.data["count"] == 2
+
+    def test_estimated_count_falls_back_to_exact_count(self) -> None:
+        UserFaker()
+        assert get_estimated_count(User.objects.all()) == 1
+
+    def test_estimated_count_reads_the_table_statistics_on_mysql(
+        self,
+    ) -> None:
+        with patch("Project.pagination.connection") as connection:
+            connection.vendor = "mysql"
+            cursor = connection.cursor().__enter__()
+            cursor.fetchone.return_value = (1000,)
+            assert get_estimated_count(User.objects.all()) == 1000
+
+    def test_invalid_cursor_fails(self, client: APIClient) -> None:
+        client.force_authenticate(user=AdminFaker())
+        url: str = f"{USERS_ENDPOINT}/?cursor=invalid"
+        response: Response = client.get(url, format="json")
+        assert response.status_code == 404
+
+    def test_page_number_pagination_is_kept_by_default(
+        self, client: APIClient
+    ) -> None:
+        client.force_authenticate(user=AdminFaker())
+        response: Response = client.get(f"{USERS_ENDPOINT}/", format="json")
+        assert response.data["count"] == 1
+        assert "previous" in response.data
+
+    def test_keyset_pagination_with_view_ordering(
+        self, client: APIClient
+    ) -> None:
+        admin: User = AdminFaker()
+        suggestions: list = [
+            SuggestionEmailFactory(
+                type=CommentType.ERROR.value, content="Error found", user=admin
+            )
+            for _ in range(3)
+        ]
+        client.force_authenticate(user=admin)
+        url: str = f"{SUGGESTIONS_ENDPOINT}/?pagination=keyset&page_size=2"
+        response: Response = client.get(url, format="json")
+        next_response: Response = client.get(
+            response.data["next"], format="json"
+        )
+        ids: list = [
+            suggestion["id"]
+            for page in [response, next_response]
+            for suggestion in page.data["results"]
+        ]
+        assert ids == [suggestion.id for suggestion in reversed(suggestions)]
+        assert next_response.data["next"] is None
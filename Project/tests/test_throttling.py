@@ -0,0 +1,201 @@
+import pytest
+from django.test import override_settings
+from mock import MagicMock
+from mock import patch
+from redis.exceptions import ConnectionError
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from Project.throttling import AccountThrottle
+from Project.throttling import IPThrottle
+from Users.fakers.user import VerifiedUserFaker
+from Users.models import User
+
+
+CONNECTION: str = "Project.throttling.get_redis_connection"
+RATES: dict = {"login_ip": "10/min", "login_account": "2/min"}
+NOW: float = 60 * 1000 + 30
+
+
+@pytest.fixture(scope="function")
+def client() -> APIClient:
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def enable_throttling(settings: object) -> None:
+    settings.THROTTLING_ENABLED = True
+
+
+class LoginView(APIView):
+    throttle_scope: str = "login"
+
+
+def get_request(data: dict = None, user: User = None) -> object:
+    request: object = APIView().initialize_request(
+        APIRequestFactory().post("/", data or {}, format="json")
+    )
+    request.user = user
+    return request
+
+
+def get_connection(current: int, previous: int or None) -> MagicMock:
+    connection: MagicMock = MagicMock()
+    connection.pipeline.return_value.execute.return_value = [
+        current,
+        True,
+        previous,
+    ]
+    return connection
+
+
+def get_throttle(throttle_class: type) -> object:
+    throttle: object = throttle_class()
+    throttle.timer = lambda: NOW
+    return throttle
+
+
+@patch("Project.throttling.api_settings.DEFAULT_THROTTLE_RATES", RATES)
+class TestSlidingWindowThrottle:
+    def test_requests_under_the_rate_are_allowed(self) -> None:
+        throttle: IPThrottle = get_throttle(IPThrottle)
+        with patch(CONNECTION, return_value=get_connection(10, None)):
+            assert throttle.allow_request(get_request(), LoginView()) is True
+        assert throttle.wait() is None
+
+    def test_previous_window_is_weighted_by_its_overlap(self) -> None:
+        throttle: IPThrottle = get_throttle(IPThrottle)
+        # Half of the previous window overlaps, 4 + 13 / 2 is over 10
+        with patch(CONNECTION, return_value=get_connection(4, b"13")):
+            assert throttle.allow_request(get_request(), LoginView()) is False
+        assert throttle.wait() == 30
+        with patch(CONNECTION, return_value=get_connection(4, b"12")):
+            assert throttle.allow_request(get_request(), LoginView()) is True
+
+    def test_counters_are_read_in_a_single_pipeline(self) -> None:
+        throttle: IPThrottle = get_throttle(IPThrottle)
+        connection: MagicMock = get_connection(1, None)
+        with patch(CONNECTION, return_value=connection):
+            throttle.allow_request(get_request(), LoginView())
+        pipeline: MagicMock = connection.pipeline.return_value
+        key: str = "throttle:login_ip:127.0.0.1"
+        pipeline.incr.assert_called_once_with(f"{key}:1000")
+        pipeline.expire.assert_called_once_with(f"{key}:1000", 120)
+        pipeline.get.assert_called_once_with(f"{key}:999")
+        pipeline.execute.assert_called_once()
+
+    def test_requests_are_allowed_when_redis_is_down(self) -> None:
+        throttle: IPThrottle = get_throttle(IPThrottle)
+        with patch(CONNECTION) as connection:
+            connection.return_value.pipeline.side_effect = ConnectionError
+            assert throttle.allow_request(get_request(), LoginView()) is True
+
+    def test_views_without_scope_or_rate_are_not_throttled(self) -> None:
+        throttle: IPThrottle = get_throttle(IPThrottle)
+        view: LoginView = LoginView()
+        with patch(CONNECTION) as connection:
+            view.throttle_scope = None
+            assert throttle.allow_request(get_request(), view) is True
+            view.throttle_scope = "signup"
+            assert throttle.allow_request(get_request(), view) is True
+        connection.assert_not_called()
+
+    @override_settings(THROTTLING_ENABLED=False)
+    def test_disabled_throttling_does_not_reach_redis(self) -> None:
+        throttle: IPThrottle = get_throttle(IPThrottle)
+        with patch(CONNECTION) as connection:
+            assert throttle.allow_request(get_request(), LoginView()) is True
+        connection.assert_not_called()
+
+    @pytest.mark.parametrize("forwarded", ["203.0.113.1", "203.0.113.2"])
+    def test_spoofed_forwarded_for_does_not_change_the_ip(
+        self, forwarded: str
+    ) -> None:
+        throttle: IPThrottle = get_throttle(IPThrottle)
+        throttle.scope = "login_ip"
+        request: object = APIView().initialize_request(
+            APIRequestFactory().post(
+                "/",
+                {},
+                format="json",
+                HTTP_X_FORWARDED_FOR=forwarded,
+                REMOTE_ADDR="198.51.100.7",
+            )
+        )
+        key: str = throttle.get_cache_key(request, LoginView())
+        assert key == "throttle:login_ip:198.51.100.7"
+
+    def test_account_is_the_normalized_email(self) -> None:
+        throttle: AccountThrottle = get_throttle(AccountThrottle)
+        throttle.scope = "login_account"
+        request: object = get_request({"email": " User@AppName.me "})
+        key: str = throttle.get_cache_key(request, LoginView())
+        assert key == "throttle:login_account:user@appname.me"
+
+    def test_account_falls_back_to_the_authenticated_user(self) -> None:
+        throttle: AccountThrottle = get_throttle(AccountThrottle)
+        throttle.scope = "login_account"
+        user: User = User(pk=7)
+        key: str = throttle.get_cache_key(get_request(user=user), LoginView())
+        assert key == "throttle:login_account:user:7"
+
+    def test_anonymous_requests_without_email_have_no_account(self) -> None:
+        throttle: AccountThrottle = get_throttle(AccountThrottle)
+        throttle.scope = "login_account"
+        request: object = get_request(user=MagicMock(is_authenticated=False))
+        assert throttle.get_cache_key(request, LoginView()) is None
+
+
+@pytest.mark.django_db
+class TestThrottledViews:
+    def test_throttled_login_is_rejected_before_the_database(
+        self, client: APIClient, django_assert_num_queries: callable
+    ) -> None:
+        data: dict = {"email": "user@appname.me", "password": "password"}
+        with patch(CONNECTION, return_value=get_connection(100, None)):
+            with django_assert_num_queries(0):
+                response: Response = client.post(
+                    "/api/users/login/", data, format="json"
+                )
+        assert response.status_code == 429
+        assert "Retry-After" in response
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/users/signup/",
+            "/api/token/",
+            "/api/password_reset/",
+            "/api/password_reset/confirm/",
+        ],
+    )
+    def test_authentication_endpoints_are_throttled(
+        self, client: APIClient, url: str
+    ) -> None:
+        data: dict = {"email": "user@appname.me"}
+        with patch(CONNECTION, return_value=get_connection(100, None)):
+            response: Response = client.post(url, data, format="json")
+        assert response.status_code == 429
+
+    def test_suggestion_submit_is_throttled_by_user(
+        self, client: APIClient
+    ) -> None:
+        client.force_authenticate(user=VerifiedUserFaker())
+        data: dict = {"type": "Error", "content": "Content"}
+        with patch(CONNECTION, return_value=get_connection(100, None)):
+            response: Response = client.post(
+                "/api/suggestions/submit/", data, format="json"
+            )
+        assert response.status_code == 429
+
+    def test_requests_under_the_rates_are_served(
+        self, client: APIClient
+    ) -> None:
+        data: dict = {"email": "user@appname.me", "password": "password"}
+        with patch(CONNECTION, return_value=get_connection(1, None)):
+            response: Response = client.post(
+                "/api/users/login/", data, format="json"
+            )
+        assert response.status_code == 400
@@ -3,12 +3,20 @@ from datetime import datetime
 from logging import Logger
 
 import pytest
+from django.http import Http404
+from django.test import RequestFactory
 from freezegun import freeze_time
 from mock import MagicMock
 from mock import PropertyMock
+from mock import patch
+from rest_framework.request import Request
 
 from Project.utils.log import log_email_action
 from Project.utils.log import log_information
+from Project.utils.lru import TimedLRUCache
+from Project.utils.request_cache import get_cached_object
+from Users.fakers.user import UserFaker
+from Users.models import User
 
 
 @pytest.mark.django_db
@@ -64,3 +72,70 @@ class TestAppUtils:
             + f"sent to test@test.com at {now}"
         )
         assert expected_message in caplog.text
+
+
+class TestTimedLRUCache:
+    def test_get_returns_the_stored_value(self) -> None:
+        cache: TimedLRUCache = TimedLRUCache(max_size=2, timeout=60)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+        assert cache.get("other", "default") == "default"
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache: TimedLRUCache = TimedLRUCache(max_size=2, timeout=60)
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")
+        cache.set("third", 3)
+        assert cache.get("second") is None
+        assert cache.get("first") == 1
+        assert len(cache) == 2
+
+    def test_expired_entries_are_not_returned(self) -> None:
+        cache: TimedLRUCache = TimedLRUCache(max_size=2, timeout=60)
+        with patch("Project.utils.lru.time.monotonic", return_value=0):
+            cache.set("key", "value")
+        with patch("Project.utils.lru.time.monotonic", return_value=61):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_delete_and_clear(self) -> None:
+        cache: TimedLRUCache = TimedLRUCache(max_size=2, timeout=60)
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.delete("first")
+        assert cache.get("first") is None
+        cache.clear()
+        assert len(cache) == 0
+
+
+@pytest.mark.django_db
+class TestRequestCache:
+    def test_cached_object_is_queried_once_per_request(
+        self, django_assert_num_queries: callable
+    ) -> None:
+        user: User = UserFaker()
+        django_request: object = RequestFactory().get("/")
+        request: Request = Request(django_request)
+        with django_assert_num_queries(1):
+            first: User = get_cached_object(
+                request, User.objects.all(), user.id
+            )
+            second: User = get_cached_object(
+                django_request, User.objects.all(), str(user.id)
+            )
+        assert first is second
+
+    def test_cached_object_is_not_shared_between_requests(self) -> None:
+        user: User = UserFaker()
+        first: User = get_cached_object(
+            RequestFactory().get("/"), User.objects.all(), user.id
+        )
+        second: User = get_cached_object(
+            RequestFactory().get("/"), User.objects.all(), user.id
+        )
+        assert first is not second
+
+    def test_missing_object_raises_not_found(self) -> None:
+        with pytest.raises(Http404):
+            get_cached_object(RequestFactory().get("/"), User.objects.all(), 0)
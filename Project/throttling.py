@@ -0,0 +1,110 @@
+import logging
+import math
+from logging import Logger
+
+from django.conf import settings
+from django.http import HttpRequest
+from redis.exceptions import RedisError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework.views import APIView
+
+from Project.utils.redis_client import get_redis_connection
+
+
+logger: Logger = logging.getLogger(__name__)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Throttle that estimates the requests of the last window from the
+    counters of the current and the previous fixed windows, the previous
+    one weighted by how much of it the last window still overlaps. The
+    counters live in redis so every process shares them, they are
+    incremented and read in a single MULTI pipeline.
+
+    The view names its scope on throttle_scope and the rates are set on
+    the REST_FRAMEWORK DEFAULT_THROTTLE_RATES as {scope}_{kind}, views or
+    kinds without a rate are not throttled.
+    """
+
+    kind: str = None
+    cache_format: str = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self) -> None:
+        # The scope depends on the view, the rate is read on each request
+        self.wait_time: float = None
+
+    def allow_request(self, request: HttpRequest, view: APIView) -> bool:
+        scope: str = getattr(view, "throttle_scope", None)
+        if not settings.THROTTLING_ENABLED or not scope:
+            return True
+        self.scope = f"{scope}_{self.kind}"
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now: float = self.timer()
+        window: int = int(now // self.duration)
+        try:
+            current, previous = self.count(window)
+        except RedisError:
+            logger.warning(f"Project | Throttle {self.scope} unavailable")
+            return True
+        elapsed: float = now - window * self.duration
+        overlap: float = 1 - elapsed / self.duration
+        if current + previous * overlap <= self.num_requests:
+            return True
+        # The previous window stops counting when the current one ends
+        self.wait_time = self.duration - elapsed
+        return False
+
+    def count(self, window: int) -> tuple:
+        current_key: str = f"{self.key}:{window}"
+        pipeline: object = get_redis_connection().pipeline()
+        pipeline.incr(current_key)
+        pipeline.expire(current_key, self.duration * 2)
+        pipeline.get(f"{self.key}:{window - 1}")
+        current, _, previous = pipeline.execute()
+        return int(current), int(previous or 0)
+
+    def wait(self) -> float or None:
+        if self.wait_time is None:
+            return None
+        return math.ceil(self.wait_time)
+
+
+class IPThrottle(SlidingWindowThrottle):
+    kind: str = "ip"
+
+    def get_cache_key(self, request: HttpRequest, view: APIView) -> str:
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class AccountThrottle(SlidingWindowThrottle):
+    """
+    Throttles the requests by the email they are sent for, or by the
+    authenticated user when they have no email
+    """
+
+    kind: str = "account"
+
+    def get_cache_key(self, request: HttpRequest, view: APIView) -> str:
+        data: object = request.data
+        email: object = data.get("email") if isinstance(data, dict) else None
+        if isinstance(email, str) and email.strip():
+            ident: str = email.strip().lower()
+        elif request.user and request.user.is_authenticated:
+            ident: str = f"user:{request.user.pk}"
+        else:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+SLIDING_WINDOW_THROTTLES: list = [IPThrottle, AccountThrottle]
@@ -10,9 +10,11 @@ from django.views.static import serve
 from drf_spectacular.views import SpectacularAPIView
 from drf_spectacular.views import SpectacularRedocView
 from drf_spectacular.views import SpectacularSwaggerView
-from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from Users.urls import password_reset_urlpatterns
+from Users.views import ThrottledTokenObtainPairView
+
 
 urlpatterns: list = [
     # Django JET URLS
@@ -24,10 +26,15 @@ urlpatterns: list = [
     path("api/", include(("Emails.urls", "emails"), namespace="emails")),
     path(
         "api/password_reset/",
-        include("django_rest_passwordreset.urls", namespace="password_reset"),
+        include(
+            (password_reset_urlpatterns, "password_reset"),
+            namespace="password_reset",
+        ),
     ),
     path(
-        "api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"
+        "api/token/",
+        ThrottledTokenObtainPairView.as_view(),
+        name="token_obtain_pair",
     ),
     path(
         "api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"
@@ -0,0 +1,46 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class TimedLRUCache:
+    """
+    Thread safe in-process LRU cache whose entries expire after a timeout
+    """
+
+    def __init__(self, max_size: int, timeout: float) -> None:
+        self.max_size: int = max_size
+        self.timeout: float = timeout
+        self.entries: OrderedDict = OrderedDict()
+        self.lock: Lock = Lock()
+
+    def get(self, key: object, default: object = None) -> object:
+        with self.lock:
+            entry: tuple = self.entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return default
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: object, value: object, timeout: float = None) -> None:
+        timeout = self.timeout if timeout is None else timeout
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: object) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
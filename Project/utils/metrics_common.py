@@ -1,4 +1,5 @@
 from prometheus_client import Counter
+from prometheus_client import Gauge
 
 
 # initialise a prometheus counter
@@ -6,3 +7,21 @@ class Metrics:
     upload_urls_created: Counter = Counter(
         "upload_urls", "total number of upload urls created"
     )
+    cache_hits: Counter = Counter(
+        "two_tier_cache_hits", "total number of cache hits by tier", ["tier"]
+    )
+    cache_misses: Counter = Counter(
+        "two_tier_cache_misses", "total number of cache misses"
+    )
+    cache_recomputes: Counter = Counter(
+        "two_tier_cache_recomputes",
+        "total number of values computed by get_or_set",
+    )
+    password_hashing_queue_depth: Gauge = Gauge(
+        "password_hashing_queue_depth",
+        "number of password hashes running or waiting in the pool",
+    )
+    password_hashing_rejections: Counter = Counter(
+        "password_hashing_rejections",
+        "total number of password hashes rejected by a full pool",
+    )
@@ -0,0 +1,16 @@
+from functools import lru_cache
+
+from django.conf import settings
+from redis import Redis
+
+
+def get_redis_connection() -> Redis:
+    """
+    Returns the process wide redis client, redis-py pools the connections
+    """
+    return create_redis_connection(settings.REDIS_URL)
+
+
+@lru_cache(maxsize=None)
+def create_redis_connection(url: str) -> Redis:
+    return Redis.from_url(url)
@@ -0,0 +1,48 @@
+from django.db.models import Model
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from rest_framework.generics import get_object_or_404
+
+
+def get_request_cache(request: HttpRequest) -> dict:
+    """
+    Returns the identity map of the request, it is stored on the django
+    request so it is shared with the rest framework request that wraps it
+    """
+    django_request: HttpRequest = getattr(request, "_request", request)
+    return django_request.__dict__.setdefault("_object_cache", {})
+
+
+def get_cached_object(
+    request: HttpRequest, queryset: QuerySet, pk: object
+) -> Model:
+    """
+    Returns the instance with the given pk, the database is only queried
+    the first time it is requested during the request
+    """
+    cache: dict = get_request_cache(request)
+    key: tuple = (queryset.model._meta.label, str(pk))
+    if key not in cache:
+        cache[key] = get_object_or_404(queryset, pk=pk)
+    return cache[key]
+
+
+def forget_cached_object(
+    request: HttpRequest, model: Model, pk: object
+) -> None:
+    get_request_cache(request).pop((model._meta.label, str(pk)), None)
+
+
+class RequestCachedObjectMixin:
+    """
+    Viewset mixin that loads the detail instance from the request identity
+    map, so the permissions and the view share the same instance
+    """
+
+    def get_object(self) -> Model:
+        lookup_url_kwarg: str = self.lookup_url_kwarg or self.lookup_field
+        instance: Model = get_cached_object(
+            self.request, self.get_queryset(), self.kwargs[lookup_url_kwarg]
+        )
+        self.check_object_permissions(self.request, instance)
+        return instance
@@ -0,0 +1,25 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(function: callable) -> int:
+    with CaptureQueriesContext(connection) as context:
+        function()
+    return len(context.captured_queries)
+
+
+def assert_constant_query_count(
+    request: callable, create_instances: callable, instances: int = 5
+) -> None:
+    """
+    Asserts that the request does the same queries after creating more
+    instances, so the endpoint does not query once per result
+    """
+    create_instances(1)
+    expected_queries: int = count_queries(request)
+    create_instances(instances)
+    queries: int = count_queries(request)
+    assert queries == expected_queries, (
+        f"Expected {expected_queries} queries but {queries} were done "
+        f"after creating {instances} more instances"
+    )
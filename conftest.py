@@ -0,0 +1,11 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    # The test transactions are rolled back without running the on commit
+    # callbacks, so the cached representations of a test are not refreshed
+    # and must not be served to the next one
+    for cache in caches.all():
+        cache.clear()